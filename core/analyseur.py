@@ -1,3 +1,9 @@
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+from core.statistiques import HistogrammesVitesses, StatistiquesWelford
 from exceptions import (
     RouteVideException,
     DivisionParZeroException,
@@ -10,8 +16,57 @@ class Analyseur:
 
     Fournit des méthodes pour calculer des statistiques basiques sur le réseau
     (nombre de véhicules, liste des vitesses et vitesse moyenne).
+
+    En mode incrémental, les vitesses sont résumées (effectif, moyenne,
+    variance, min, max) en une réduction sur les tableaux du moteur vectoriel
+    lorsqu'il existe, et des statistiques cumulées sur toute la simulation
+    sont tenues à jour (`cumul`, algorithme de Welford).
+
+    Avec `par_route`, les statistiques comprennent aussi des agrégats par
+    route (voir `agreger_routes`). Avec `quantiles`, des histogrammes de
+    vitesses par route (`histogrammes`, voir `HistogrammesVitesses`) sont
+    cumulés à chaque analyse et les quantiles du tour sont ajoutés, pour le
+    réseau et pour chaque route.
     """
 
+    def __init__(self, incremental=False, inclure_vitesses=True, par_route=False,
+                 quantiles=False, vitesse_max=60.0, nb_classes=120):
+        """Configure le type de statistiques produites.
+
+        Args:
+            incremental (bool): résumer les vitesses et tenir les statistiques
+                cumulées (`cumul`) au fil des tours.
+            inclure_vitesses (bool): joindre la liste des vitesses de chaque
+                véhicule (clé 'vitesses'). À désactiver pour que la taille des
+                résultats ne dépende plus du nombre de véhicules.
+            par_route (bool): ajouter les agrégats par route (clé 'routes').
+            quantiles (bool): tenir les histogrammes de vitesses et ajouter les
+                quantiles du tour (clé 'quantiles_vitesse': p50, p90, p99;
+                par route, clé 'quantiles_vitesse_routes').
+            vitesse_max (float): borne supérieure des classes d'histogramme.
+            nb_classes (int): nombre de classes d'histogramme.
+
+        Raises:
+            ImportError: Si `quantiles` est demandé sans NumPy installé.
+        """
+        if quantiles and np is None:
+            raise ImportError("Les quantiles de vitesse nécessitent NumPy (pip install numpy)")
+        self.incremental = incremental
+        self.inclure_vitesses = inclure_vitesses
+        self.par_route = par_route
+        self.quantiles = quantiles
+        self.vitesse_max = vitesse_max
+        self.nb_classes = nb_classes
+        self.histogrammes = None
+        self._carte_moteur = None
+        self.cumul = StatistiquesWelford()
+
+    def reinitialiser(self):
+        """Remet à zéro les statistiques cumulées (et les histogrammes)."""
+        self.cumul = StatistiquesWelford()
+        self.histogrammes = None
+        self._carte_moteur = None
+
     def analyser(self, reseau):
         """Analyse l'état du `reseau` et renvoie des statistiques.
 
@@ -19,7 +74,15 @@ class Analyseur:
             reseau: instance de `ReseauRoutier` contenant les routes et véhicules.
 
         Returns:
-            dict: clés: 'nb_vehicules', 'vitesses', 'moyenne_vitesse'.
+            dict: clés: 'nb_vehicules', 'vitesses', 'moyenne_vitesse'. En mode
+            incrémental (ou sans liste des vitesses), s'y ajoutent
+            'variance_vitesse', 'min_vitesse', 'max_vitesse' et, en mode
+            incrémental, 'cumul' (statistiques depuis le premier tour). Avec
+            `par_route`, 'routes' contient les agrégats de `agreger_routes`
+            (listes, une valeur par route); avec `quantiles`,
+            'quantiles_vitesse' contient les quantiles du tour et
+            'quantiles_vitesse_routes' ceux de chaque route (voir
+            `HistogrammesVitesses.quantiles_routes`).
             
         Raises:
             DonneesMaquantesException: Si le réseau n'a pas de routes.
@@ -32,6 +95,14 @@ class Analyseur:
             
             if not reseau.routes:
                 raise DonneesMaquantesException("Le réseau ne contient aucune route")
+
+            if self.incremental or not self.inclure_vitesses:
+                stats = self._analyser_resume(reseau)
+                if self.par_route:
+                    stats["routes"] = self._agregats_en_listes(reseau)
+                if self.quantiles:
+                    stats.update(self._mettre_a_jour_histogrammes(reseau))
+                return stats
             
             stats = {"nb_vehicules": 0, "vitesses": [], "moyenne_vitesse": 0}
 
@@ -46,6 +117,11 @@ class Analyseur:
                     stats["moyenne_vitesse"] = sum(stats["vitesses"]) / len(stats["vitesses"])
                 except ZeroDivisionError as e:
                     raise DivisionParZeroException("calcul de la vitesse moyenne") from e
+
+            if self.par_route:
+                stats["routes"] = self._agregats_en_listes(reseau)
+            if self.quantiles:
+                stats.update(self._mettre_a_jour_histogrammes(reseau))
             
             return stats
             
@@ -55,3 +131,154 @@ class Analyseur:
         except Exception as e:
             # Capturer toute autre erreur inattendue
             raise DonneesMaquantesException(f"Erreur lors de l'analyse: {str(e)}") from e
+
+    def _vitesses_tour(self, reseau):
+        """Résume les vitesses courantes, par tableau entier quand un moteur existe."""
+        tour = StatistiquesWelford()
+        moteur = getattr(reseau, "moteur", None)
+        if moteur is not None:
+            tour.ajouter_lot(moteur.vitesses[:moteur.n])
+            return tour
+        for route in reseau.routes.values():
+            moteur = getattr(route, "_moteur", None)
+            if moteur is not None:
+                # moteur propre à la route (mode "vectoriel")
+                tour.ajouter_lot(moteur.vitesses[:moteur.n])
+            else:
+                for v in route.vehicules:
+                    tour.ajouter(v.vitesse)
+        return tour
+
+    def _analyser_resume(self, reseau):
+        """Statistiques résumées (sans liste sauf `inclure_vitesses`)."""
+        tour = self._vitesses_tour(reseau)
+        stats = {
+            "nb_vehicules": tour.n,
+            "moyenne_vitesse": tour.moyenne if tour.n else 0,
+            "variance_vitesse": tour.variance,
+            "min_vitesse": tour.min,
+            "max_vitesse": tour.max,
+        }
+        if self.inclure_vitesses:
+            stats["vitesses"] = [v.vitesse for route in reseau.routes.values()
+                                 for v in route.vehicules]
+        if self.incremental:
+            self.cumul.fusionner(tour)
+            stats["cumul"] = self.cumul.resume()
+        return stats
+
+    def agreger_routes(self, reseau):
+        """Calcule les agrégats de chaque route en une passe.
+
+        Si le réseau est compilé (`ReseauRoutier.compiler_moteur`), les
+        agrégats sont des réductions groupées (`np.bincount` sur l'indice de
+        route) de la table du moteur; sinon une boucle par route est utilisée.
+
+        Args:
+            reseau: instance de `ReseauRoutier`.
+
+        Returns:
+            dict: 'noms' (liste) puis, pour chaque route dans le même ordre,
+            'nb_vehicules', 'moyenne_vitesse', 'densite' (véhicules/km) et
+            'occupation' (fraction de `capacite_max`). Tableaux NumPy si NumPy
+            est installé, listes sinon.
+        """
+        moteur = getattr(reseau, "moteur", None)
+        if moteur is not None:
+            n = moteur.n
+            nb_routes = len(moteur.routes)
+            indices = moteur.indices_routes[:n]
+            compte = np.bincount(indices, minlength=nb_routes).astype(np.float64)
+            somme = np.bincount(indices, weights=moteur.vitesses[:n], minlength=nb_routes)
+            return {
+                "noms": [r.nom for r in moteur.routes],
+                "nb_vehicules": compte.astype(np.int64),
+                "moyenne_vitesse": np.divide(somme, compte, out=np.zeros(nb_routes),
+                                             where=compte > 0),
+                "densite": compte / (moteur.longueurs / 1000.0),
+                "occupation": np.divide(compte, moteur.capacites, out=np.zeros(nb_routes),
+                                        where=moteur.capacites > 0),
+            }
+
+        agregats = {"noms": [], "nb_vehicules": [], "moyenne_vitesse": [],
+                    "densite": [], "occupation": []}
+        for route in reseau.routes.values():
+            moteur = getattr(route, "_moteur", None)
+            if moteur is not None:
+                compte = moteur.n
+                somme = float(moteur.vitesses[:compte].sum())
+            else:
+                compte = len(route.vehicules)
+                somme = sum(v.vitesse for v in route.vehicules)
+            agregats["noms"].append(route.nom)
+            agregats["nb_vehicules"].append(compte)
+            agregats["moyenne_vitesse"].append(somme / compte if compte else 0.0)
+            agregats["densite"].append(compte / (route.longueur / 1000.0))
+            agregats["occupation"].append(compte / route.capacite_max
+                                          if route.capacite_max else 0.0)
+        if np is not None:
+            for cle in ("nb_vehicules", "moyenne_vitesse", "densite", "occupation"):
+                agregats[cle] = np.asarray(agregats[cle])
+        return agregats
+
+    def _agregats_en_listes(self, reseau):
+        """`agreger_routes` sous forme sérialisable (listes Python)."""
+        return {cle: valeurs if isinstance(valeurs, list) else valeurs.tolist()
+                for cle, valeurs in self.agreger_routes(reseau).items()}
+
+    def _vitesses_par_route(self, reseau):
+        """Retourne (lignes d'histogramme, vitesses) de tous les véhicules du réseau.
+
+        Les vitesses sont lues dans les colonnes du moteur global, ou de
+        chaque route (mode "vectoriel"); la boucle sur les véhicules ne sert
+        qu'aux routes sans moteur.
+        """
+        moteur = getattr(reseau, "moteur", None)
+        if moteur is not None:
+            cle = (moteur, len(moteur.routes))
+            if self._carte_moteur is None or self._carte_moteur[0] != cle:
+                carte = np.array([self.histogrammes.ligne(r.nom) for r in moteur.routes],
+                                 dtype=np.int64)
+                self._carte_moteur = (cle, carte)
+            carte = self._carte_moteur[1]
+            return carte[moteur.indices_routes[:moteur.n]], moteur.vitesses[:moteur.n]
+
+        lignes, vitesses = [], []
+        for route in reseau.routes.values():
+            ligne = self.histogrammes.ligne(route.nom)
+            moteur = getattr(route, "_moteur", None)
+            if moteur is not None:
+                # moteur propre à la route (mode "vectoriel")
+                lignes.append(np.full(moteur.n, ligne, dtype=np.int64))
+                vitesses.append(moteur.vitesses[:moteur.n])
+            else:
+                lignes.append(np.full(len(route.vehicules), ligne, dtype=np.int64))
+                vitesses.append(np.fromiter((v.vitesse for v in route.vehicules),
+                                            dtype=np.float64, count=len(route.vehicules)))
+        if not lignes:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return np.concatenate(lignes), np.concatenate(vitesses)
+
+    def _mettre_a_jour_histogrammes(self, reseau):
+        """Cumule les vitesses du tour dans `histogrammes` et retourne leurs quantiles.
+
+        Returns:
+            dict: 'quantiles_vitesse' (réseau) et 'quantiles_vitesse_routes'
+            (par route) des vitesses du tour.
+        """
+        if self.histogrammes is None:
+            self.histogrammes = HistogrammesVitesses(reseau.routes, self.vitesse_max,
+                                                     self.nb_classes)
+        elif len(reseau.routes) != len(self.histogrammes.noms):
+            nouvelles = [nom for nom in reseau.routes if nom not in self.histogrammes]
+            if nouvelles:
+                self.histogrammes.fusionner(
+                    HistogrammesVitesses(nouvelles, self.vitesse_max, self.nb_classes))
+
+        lignes, vitesses = self._vitesses_par_route(reseau)
+        # histogrammes du seul tour, mêmes lignes que les histogrammes cumulés
+        tour = HistogrammesVitesses(self.histogrammes.noms, self.vitesse_max, self.nb_classes)
+        tour.ajouter(lignes, vitesses)
+        self.histogrammes.comptes += tour.comptes
+        return {"quantiles_vitesse": tour.quantiles_reseau(),
+                "quantiles_vitesse_routes": tour.quantiles_routes()}
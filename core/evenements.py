@@ -0,0 +1,210 @@
+"""Avance rapide à événements discrets.
+
+Avec la cinématique actuelle (vitesse constante, position bornée par
+`Route.longueur`, arrêt définitif devant un feu rouge), la position d'un
+véhicule entre deux événements est une fonction affine du numéro de tour.
+Le planificateur ne traite donc que les tours où quelque chose change:
+
+- changement d'état d'un feu,
+- véhicule atteignant la ligne d'arrêt d'un feu (arrêt s'il est rouge),
+- véhicule atteignant le bout de sa route.
+
+Les événements sont rangés dans une file de priorité (`heapq`) par tour; à
+tour égal, les feux passent avant les véhicules, comme dans
+`Route.mettre_a_jour_vehicules`. Les tours intermédiaires ne sont calculés
+(analytiquement) que si on les demande.
+
+Les résultats sont ceux du pas fixe `delta_t`, aux arrondis flottants près:
+le pas fixe accumule `delta_t` tour après tour alors que le planificateur
+calcule directement `p0 + v * k * delta_t`.
+"""
+
+import heapq
+import itertools
+import math
+
+
+class PlanificateurEvenements:
+    """File d'événements et état analytique des véhicules d'un réseau.
+
+    Attributs:
+        reseau (ReseauRoutier): réseau simulé.
+        delta_t (float): durée d'un tour (s).
+        tour (int): dernier tour traité.
+        nb_evenements (int): nombre d'événements traités.
+    """
+
+    FEU = 0
+    LIGNE_ARRET = 1
+    FIN_ROUTE = 2
+
+    def __init__(self, reseau, delta_t):
+        """Construit la file d'événements initiale du `reseau`.
+
+        Args:
+            reseau (ReseauRoutier): réseau à simuler.
+            delta_t (float): durée d'un tour (s), strictement positive.
+        """
+        self.reseau = reseau
+        self.delta_t = float(delta_t)
+        self.tour = 0
+        self.nb_evenements = 0
+        self._file = []
+        self._sequence = itertools.count()
+
+        # état analytique: position p0 et vitesse v à partir du tour k0
+        self._vehicules = [v for route in reseau.routes.values() for v in route.vehicules]
+        self._p0 = [v.position for v in self._vehicules]
+        self._v = [v.vitesse for v in self._vehicules]
+        self._k0 = [0] * len(self._vehicules)
+        self._version = [0] * len(self._vehicules)
+
+        self._tour_feu = {}
+        for route in reseau.routes.values():
+            if route.feu_rouge is not None:
+                self._tour_feu[route.nom] = 0
+                self._planifier_feu(route)
+
+        for i in range(len(self._vehicules)):
+            self._planifier_vehicule(i)
+
+    # ------------------------------------------------------------------
+    # Calculs analytiques
+    # ------------------------------------------------------------------
+    def _tours_pour_atteindre(self, depart, vitesse, cible):
+        """Plus petit nombre de tours m >= 1 tel que depart + vitesse*m*dt >= cible."""
+        dt = self.delta_t
+        m = max(1, math.ceil((cible - depart) / (vitesse * dt)))
+        # corriger les arrondis du quotient
+        while m > 1 and depart + vitesse * (m - 1) * dt >= cible:
+            m -= 1
+        while depart + vitesse * m * dt < cible:
+            m += 1
+        return m
+
+    def position(self, i, tour):
+        """Position du véhicule d'indice `i` au tour `tour` (>= son dernier événement)."""
+        vehicule = self._vehicules[i]
+        position = self._p0[i] + self._v[i] * (tour - self._k0[i]) * self.delta_t
+        return min(position, vehicule.route.longueur)
+
+    def positions(self, tour):
+        """Dictionnaire {id: position} de tous les véhicules au tour `tour`."""
+        return {v.id: self.position(i, tour) for i, v in enumerate(self._vehicules)}
+
+    # ------------------------------------------------------------------
+    # Planification
+    # ------------------------------------------------------------------
+    def _pousser(self, tour, nature, cle):
+        heapq.heappush(self._file, (tour, nature, next(self._sequence), cle))
+
+    def _planifier_feu(self, route):
+        """Planifie le prochain changement d'état du feu de `route`."""
+        feu = route.feu_rouge
+        if feu.cycle <= 0:
+            return
+        dt = self.delta_t
+        ecoule = feu.temps_ecoule
+        m = max(1, math.ceil(feu.temps_avant_changement() / dt))
+        while m > 1 and ecoule + (m - 1) * dt >= feu.cycle:
+            m -= 1
+        while ecoule + m * dt < feu.cycle:
+            m += 1
+        self._pousser(self._tour_feu[route.nom] + m, self.FEU, route.nom)
+
+    def _planifier_vehicule(self, i):
+        """Planifie le prochain événement du véhicule d'indice `i` (s'il roule)."""
+        vitesse = self._v[i]
+        if vitesse <= 0:
+            return
+        route = self._vehicules[i].route
+        depart = self._p0[i]
+        version = self._version[i]
+
+        if (route.feu_rouge is not None and route.position_feu is not None
+                and depart < route.position_feu):
+            m = self._tours_pour_atteindre(depart, vitesse, route.position_feu)
+            self._pousser(self._k0[i] + m, self.LIGNE_ARRET, (i, version))
+            return
+
+        if depart < route.longueur:
+            m = self._tours_pour_atteindre(depart, vitesse, route.longueur)
+            self._pousser(self._k0[i] + m, self.FIN_ROUTE, (i, version))
+
+    # ------------------------------------------------------------------
+    # Traitement
+    # ------------------------------------------------------------------
+    def _synchroniser_feu(self, route, tour):
+        """Amène le feu de `route` à l'état du tour `tour`."""
+        ecart = tour - self._tour_feu[route.nom]
+        if ecart > 0:
+            route.feu_rouge.avancer_temps(ecart * self.delta_t)
+            self._tour_feu[route.nom] = tour
+
+    def _traiter(self, tour, nature, cle):
+        """Applique un événement extrait de la file."""
+        if nature == self.FEU:
+            route = self.reseau.routes[cle]
+            self._synchroniser_feu(route, tour)
+            self._planifier_feu(route)
+            self.nb_evenements += 1
+            return
+
+        i, version = cle
+        if version != self._version[i]:
+            # événement périmé (le véhicule s'est arrêté entre-temps)
+            return
+        self.nb_evenements += 1
+        route = self._vehicules[i].route
+
+        if nature == self.LIGNE_ARRET:
+            if route.feu_rouge.etat == 'rouge':
+                # arrêt juste avant le feu, vitesse nulle
+                self._p0[i] = max(0.0, route.position_feu - 1.0)
+                self._v[i] = 0.0
+                self._k0[i] = tour
+                self._version[i] += 1
+                return
+            # feu franchi: prochain événement, le bout de la route
+            if route.longueur > route.position_feu:
+                m = self._tours_pour_atteindre(self._p0[i], self._v[i], route.longueur)
+                self._pousser(self._k0[i] + m, self.FIN_ROUTE, (i, version))
+
+    def prochain_tour(self):
+        """Tour du prochain événement en file, ou None si la file est vide."""
+        return self._file[0][0] if self._file else None
+
+    def avancer_jusqu_a(self, tour_final, rappel=None):
+        """Traite tous les événements jusqu'au tour `tour_final` inclus.
+
+        Args:
+            tour_final (int): dernier tour à atteindre.
+            rappel (callable, optional): appelé avec chaque numéro de tour
+                franchi (y compris les tours sans événement), une fois l'état
+                de ce tour établi. Sans rappel, les tours intermédiaires ne
+                sont jamais calculés.
+        """
+        while self._file and self._file[0][0] <= tour_final:
+            tour = self._file[0][0]
+            if rappel is not None:
+                for t in range(self.tour + 1, tour):
+                    rappel(t)
+            while self._file and self._file[0][0] == tour:
+                _, nature, _, cle = heapq.heappop(self._file)
+                self._traiter(tour, nature, cle)
+            self.tour = tour
+            if rappel is not None:
+                rappel(tour)
+
+        if rappel is not None:
+            for t in range(self.tour + 1, tour_final + 1):
+                rappel(t)
+        self.tour = max(self.tour, tour_final)
+
+    def synchroniser(self):
+        """Écrit dans les véhicules et les feux l'état du tour courant."""
+        for i, vehicule in enumerate(self._vehicules):
+            vehicule.position = self.position(i, self.tour)
+            vehicule.vitesse = self._v[i]
+        for nom in self._tour_feu:
+            self._synchroniser_feu(self.reseau.routes[nom], self.tour)
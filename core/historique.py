@@ -0,0 +1,376 @@
+"""Historique colonnaire des positions.
+
+Remplace la liste de dictionnaires `{vehicule_id: position}` (un dict par
+tour, environ 200 octets par véhicule et par tour) par une matrice préallouée
+`(tours × véhicules)` de flottants. Chaque identifiant de véhicule reçoit une
+colonne stable; les cases d'un véhicule absent à un tour valent NaN. Les
+lignes sont allouées par blocs et les colonnes doublent à la demande.
+
+`HistoriqueMemmap` applique le même principe à un fichier projeté en
+mémoire pour les simulations dont l'historique dépasse la RAM.
+
+NumPy est requis (dépendance optionnelle du projet).
+"""
+
+import json
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+
+class HistoriqueColonnaire:
+    """Enregistreur de positions en colonnes (une colonne par véhicule).
+
+    Attributs:
+        ids (list): identifiants des véhicules, dans l'ordre des colonnes.
+        colonnes (dict): identifiant -> indice de colonne.
+        n_tours (int): nombre de tours enregistrés.
+    """
+
+    def __init__(self, dtype="float64", taille_bloc=1024, nb_colonnes=64):
+        """Préalloue la matrice d'historique.
+
+        Args:
+            dtype (str): type des positions ("float64" ou "float32").
+            taille_bloc (int): nombre de lignes ajoutées à chaque agrandissement.
+            nb_colonnes (int): nombre initial de colonnes.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("L'historique colonnaire nécessite NumPy (pip install numpy)")
+        self.dtype = np.dtype(dtype)
+        self.taille_bloc = max(int(taille_bloc), 1)
+        self.ids = []
+        self.colonnes = {}
+        self.n_tours = 0
+        self._temps = np.empty(self.taille_bloc, dtype=np.float64)
+        self._donnees = np.full((self.taille_bloc, max(int(nb_colonnes), 1)), np.nan,
+                                dtype=self.dtype)
+        # correspondance emplacement du moteur -> colonne, recalculée si la table change
+        self._cache_moteur = None
+
+    @classmethod
+    def depuis_tableaux(cls, ids, temps, positions):
+        """Reconstruit un historique à partir de ses colonnes (voir `Export.charger_binaire`).
+
+        Args:
+            ids (list): identifiants des véhicules, dans l'ordre des colonnes.
+            temps (array-like): temps de chaque tour.
+            positions (array-like): matrice tours × véhicules (NaN si absent).
+
+        Returns:
+            HistoriqueColonnaire: historique contenant ces tours.
+        """
+        positions = np.asarray(positions)
+        historique = cls(dtype=positions.dtype if positions.dtype.kind == "f" else "float64",
+                         taille_bloc=max(len(temps), 1), nb_colonnes=max(len(ids), 1))
+        historique.ids = list(ids)
+        historique.colonnes = {vid: i for i, vid in enumerate(historique.ids)}
+        historique.n_tours = len(temps)
+        historique._temps[:len(temps)] = temps
+        historique._donnees[:len(temps), :len(ids)] = positions
+        return historique
+
+    # ------------------------------------------------------------------
+    # Accès
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return self.n_tours
+
+    def __getitem__(self, tour):
+        """Retourne le snapshot du tour `tour` au format {"temps", "positions"}."""
+        if tour < 0:
+            tour += self.n_tours
+        if not 0 <= tour < self.n_tours:
+            raise IndexError(tour)
+        ligne = self._donnees[tour, :len(self.ids)]
+        positions = {vid: float(p) for vid, p in zip(self.ids, ligne) if not np.isnan(p)}
+        return {"temps": float(self._temps[tour]), "positions": positions}
+
+    def __iter__(self):
+        for tour in range(self.n_tours):
+            yield self[tour]
+
+    @property
+    def temps(self):
+        """Vue sur les temps enregistrés (un par tour)."""
+        return self._temps[:self.n_tours]
+
+    @property
+    def matrice(self):
+        """Vue `(tours × véhicules)` sur les positions enregistrées (NaN si absent)."""
+        return self._donnees[:self.n_tours, :len(self.ids)]
+
+    def positions_vehicule(self, vehicule_id):
+        """Retourne la série des positions du véhicule `vehicule_id` (vue)."""
+        return self._donnees[:self.n_tours, self.colonnes[vehicule_id]]
+
+    # ------------------------------------------------------------------
+    # Enregistrement
+    # ------------------------------------------------------------------
+    def _colonne(self, vehicule_id):
+        """Retourne (en la créant au besoin) la colonne du véhicule."""
+        colonne = self.colonnes.get(vehicule_id)
+        if colonne is None:
+            colonne = len(self.ids)
+            if colonne >= self._donnees.shape[1]:
+                self._agrandir(colonnes=2 * self._donnees.shape[1])
+            self.colonnes[vehicule_id] = colonne
+            self.ids.append(vehicule_id)
+        return colonne
+
+    def _agrandir(self, lignes=None, colonnes=None):
+        """Agrandit la matrice (lignes par blocs, colonnes par doublement).
+
+        Les blocs de lignes croissent avec la matrice (au moins `taille_bloc`,
+        sinon la moitié des lignes existantes) pour garder un coût amorti
+        constant par tour sur les longues simulations.
+        """
+        lignes = lignes or self._donnees.shape[0]
+        colonnes = colonnes or self._donnees.shape[1]
+        donnees = np.full((lignes, colonnes), np.nan, dtype=self.dtype)
+        anciennes = self._donnees
+        donnees[:anciennes.shape[0], :anciennes.shape[1]] = anciennes
+        self._donnees = donnees
+        if lignes > len(self._temps):
+            temps = np.empty(lignes, dtype=np.float64)
+            temps[:self.n_tours] = self._temps[:self.n_tours]
+            self._temps = temps
+
+    def _nouvelle_ligne(self, temps):
+        """Réserve la ligne du prochain tour et y inscrit `temps`."""
+        if self.n_tours >= self._donnees.shape[0]:
+            lignes = self._donnees.shape[0]
+            self._agrandir(lignes=lignes + max(self.taille_bloc, lignes // 2))
+        tour = self.n_tours
+        self._temps[tour] = temps
+        self.n_tours += 1
+        return tour
+
+    def enregistrer_positions(self, temps, positions):
+        """Enregistre un tour à partir d'un dictionnaire {vehicule_id: position}."""
+        colonnes = [self._colonne(vid) for vid in positions]
+        tour = self._nouvelle_ligne(temps)
+        if colonnes:
+            self._donnees[tour, colonnes] = list(positions.values())
+
+    def enregistrer(self, temps, reseau):
+        """Enregistre les positions courantes des véhicules de `reseau`.
+
+        Si le réseau est compilé (`ReseauRoutier.compiler_moteur`), les
+        positions sont recopiées directement depuis la table du moteur en une
+        seule affectation indexée.
+        """
+        moteur = getattr(reseau, "moteur", None)
+        if moteur is None:
+            self.enregistrer_positions(temps, {v.id: v.position
+                                               for route in reseau.routes.values()
+                                               for v in route.vehicules})
+            return
+
+        cache = self._cache_moteur
+        if cache is None or cache[0] is not moteur or cache[1] != moteur.version:
+            colonnes = np.array([self._colonne(vid) for vid in moteur.ids[:moteur.n]],
+                                dtype=np.intp)
+            cache = self._cache_moteur = (moteur, moteur.version, colonnes)
+        colonnes = cache[2]
+        tour = self._nouvelle_ligne(temps)
+        self._donnees[tour, colonnes] = moteur.positions[:moteur.n]
+
+
+class HistoriqueMemmap(HistoriqueColonnaire):
+    """Historique colonnaire écrit directement dans un fichier projeté en mémoire.
+
+    Format du fichier (petit-boutiste):
+        - en-tête de 64 octets: signature `SIMHIST1`, nombre de tours,
+          nombre de colonnes réservées, nombre de lignes réservées;
+        - puis une ligne float64 par tour: [temps, position_0, ..., position_{C-1}].
+    Les identifiants des véhicules (ordre des colonnes) sont écrits à côté,
+    dans `<chemin>.ids.json`.
+
+    Les cadres sont écrits dans un `numpy.memmap` agrandi par blocs de lignes
+    et vidé sur disque à chaque bloc: la mémoire résidente reste bornée
+    quelle que soit la durée de la simulation. Le fichier se relit avec
+    `HistoriqueMemmap.ouvrir` pour un accès direct par plage de tours ou
+    par véhicule.
+    """
+
+    SIGNATURE = b"SIMHIST1"
+    ENTETE = struct.Struct("<8sQQQ")
+    TAILLE_ENTETE = 64
+
+    def __init__(self, chemin, nb_colonnes=1024, taille_bloc=4096):
+        """Crée (ou écrase) le fichier d'historique `chemin`.
+
+        Args:
+            chemin (str): fichier binaire de destination.
+            nb_colonnes (int): nombre de colonnes réservées (véhicules); le
+                fichier est réécrit par blocs si ce nombre est dépassé.
+            taille_bloc (int): nombre de lignes ajoutées (et vidées sur
+                disque) à chaque agrandissement.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("L'historique sur disque nécessite NumPy (pip install numpy)")
+        self.chemin = chemin
+        self.dtype = np.dtype(np.float64)
+        self.taille_bloc = max(int(taille_bloc), 1)
+        self.ids = []
+        self.colonnes = {}
+        self.n_tours = 0
+        self._cache_moteur = None
+        self._lecture_seule = False
+
+        nb_colonnes = max(int(nb_colonnes), 1)
+        with open(chemin, "wb") as f:
+            f.write(self._entete(0, nb_colonnes, self.taille_bloc))
+            f.truncate(self.TAILLE_ENTETE + self.taille_bloc * (1 + nb_colonnes) * 8)
+        self._projeter(self.taille_bloc, nb_colonnes, "r+")
+        self._cadres[:, 1:] = np.nan
+
+    @classmethod
+    def ouvrir(cls, chemin):
+        """Ouvre en lecture seule un historique écrit par `HistoriqueMemmap`.
+
+        Args:
+            chemin (str): fichier binaire d'historique.
+
+        Returns:
+            HistoriqueMemmap: historique projeté (aucune donnée n'est chargée).
+
+        Raises:
+            ValueError: Si le fichier n'est pas un historique valide.
+        """
+        with open(chemin, "rb") as f:
+            signature, n_tours, nb_colonnes, nb_lignes = cls.ENTETE.unpack(
+                f.read(cls.ENTETE.size))
+        if signature != cls.SIGNATURE:
+            raise ValueError(f"'{chemin}' n'est pas un fichier d'historique valide")
+
+        historique = cls.__new__(cls)
+        historique.chemin = chemin
+        historique.dtype = np.dtype(np.float64)
+        historique.taille_bloc = max(int(nb_lignes), 1)
+        historique.n_tours = int(n_tours)
+        historique._cache_moteur = None
+        historique._lecture_seule = True
+        with open(cls._chemin_ids(chemin), "r", encoding="utf-8") as f:
+            historique.ids = json.load(f)
+        historique.colonnes = {vid: i for i, vid in enumerate(historique.ids)}
+        historique._projeter(max(int(nb_lignes), 1), int(nb_colonnes), "r")
+        return historique
+
+    @staticmethod
+    def _chemin_ids(chemin):
+        return f"{chemin}.ids.json"
+
+    def _entete(self, n_tours, nb_colonnes, nb_lignes):
+        return self.ENTETE.pack(self.SIGNATURE, n_tours, nb_colonnes, nb_lignes).ljust(
+            self.TAILLE_ENTETE, b"\0")
+
+    def _projeter(self, nb_lignes, nb_colonnes, mode):
+        """Projette le fichier: colonne 0 = temps, colonnes suivantes = positions."""
+        self._cadres = np.memmap(self.chemin, dtype=np.float64, mode=mode,
+                                 offset=self.TAILLE_ENTETE, shape=(nb_lignes, 1 + nb_colonnes))
+        self._temps = self._cadres[:, 0]
+        self._donnees = self._cadres[:, 1:]
+
+    def _liberer_projection(self):
+        if not self._lecture_seule:
+            self._cadres.flush()
+        self._cadres = self._temps = self._donnees = None
+
+    def _agrandir(self, lignes=None, colonnes=None):
+        """Agrandit le fichier: ajout de lignes sur place, ou réécriture pour les colonnes."""
+        if self._lecture_seule:
+            raise RuntimeError("Historique ouvert en lecture seule")
+        nb_lignes, nb_colonnes = self._donnees.shape
+        lignes = max(lignes or nb_lignes, nb_lignes)
+        colonnes = max(colonnes or nb_colonnes, nb_colonnes)
+
+        if colonnes > nb_colonnes:
+            self._reecrire(lignes, colonnes)
+            return
+
+        self._liberer_projection()
+        with open(self.chemin, "r+b") as f:
+            f.truncate(self.TAILLE_ENTETE + lignes * (1 + nb_colonnes) * 8)
+        self._projeter(lignes, nb_colonnes, "r+")
+        self._cadres[nb_lignes:, 1:] = np.nan
+
+    def _reecrire(self, lignes, colonnes):
+        """Recopie le fichier avec plus de colonnes, par blocs de lignes."""
+        temporaire = f"{self.chemin}.tmp"
+        with open(temporaire, "wb") as f:
+            f.write(self._entete(self.n_tours, colonnes, lignes))
+            f.truncate(self.TAILLE_ENTETE + lignes * (1 + colonnes) * 8)
+        nouveau = np.memmap(temporaire, dtype=np.float64, mode="r+",
+                            offset=self.TAILLE_ENTETE, shape=(lignes, 1 + colonnes))
+        ancien_nb_colonnes = self._cadres.shape[1]
+        for debut in range(0, lignes, self.taille_bloc):
+            fin = min(debut + self.taille_bloc, lignes)
+            nouveau[debut:fin, ancien_nb_colonnes:] = np.nan
+            if debut < self._cadres.shape[0]:
+                fin_ancien = min(fin, self._cadres.shape[0])
+                nouveau[debut:fin_ancien, :ancien_nb_colonnes] = self._cadres[debut:fin_ancien]
+        nouveau.flush()
+        del nouveau
+
+        self._liberer_projection()
+        os.replace(temporaire, self.chemin)
+        self._projeter(lignes, colonnes, "r+")
+
+    def _nouvelle_ligne(self, temps):
+        """Réserve la ligne du prochain tour, par blocs de `taille_bloc` lignes."""
+        if self._lecture_seule:
+            raise RuntimeError("Historique ouvert en lecture seule")
+        if self.n_tours >= self._donnees.shape[0]:
+            self.flush()
+            self._agrandir(lignes=self._donnees.shape[0] + self.taille_bloc)
+        tour = self.n_tours
+        self._temps[tour] = temps
+        self.n_tours += 1
+        return tour
+
+    def lire(self, tours=slice(None), vehicules=None):
+        """Accès direct à une plage de tours et/ou à une sélection de véhicules.
+
+        Args:
+            tours (slice): plage de tours (par défaut tous).
+            vehicules (list, optional): identifiants des véhicules voulus.
+
+        Returns:
+            tuple: (temps, positions) pour la sélection demandée.
+        """
+        debut, fin, pas = tours.indices(self.n_tours)
+        lignes = slice(debut, fin, pas)
+        if vehicules is None:
+            return self._temps[lignes], self._donnees[lignes, :len(self.ids)]
+        colonnes = [self.colonnes[vid] for vid in vehicules]
+        return self._temps[lignes], self._donnees[lignes][:, colonnes]
+
+    def flush(self):
+        """Écrit l'en-tête, les identifiants et les cadres en attente sur disque."""
+        if self._lecture_seule or self._cadres is None:
+            return
+        self._cadres.flush()
+        nb_lignes, nb_colonnes = self._donnees.shape
+        with open(self.chemin, "r+b") as f:
+            f.write(self._entete(self.n_tours, nb_colonnes, nb_lignes))
+        with open(self._chemin_ids(self.chemin), "w", encoding="utf-8") as f:
+            json.dump(self.ids, f)
+
+    def fermer(self):
+        """Vide l'historique sur disque et libère la projection."""
+        if self._cadres is None:
+            return
+        self.flush()
+        self._liberer_projection()
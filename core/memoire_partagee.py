@@ -0,0 +1,124 @@
+"""État des véhicules en mémoire partagée pour la simulation multi-processus.
+
+Les colonnes positions et vitesses de la table globale sont placées dans deux
+blocs `multiprocessing.shared_memory`. Les processus de calcul mettent à jour
+leur plage d'emplacements sur place, tandis que le coordinateur (analyseur,
+historique, affichage) lit les mêmes tampons sans aucune copie.
+
+Le cycle de vie est explicite: le créateur des blocs les détruit (`liberer`)
+à la fin de la simulation, y compris sur `KeyboardInterrupt`; une sécurité
+`atexit` couvre le cas où `liberer` n'aurait pas été appelé.
+"""
+
+import atexit
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+
+def _ouvrir_bloc(nom):
+    """Attache un bloc existant sans en prendre la responsabilité.
+
+    Seul le créateur détruit le bloc. Avant Python 3.13 (pas d'option
+    `track`), l'attachement l'inscrit auprès du resource_tracker; celui-ci
+    est hérité du processus créateur et l'inscription y est idempotente, il
+    ne faut donc surtout pas la retirer depuis le processus attaché.
+    """
+    try:
+        return shared_memory.SharedMemory(name=nom, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=nom)
+
+
+class EtatPartage:
+    """Colonnes positions/vitesses (float64) stockées en mémoire partagée.
+
+    Attributs:
+        n (int): nombre d'emplacements.
+        positions (numpy.ndarray): vue sur le bloc des positions.
+        vitesses (numpy.ndarray): vue sur le bloc des vitesses.
+        noms (tuple): noms des blocs, à transmettre aux processus.
+    """
+
+    def __init__(self, n, _blocs=None):
+        """Crée deux blocs de `n` flottants (ou s'attache à des blocs existants).
+
+        Args:
+            n (int): nombre d'emplacements.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("La mémoire partagée nécessite NumPy (pip install numpy)")
+
+        self.n = int(n)
+        taille = max(self.n, 1) * np.dtype(np.float64).itemsize
+        if _blocs is None:
+            self._proprietaire = True
+            self._blocs = (shared_memory.SharedMemory(create=True, size=taille),
+                           shared_memory.SharedMemory(create=True, size=taille))
+            atexit.register(self.liberer)
+        else:
+            self._proprietaire = False
+            self._blocs = _blocs
+
+        self.positions = np.ndarray((self.n,), dtype=np.float64, buffer=self._blocs[0].buf)
+        self.vitesses = np.ndarray((self.n,), dtype=np.float64, buffer=self._blocs[1].buf)
+
+    @classmethod
+    def attacher(cls, noms, n):
+        """S'attache (depuis un autre processus) à des blocs créés ailleurs.
+
+        Args:
+            noms (tuple): noms des blocs positions et vitesses.
+            n (int): nombre d'emplacements.
+
+        Returns:
+            EtatPartage: vue sur les blocs existants (non propriétaire).
+        """
+        return cls(n, _blocs=tuple(_ouvrir_bloc(nom) for nom in noms))
+
+    @property
+    def noms(self):
+        """Noms des blocs (positions, vitesses)."""
+        return tuple(bloc.name for bloc in self._blocs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.liberer()
+        return False
+
+    def fermer(self):
+        """Détache les blocs de ce processus (les vues NumPy deviennent invalides)."""
+        if self._blocs is None:
+            return
+        # les vues doivent disparaître avant de fermer les tampons
+        self.positions = None
+        self.vitesses = None
+        for bloc in self._blocs:
+            try:
+                bloc.close()
+            except BufferError:
+                # une vue externe existe encore: le bloc sera fermé à sa destruction
+                pass
+
+    def liberer(self):
+        """Ferme les blocs et, pour le créateur, les détruit (unlink)."""
+        if self._blocs is None:
+            return
+        blocs = self._blocs
+        self.fermer()
+        self._blocs = None
+        if self._proprietaire:
+            atexit.unregister(self.liberer)
+            for bloc in blocs:
+                try:
+                    bloc.unlink()
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,314 @@
+"""Exécution parallèle de la simulation par partition des routes.
+
+Les routes du réseau sont réparties en tranches équilibrées (par nombre de
+véhicules). Chaque tranche est confiée à un processus (`multiprocessing`,
+relié au coordinateur par un tube) qui la possède pendant toute la
+simulation: il reconstruit ses routes dans un `MoteurVectoriel` local puis
+avance au rythme des commandes du coordinateur.
+
+L'état des véhicules reste dans les processus: à chaque pas, un processus ne
+renvoie que ses statistiques compactes (nombre de véhicules, somme des
+vitesses). Le coordinateur garde une table globale ordonnée par tranche
+(chaque processus correspond à une plage contiguë d'emplacements); elle
+n'est recopiée depuis les processus que lorsqu'on la lit
+(`ExecuteurParallele.synchroniser`: analyse, historique, instantanés), un
+bloc par tranche. Analyse, affichage et historique lisent donc le réseau du
+coordinateur exactement comme en exécution série.
+
+Avec `memoire_partagee=True`, les colonnes positions et vitesses de cette
+table vivent dans des blocs `multiprocessing.shared_memory` (voir
+`core.memoire_partagee`): chaque processus met à jour sa plage sur place et
+le coordinateur la lit sans aucune copie.
+"""
+
+import heapq
+import multiprocessing
+
+from core.memoire_partagee import EtatPartage
+from models import ReseauRoutier, Route, Vehicule
+from models.feu_rouge import FeuRouge
+
+
+def partitionner_routes(routes, nb_tranches):
+    """Répartit `routes` en `nb_tranches` tranches de charge équilibrée.
+
+    Heuristique gloutonne: les routes les plus chargées sont placées en
+    premier dans la tranche la moins chargée. Dans chaque tranche, l'ordre
+    d'origine des routes est conservé.
+
+    Args:
+        routes (list): routes à répartir.
+        nb_tranches (int): nombre de tranches souhaité.
+
+    Returns:
+        list: liste de listes de routes (les tranches vides sont retirées).
+    """
+    routes = list(routes)
+    nb_tranches = max(1, min(int(nb_tranches), len(routes)))
+    ordre = {id(r): i for i, r in enumerate(routes)}
+
+    tas = [(0, i) for i in range(nb_tranches)]
+    tranches = [[] for _ in range(nb_tranches)]
+    for route in sorted(routes, key=lambda r: len(r.vehicules), reverse=True):
+        charge, i = heapq.heappop(tas)
+        tranches[i].append(route)
+        # une route vide compte pour 1 afin de répartir aussi les routes vides
+        heapq.heappush(tas, (charge + max(len(route.vehicules), 1), i))
+
+    return [sorted(t, key=lambda r: ordre[id(r)]) for t in tranches if t]
+
+
+def decrire_route(route):
+    """Retourne une description picklable de `route`, de son feu et de ses véhicules."""
+    description = {
+        "nom": route.nom,
+        "longueur": route.longueur,
+        "limite_vitesse": route.limite_vitesse,
+        "capacite_max": route.capacite_max,
+        "feu": None,
+        "vehicules": [(v.id, v.position, v.vitesse) for v in route.vehicules],
+    }
+    if route.feu_rouge is not None:
+        feu = route.feu_rouge
+        description["feu"] = (feu.cycle, feu.etat, feu.temps_ecoule, route.position_feu)
+    return description
+
+
+def reconstruire_reseau(descriptions):
+    """Reconstruit un `ReseauRoutier` compilé à partir de descriptions de routes."""
+    reseau = ReseauRoutier()
+    for d in descriptions:
+        route = Route(d["nom"], d["longueur"], d["limite_vitesse"], d["capacite_max"])
+        if d["feu"] is not None:
+            cycle, etat, temps_ecoule, position = d["feu"]
+            route.ajouter_feu_rouge(FeuRouge(cycle, etat, temps_ecoule), position)
+        for identifiant, position, vitesse in d["vehicules"]:
+            route.ajouter_vehicule(Vehicule(identifiant, route, position, vitesse))
+        reseau.ajouter_route(route)
+    reseau.compiler_moteur()
+    return reseau
+
+
+def _executer_tranche(numero, descriptions, canal, partage=None):
+    """Boucle d'un processus: possède sa tranche et avance à chaque commande.
+
+    Commandes reçues sur `canal`:
+        ("pas", delta_t): avancer d'un pas; réponse
+            ((nb_vehicules, somme_vitesses), erreur).
+        ("etat",): réponse (positions, vitesses) de la tranche.
+        ("fin",): terminer le processus.
+
+    Si `partage` = (noms, n, debut, fin) est fourni, l'état est mis à jour
+    directement dans la mémoire partagée.
+    """
+    reseau = reconstruire_reseau(descriptions)
+    moteur = reseau.moteur
+    etat = None
+    if partage is not None:
+        noms, n_total, debut, fin = partage
+        etat = EtatPartage.attacher(noms, n_total)
+        moteur.utiliser_memoire(etat.positions[debut:fin], etat.vitesses[debut:fin])
+
+    try:
+        _boucle_tranche(reseau, canal)
+    finally:
+        if etat is not None:
+            moteur.liberer_memoire()
+            etat.fermer()
+        canal.close()
+    return numero
+
+
+def _boucle_tranche(reseau, canal):
+    """Traite les commandes du coordinateur jusqu'à la commande de fin."""
+    moteur = reseau.moteur
+    while True:
+        commande = canal.recv()
+        if commande[0] == "fin":
+            return
+        n = moteur.n
+        if commande[0] == "etat":
+            canal.send((moteur.positions[:n].copy(), moteur.vitesses[:n].copy()))
+            continue
+
+        erreur = None
+        try:
+            reseau.mettre_a_jour(commande[1])
+        except Exception as e:
+            erreur = f"{type(e).__name__}: {e}"
+        canal.send(((n, float(moteur.vitesses[:n].sum())), erreur))
+
+
+class ExecuteurParallele:
+    """Coordonne l'avancement d'un réseau réparti sur plusieurs processus.
+
+    S'utilise comme gestionnaire de contexte: les processus sont démarrés à
+    l'entrée et arrêtés proprement à la sortie (y compris sur
+    `KeyboardInterrupt`).
+
+    Attributs:
+        reseau (ReseauRoutier): réseau du coordinateur (compilé par tranche).
+        tranches (list): routes de chaque processus.
+        bornes (list): plage d'emplacements (debut, fin) de chaque tranche.
+        stats_tranches (list): dernières statistiques compactes reçues
+            (nb_vehicules, somme_vitesses) de chaque tranche (voir `statistiques`).
+        memoire_partagee (bool): état logé en mémoire partagée.
+    """
+
+    def __init__(self, reseau, workers, memoire_partagee=False):
+        """Prépare le partitionnement de `reseau` en `workers` tranches.
+
+        Args:
+            reseau (ReseauRoutier): réseau à simuler.
+            workers (int): nombre de processus souhaité.
+            memoire_partagee (bool): loger positions et vitesses dans des
+                blocs de mémoire partagée mis à jour sur place.
+        """
+        self.reseau = reseau
+        self.memoire_partagee = memoire_partagee
+        self.tranches = partitionner_routes(reseau.routes.values(), workers)
+
+        # table globale du coordinateur ordonnée par tranche
+        reseau.compiler_moteur([r for tranche in self.tranches for r in tranche])
+        self.bornes = []
+        debut = 0
+        for tranche in self.tranches:
+            fin = debut + sum(len(r.vehicules) for r in tranche)
+            self.bornes.append((debut, fin))
+            debut = fin
+
+        vitesses = reseau.moteur.vitesses
+        self.stats_tranches = [(fin - debut, float(vitesses[debut:fin].sum()))
+                               for debut, fin in self.bornes]
+        self._processus = []
+        self._canaux = []
+        self._etat = None
+        # vrai lorsque la table du coordinateur est en retard sur les processus
+        self._perime = False
+
+    def __enter__(self):
+        self.demarrer()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fermer()
+        return False
+
+    def demarrer(self):
+        """Démarre un processus par tranche (et la mémoire partagée si demandée)."""
+        moteur = self.reseau.moteur
+        partages = [None] * len(self.tranches)
+        if self.memoire_partagee:
+            self._etat = EtatPartage(moteur.n)
+            moteur.utiliser_memoire(self._etat.positions, self._etat.vitesses)
+            partages = [(self._etat.noms, moteur.n, debut, fin) for debut, fin in self.bornes]
+
+        for i, tranche in enumerate(self.tranches):
+            canal, canal_processus = multiprocessing.Pipe()
+            processus = multiprocessing.Process(
+                target=_executer_tranche,
+                args=(i, [decrire_route(r) for r in tranche], canal_processus, partages[i]),
+                daemon=True)
+            processus.start()
+            canal_processus.close()
+            self._canaux.append(canal)
+            self._processus.append(processus)
+
+    def avancer(self, delta_t):
+        """Avance toutes les tranches d'un pas et reçoit leurs statistiques.
+
+        Sans mémoire partagée, la table du coordinateur n'est pas recopiée
+        ici (voir `synchroniser`).
+
+        Args:
+            delta_t (float): Intervalle de temps en secondes.
+
+        Raises:
+            RuntimeError: Si une tranche a rencontré une erreur pendant le pas.
+        """
+        # les feux du coordinateur avancent au même rythme que ceux des tranches
+        self.reseau.moteur.avancer_feux(delta_t)
+        for canal in self._canaux:
+            canal.send(("pas", delta_t))
+        self._perime = not self.memoire_partagee
+
+        erreurs = []
+        for numero in range(len(self.tranches)):
+            stats, erreur = self._recevoir(numero)
+            self.stats_tranches[numero] = stats
+            if erreur is not None:
+                erreurs.append(f"tranche {numero}: {erreur}")
+
+        if erreurs:
+            raise RuntimeError("; ".join(erreurs))
+
+    def synchroniser(self):
+        """Recopie dans la table du coordinateur l'état courant des tranches.
+
+        Sans effet en mémoire partagée ou si la table est déjà à jour.
+        """
+        if not self._perime:
+            return
+        moteur = self.reseau.moteur
+        for canal in self._canaux:
+            canal.send(("etat",))
+        for numero, (debut, fin) in enumerate(self.bornes):
+            positions, vitesses = self._recevoir(numero)
+            moteur.positions[debut:fin] = positions
+            moteur.vitesses[debut:fin] = vitesses
+        self._perime = False
+
+    def statistiques(self):
+        """Statistiques globales tirées des statistiques compactes des tranches.
+
+        Returns:
+            dict: {"nb_vehicules", "moyenne_vitesse"} du dernier pas, sans
+                recopier l'état des tranches.
+        """
+        n = sum(nb for nb, _ in self.stats_tranches)
+        somme = sum(total for _, total in self.stats_tranches)
+        return {"nb_vehicules": n, "moyenne_vitesse": somme / n if n else 0}
+
+    def _recevoir(self, numero):
+        """Attend la réponse de la tranche `numero` en surveillant son processus."""
+        canal = self._canaux[numero]
+        while not canal.poll(1.0):
+            processus = self._processus[numero]
+            if not processus.is_alive():
+                raise RuntimeError(f"Le processus de la tranche {numero} s'est arrêté "
+                                   f"(code de sortie {processus.exitcode})")
+        return canal.recv()
+
+    def fermer(self):
+        """Récupère l'état final, arrête les processus et détruit la mémoire partagée."""
+        try:
+            try:
+                if self._processus and all(p.is_alive() for p in self._processus):
+                    self.synchroniser()
+            finally:
+                self._arreter_processus()
+        finally:
+            if self._etat is not None:
+                # l'état final repasse en mémoire privée avant destruction des blocs
+                self.reseau.moteur.liberer_memoire()
+                self._etat.liberer()
+                self._etat = None
+
+    def _arreter_processus(self):
+        """Envoie la commande de fin aux processus et attend leur arrêt."""
+        try:
+            for canal in self._canaux:
+                try:
+                    canal.send(("fin",))
+                except (BrokenPipeError, OSError):
+                    pass
+            for processus in self._processus:
+                processus.join(timeout=10)
+                if processus.is_alive():
+                    processus.terminate()
+                    processus.join()
+        finally:
+            for canal in self._canaux:
+                canal.close()
+            self._canaux = []
+            self._processus = []
@@ -0,0 +1,273 @@
+"""Pipeline d'analyse exécuté hors de la boucle de simulation.
+
+À chaque tour d'analyse, le simulateur fige l'état du réseau dans un
+`InstantaneReseau` (copies NumPy en lecture seule) et le dépose dans une
+file bornée. Un fil de travail le transmet à chaque analyseur enregistré:
+un calcul d'indicateurs lent ne retarde plus la physique, il ne fait que
+remplir la file (contre-pression mesurée, ou abandon d'instantanés si on
+le demande).
+
+Un analyseur est tout objet exposant `analyser(reseau)`. L'instantané
+présente la même interface qu'un réseau compilé (`routes`, `moteur`), si
+bien que `core.analyseur.Analyseur` est directement utilisable: c'est le
+greffon par défaut.
+
+NumPy est requis (dépendance optionnelle du projet).
+"""
+
+import collections
+import queue
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+from core.analyseur import Analyseur
+
+
+VehiculeFige = collections.namedtuple("VehiculeFige", "id position vitesse")
+
+
+def _lecture_seule(tableau):
+    tableau.flags.writeable = False
+    return tableau
+
+
+class RouteFigee:
+    """Vue en lecture seule d'une route dans un `InstantaneReseau`."""
+
+    def __init__(self, table, indice, nom, longueur, capacite_max):
+        self._table = table
+        self._indice = indice
+        self._moteur = None
+        self.nom = nom
+        self.longueur = longueur
+        self.capacite_max = capacite_max
+
+    @property
+    def vehicules(self):
+        """Véhicules de la route (construits à la demande, non modifiables)."""
+        table = self._table
+        emplacements = table.ordre[table.bornes[self._indice]:table.bornes[self._indice + 1]]
+        return tuple(VehiculeFige(table.ids[i], float(table.positions[i]),
+                                  float(table.vitesses[i]))
+                     for i in emplacements)
+
+
+class TableFigee:
+    """Colonnes immuables des véhicules, avec l'interface d'un `MoteurVectoriel`.
+
+    Attributs:
+        n (int): nombre de véhicules.
+        ids, positions, vitesses, indices_routes (numpy.ndarray): colonnes.
+        routes (list): routes figées, dans l'ordre de leur indice.
+        longueurs, capacites (numpy.ndarray): tables par route.
+        occupation (numpy.ndarray): nombre de véhicules de chaque route.
+        ordre, bornes (numpy.ndarray): emplacements groupés par route: ceux
+            de la route i sont `ordre[bornes[i]:bornes[i + 1]]` (calculés une
+            fois par instantané).
+    """
+
+    def __init__(self, ids, positions, vitesses, indices_routes, routes):
+        self.ids = _lecture_seule(ids)
+        self.positions = _lecture_seule(positions)
+        self.vitesses = _lecture_seule(vitesses)
+        self.indices_routes = _lecture_seule(indices_routes)
+        self.n = len(ids)
+        self.longueurs = _lecture_seule(np.array([r[1] for r in routes], dtype=np.float64))
+        self.capacites = _lecture_seule(np.array([r[2] for r in routes], dtype=np.float64))
+        self.routes = [RouteFigee(self, i, nom, longueur, capacite)
+                       for i, (nom, longueur, capacite) in enumerate(routes)]
+        self.occupation = _lecture_seule(np.bincount(indices_routes, minlength=len(routes)))
+        self.ordre = _lecture_seule(np.argsort(indices_routes, kind="stable"))
+        bornes = np.zeros(len(routes) + 1, dtype=np.int64)
+        np.cumsum(self.occupation, out=bornes[1:])
+        self.bornes = _lecture_seule(bornes)
+
+
+class InstantaneReseau:
+    """État figé du réseau à un tour donné, sous forme de tableaux immuables.
+
+    Expose l'interface d'un `ReseauRoutier` compilé: `routes` (nom -> route)
+    et `moteur` (table des véhicules, voir `TableFigee`).
+
+    Attributs:
+        tour (int): numéro du tour (depuis 1).
+        temps (float): temps simulé.
+        moteur (TableFigee): colonnes des véhicules.
+        routes (dict): nom -> `RouteFigee`.
+    """
+
+    def __init__(self, tour, temps, table):
+        self.tour = tour
+        self.temps = temps
+        self.moteur = table
+        self.routes = {route.nom: route for route in table.routes}
+
+    @classmethod
+    def depuis_reseau(cls, reseau, tour, temps):
+        """Copie l'état courant de `reseau` (depuis la table du moteur si elle existe)."""
+        moteur = reseau.moteur
+        if moteur is not None:
+            n = moteur.n
+            table = TableFigee(moteur.ids[:n].copy(), moteur.positions[:n].copy(),
+                               moteur.vitesses[:n].copy(), moteur.indices_routes[:n].copy(),
+                               [(r.nom, float(r.longueur), float(r.capacite_max))
+                                for r in moteur.routes])
+            return cls(tour, temps, table)
+
+        routes = list(reseau.routes.values())
+        vehicules = [(i, v) for i, route in enumerate(routes) for v in route.vehicules]
+        ids = np.empty(len(vehicules), dtype=object)
+        ids[:] = [v.id for _, v in vehicules]
+        table = TableFigee(ids,
+                           np.array([v.position for _, v in vehicules], dtype=np.float64),
+                           np.array([v.vitesse for _, v in vehicules], dtype=np.float64),
+                           np.array([i for i, _ in vehicules], dtype=np.int32),
+                           [(r.nom, float(r.longueur), float(r.capacite_max)) for r in routes])
+        return cls(tour, temps, table)
+
+
+class PipelineAnalyse:
+    """Analyseurs exécutés dans un fil de travail sur des instantanés du réseau.
+
+    Attributs:
+        analyseurs (dict): nom -> analyseur (objet exposant `analyser`).
+        resultats (dict): nom -> liste de (tour, temps, résultat), si `conserver`.
+        derniers (dict): nom -> dernier (tour, temps, résultat) obtenu.
+        erreurs (list): (nom, tour, exception) des analyses ou rappels en échec.
+        nb_instantanes (int): nombre d'instantanés déposés.
+        nb_abandons (int): instantanés abandonnés (file pleine, `abandonner`).
+        nb_attentes (int): dépôts ayant attendu une place dans la file.
+        temps_attente (float): temps total d'attente de la simulation (s).
+    """
+
+    _FIN = object()
+
+    def __init__(self, analyseurs=None, taille_file=8, abandonner=False, conserver=True,
+                 rappel=None):
+        """Démarre le fil de travail.
+
+        Args:
+            analyseurs (dict, optional): nom -> analyseur. Par défaut, le
+                greffon intégré {"analyseur": Analyseur()}.
+            taille_file (int): nombre maximal d'instantanés en attente.
+            abandonner (bool): si la file est pleine, abandonner l'instantané
+                au lieu de faire attendre la simulation.
+            conserver (bool): conserver tous les résultats dans `resultats`.
+            rappel (callable, optional): appelé dans le fil de travail avec
+                (nom, tour, temps, résultat) après chaque analyse; ses
+                exceptions sont rangées dans `erreurs` comme celles des
+                analyseurs.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+            ValueError: Si `taille_file` < 1.
+        """
+        if np is None:
+            raise ImportError("Le pipeline d'analyse nécessite NumPy (pip install numpy)")
+        if not isinstance(taille_file, int) or taille_file < 1:
+            raise ValueError(f"taille_file doit être un entier >= 1, reçu: {taille_file}")
+        self.analyseurs = dict(analyseurs) if analyseurs is not None \
+            else {"analyseur": Analyseur()}
+        self.abandonner = abandonner
+        self.conserver = conserver
+        self.rappel = rappel
+        self.resultats = {nom: [] for nom in self.analyseurs}
+        self.derniers = {}
+        self.erreurs = []
+        self.nb_instantanes = 0
+        self.nb_abandons = 0
+        self.nb_attentes = 0
+        self.temps_attente = 0.0
+        self._file = queue.Queue(maxsize=taille_file)
+        self._fil = threading.Thread(target=self._boucle, name="pipeline-analyse", daemon=True)
+        self._fil.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fermer()
+        return False
+
+    def enregistrer(self, nom, analyseur):
+        """Ajoute un analyseur (à faire avant le premier instantané)."""
+        self.analyseurs[nom] = analyseur
+        self.resultats.setdefault(nom, [])
+
+    def _boucle(self):
+        while True:
+            instantane = self._file.get()
+            try:
+                if instantane is self._FIN:
+                    return
+                for nom, analyseur in self.analyseurs.items():
+                    # une erreur d'analyse ou de rappel ne doit pas arrêter le fil:
+                    # plus personne ne viderait la file et `soumettre` bloquerait
+                    try:
+                        resultat = analyseur.analyser(instantane)
+                        entree = (instantane.tour, instantane.temps, resultat)
+                        self.derniers[nom] = entree
+                        if self.conserver:
+                            self.resultats[nom].append(entree)
+                        if self.rappel is not None:
+                            self.rappel(nom, *entree)
+                    except Exception as e:
+                        self.erreurs.append((nom, instantane.tour, e))
+            finally:
+                self._file.task_done()
+
+    def soumettre(self, reseau, tour, temps):
+        """Fige l'état de `reseau` et le dépose dans la file d'analyse.
+
+        Returns:
+            bool: faux si l'instantané a été abandonné (file pleine).
+
+        Raises:
+            RuntimeError: Si le fil de travail est arrêté (pipeline fermé).
+        """
+        self._verifier_fil()
+        instantane = InstantaneReseau.depuis_reseau(reseau, tour, temps)
+        try:
+            self._file.put_nowait(instantane)
+        except queue.Full:
+            if self.abandonner:
+                self.nb_abandons += 1
+                return False
+            debut = time.perf_counter()
+            while True:
+                try:
+                    self._file.put(instantane, timeout=0.1)
+                    break
+                except queue.Full:
+                    self._verifier_fil()
+            self.nb_attentes += 1
+            self.temps_attente += time.perf_counter() - debut
+        self.nb_instantanes += 1
+        return True
+
+    def _verifier_fil(self):
+        if not self._fil.is_alive():
+            raise RuntimeError("Le fil du pipeline d'analyse est arrêté: "
+                               "aucun instantané ne peut plus être analysé")
+
+    def attendre(self):
+        """Attend que tous les instantanés déposés soient analysés."""
+        if self._fil.is_alive():
+            self._file.join()
+
+    def metriques(self):
+        """Mesures de contre-pression du pipeline."""
+        return {"nb_instantanes": self.nb_instantanes, "en_attente": self._file.qsize(),
+                "nb_abandons": self.nb_abandons, "nb_attentes": self.nb_attentes,
+                "temps_attente": self.temps_attente, "nb_erreurs": len(self.erreurs)}
+
+    def fermer(self):
+        """Termine les analyses en attente et arrête le fil de travail."""
+        if self._fil.is_alive():
+            self._file.put(self._FIN)
+            self._fil.join()
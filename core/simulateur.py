@@ -1,10 +1,15 @@
 from models import ReseauRoutier, Route, Vehicule
+from models.moteur_vectoriel import numpy_disponible
 from core.analyseur import Analyseur
+from core.evenements import PlanificateurEvenements
+from core.historique import HistoriqueColonnaire, HistoriqueMemmap
+from core.parallele import ExecuteurParallele
 from io_pkg import Affichage, Export
+from io_pkg.flux import COMPRESSIONS, EXTENSIONS, ouvrir_sortie_texte
 from exceptions import (
     FichierConfigurationException,
     IterationsInvalidesException,
-    RouteInexistanteException
+    VehiculesInvalidesException
 )
 import json
 import csv
@@ -18,23 +23,117 @@ class Simulateur:
     véhicules.
     """
 
-    def __init__(self, fichier_config):
+    MOTEURS = ("python", "vectoriel", "reseau")
+    HISTORIQUES = ("liste", "colonnaire", "memmap")
+
+    def __init__(self, fichier_config, moteur="python", workers=1, memoire_partagee=False,
+                 affichage=None, historique="liste", fichier_historique="data/historique.bin",
+                 puits=None, trajectoires=False, analyseur=None, analyse_tous_les=1,
+                 analyse_intervalle=None, pipeline=None):
         """Initialise le simulateur à partir d'un fichier de configuration.
 
         Args:
             fichier_config (str): chemin vers un fichier JSON contenant
-                les routes et véhicules à instancier.
+                les routes et véhicules à instancier, et optionnellement les
+                connexions entre routes ("connexions": [{"de": ..., "vers": ...}]).
+            moteur (str): moteur de mise à jour des véhicules: "python"
+                (boucle sur `Vehicule.avancer`), "vectoriel" (un
+                `MoteurVectoriel` NumPy par route) ou "reseau" (une seule
+                table NumPy pour tout le réseau, un seul noyau par pas).
+            workers (int): nombre de processus. Au-delà de 1, les routes sont
+                réparties entre processus (voir `core.parallele`) et le
+                coordinateur utilise la table globale du moteur "reseau".
+            memoire_partagee (bool): avec `workers` > 1, loger positions et
+                vitesses en mémoire partagée: les processus les mettent à jour
+                sur place et le coordinateur les lit sans copie.
+            affichage (Affichage, optional): composant d'affichage à utiliser,
+                par exemple `Affichage(silencieux=True)` (headless) ou
+                `Affichage(tous_les=100)` (affichage limité).
+            historique (str): format de `self.historique`: "liste" (un dict
+                de positions par tour), "colonnaire" (matrice préallouée
+                tours × véhicules, voir `core.historique`) ou "memmap" (même
+                matrice, écrite dans `fichier_historique`).
+            fichier_historique (str): fichier binaire de l'historique "memmap".
+            puits (list, optional): consommateurs des cadres de simulation
+                (par exemple `io_pkg.FluxPositionsCSV`), appelés à chaque tour
+                via `ecrire(cadre)` avec les positions jointes au cadre.
+            trajectoires (bool): joindre aussi la route et la vitesse de chaque
+                véhicule aux snapshots de l'historique "liste" (clés "routes"
+                et "vitesses"), pour `tracer_positions(format="long")`.
+            analyseur (Analyseur, optional): analyseur à utiliser, par exemple
+                `Analyseur(incremental=True, inclure_vitesses=False)` pour des
+                statistiques résumées sans liste des vitesses.
+            analyse_tous_les (int | None): cadence de l'analyse complète, en
+                tours (None: uniquement au dernier tour). Les autres tours ne
+                calculent que des compteurs bon marché ({"nb_vehicules"}, plus
+                "moyenne_vitesse" avec `workers` > 1).
+            analyse_intervalle (float, optional): cadence de l'analyse en
+                secondes simulées (exclusive de `analyse_tous_les` != 1).
+                Le dernier tour est toujours analysé.
+            pipeline (PipelineAnalyse, optional): pipeline recevant un
+                instantané figé du réseau à chaque tour d'analyse (voir
+                `core.pipeline`): les analyseurs tournent alors dans un fil
+                de travail; à chaque tour d'analyse, leurs derniers résultats
+                terminés sont affichés. Le dernier tour reste analysé ici, une
+                fois le pipeline vidé.
                 
         Raises:
             FichierConfigurationException: Si le fichier est manquant ou invalide.
-            RouteInexistanteException: Si un véhicule référence une route inexistante.
+            VehiculesInvalidesException: Si des véhicules sont invalides (route
+                inexistante, identifiant en double, vitesse ou position hors
+                limites, capacité dépassée), toutes les lignes étant rapportées.
+            ValueError: Si le moteur ou le format d'historique est inconnu, si
+                `trajectoires` est demandé avec un historique autre que
+                "liste", si `memoire_partagee` est demandée sans `workers` > 1,
+                ou si des connexions sont demandées avec `workers` > 1.
+            ImportError: Si le moteur demandé nécessite NumPy et qu'il est absent.
         """
+        if moteur not in self.MOTEURS:
+            raise ValueError(f"Moteur inconnu: {moteur!r} (attendu: {', '.join(self.MOTEURS)})")
+        if historique not in self.HISTORIQUES:
+            raise ValueError(f"Historique inconnu: {historique!r} "
+                             f"(attendu: {', '.join(self.HISTORIQUES)})")
+        if trajectoires and historique != "liste":
+            raise ValueError(f"trajectoires nécessite l'historique \"liste\" "
+                             f"(reçu: {historique!r})")
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError(f"workers doit être un entier >= 1, reçu: {workers}")
+        if memoire_partagee and workers == 1:
+            raise ValueError("memoire_partagee nécessite plusieurs processus (workers > 1)")
+        if analyse_tous_les is not None and (not isinstance(analyse_tous_les, int)
+                                             or analyse_tous_les < 1):
+            raise ValueError(f"analyse_tous_les doit être un entier >= 1 ou None, "
+                             f"reçu: {analyse_tous_les}")
+        if analyse_intervalle is not None and (analyse_intervalle <= 0 or analyse_tous_les != 1):
+            raise ValueError("analyse_intervalle doit être > 0 et ne se combine pas "
+                             "avec analyse_tous_les")
+        if (moteur != "python" or workers > 1) and not numpy_disponible():
+            raise ImportError(f"Le moteur {moteur!r} nécessite NumPy (pip install numpy)")
+        if historique != "liste" and not numpy_disponible():
+            raise ImportError(f"L'historique {historique!r} nécessite NumPy (pip install numpy)")
+        self.moteur = moteur
+        self.workers = workers
+        self.memoire_partagee = memoire_partagee
         self.reseau = ReseauRoutier()
         self.temps = 0
-        self.analyseur = Analyseur()
-        self.affichage = Affichage()
+        self.analyseur = analyseur if analyseur is not None else Analyseur()
+        self.analyse_tous_les = analyse_tous_les
+        self.analyse_intervalle = analyse_intervalle
+        self._temps_derniere_analyse = None
+        self.pipeline = pipeline
+        self._tours_affiches = {}
+        self.affichage = affichage if affichage is not None else Affichage()
         self.exporteur = Export()
-        self.historique = []
+        self.puits = list(puits) if puits is not None else []
+        self.trajectoires = trajectoires
+        # statistiques scalaires de chaque tour enregistré (voir Export.exporter_binaire)
+        self.stats_tours = []
+        if historique == "liste":
+            self.historique = []
+        elif historique == "colonnaire":
+            self.historique = HistoriqueColonnaire()
+        else:
+            self.historique = HistoriqueMemmap(fichier_historique)
 
         # Charger configuration avec gestion des erreurs
         try:
@@ -67,7 +166,9 @@ class Simulateur:
                 )
             
             for r in config["routes"]:
-                route = Route(r["nom"], r["longueur"], r["limite_vitesse"])
+                route = Route(r["nom"], r["longueur"], r["limite_vitesse"],
+                              capacite_max=r.get("capacite_max", 100),
+                              vectoriel=(moteur == "vectoriel"))
                 self.reseau.ajouter_route(route)
                 
         except KeyError as e:
@@ -81,6 +182,19 @@ class Simulateur:
                 f"Erreur lors de la création des routes: {str(e)}"
             ) from e
 
+        # Connexions entre routes (optionnelles): {"de": origine, "vers": destination}
+        try:
+            for c in config.get("connexions", []):
+                self.reseau.connecter(c["de"], c["vers"])
+        except Exception as e:
+            raise FichierConfigurationException(
+                fichier_config,
+                f"Erreur lors de la création des connexions: {str(e)}"
+            ) from e
+        if workers > 1 and config.get("connexions"):
+            raise ValueError("Les connexions entre routes ne sont pas prises en charge "
+                             "avec plusieurs processus (workers > 1)")
+
         # Charger les véhicules
         try:
             if "vehicules" not in config:
@@ -89,20 +203,20 @@ class Simulateur:
                     "La clé 'vehicules' est manquante dans la configuration"
                 )
             
+            lignes = []
             for v in config["vehicules"]:
                 try:
-                    route = self.reseau.get_route(v["route"])
-                    vehicule = Vehicule(v["id"], route, v["position"], v["vitesse"])
-                    route.ajouter_vehicule(vehicule)
-                except RouteInexistanteException:
-                    raise
+                    lignes.append((v["id"], v["route"], v["position"], v["vitesse"]))
                 except KeyError as e:
                     raise FichierConfigurationException(
                         fichier_config,
                         f"Clé manquante dans la définition du véhicule {v.get('id', '?')}: {str(e)}"
                     ) from e
-                    
-        except RouteInexistanteException:
+            # un seul chargement en colonnes, validé en une passe
+            ids, routes, positions, vitesses = zip(*lignes) if lignes else ((), (), (), ())
+            self.reseau.charger_vehicules(ids, routes, positions, vitesses)
+
+        except VehiculesInvalidesException:
             raise
         except FichierConfigurationException:
             raise
@@ -112,20 +226,36 @@ class Simulateur:
                 f"Erreur lors de la création des véhicules: {str(e)}"
             ) from e
 
-    def lancer_simulation(self, n_tours, delta_t):
-        """Exécute la simulation pendant `n_tours` incréments de `delta_t`.
+        if moteur == "reseau":
+            self.reseau.compiler_moteur()
 
-        À chaque tour:
-        - avance le temps
-        - met à jour les véhicules sur chaque route
-        - calcule des statistiques via l'analyseur
-        - affiche l'état
-        - enregistre un snapshot des positions dans l'historique
+    def iter_simulation(self, n_tours, delta_t, positions=False, historique=False,
+                        inclure_vitesses=False):
+        """Exécute la simulation pas à pas en produisant un cadre compact par tour.
+
+        Rien n'est conservé par défaut: le consommateur peut écrire chaque
+        cadre sur disque ou sur le réseau avec une mémoire constante.
+
+        Chaque cadre est un dictionnaire:
+            {"tour": int, "temps": float, "stats": dict, "positions": dict | None}
+        où "positions" ({vehicule_id: position}) n'est rempli que si
+        `positions` est vrai. La liste des vitesses de chaque véhicule que
+        produit l'analyseur (clé 'vitesses') est retirée de "stats", sauf
+        avec `inclure_vitesses`: la taille d'un cadre ne dépend alors plus du
+        nombre de véhicules que si on le demande.
+
+        Les paramètres sont validés immédiatement (avant la première itération).
 
         Args:
             n_tours (int): nombre de pas de simulation à exécuter.
             delta_t (float): durée (en secondes) d'un pas de simulation.
-            
+            positions (bool): joindre les positions des véhicules à chaque cadre.
+            historique (bool): enregistrer aussi chaque snapshot dans `self.historique`.
+            inclure_vitesses (bool): garder la clé 'vitesses' dans "stats".
+
+        Returns:
+            generator: itérateur sur les cadres de la simulation.
+
         Raises:
             IterationsInvalidesException: Si n_tours est invalide (<= 0).
             ValueError: Si delta_t est invalide (<= 0).
@@ -136,37 +266,94 @@ class Simulateur:
         
         if not isinstance(delta_t, (int, float)) or delta_t <= 0:
             raise ValueError(f"delta_t doit être un nombre strictement positif, reçu: {delta_t}")
-        
+
+        return self._iterer(n_tours, delta_t, positions, historique, inclure_vitesses)
+
+    def _iterer(self, n_tours, delta_t, positions, historique, inclure_vitesses):
+        """Générateur interne de `iter_simulation` (paramètres déjà validés)."""
+        executeur = None
         try:
+            if self.workers > 1:
+                executeur = ExecuteurParallele(self.reseau, self.workers,
+                                               memoire_partagee=self.memoire_partagee)
+                executeur.demarrer()
+
             for tour in range(n_tours):
                 self.temps += delta_t
-                
-                # Mise à jour des véhicules sur chaque route
-                for route in self.reseau.routes.values():
-                    try:
-                        route.mettre_a_jour_vehicules(delta_t)
-                    except Exception as e:
-                        print(f"⚠️  Avertissement au tour {tour + 1}: Erreur sur la route {route.nom}: {e}")
-                        # On continue la simulation malgré l'erreur sur une route
-
-                # Analyse et affichage
-                try:
-                    stats = self.analyseur.analyser(self.reseau)
-                    self.affichage.afficher_etat(self.temps, self.reseau, stats)
-                except Exception as e:
-                    print(f"⚠️  Avertissement: Erreur lors de l'analyse au temps {self.temps}s: {e}")
-                    stats = {"nb_vehicules": 0, "vitesses": [], "moyenne_vitesse": 0}
+                self._avancer_reseau(delta_t, tour, executeur)
+                dernier = tour == n_tours - 1
+                if executeur is not None and (positions or historique or self.puits
+                                              or self._doit_analyser(tour, dernier)):
+                    # l'état des processus n'est recopié que pour être lu
+                    executeur.synchroniser()
+                stats = self._stats_du_tour(tour, dernier, executeur)
+
+                snapshot = self._instantane() if positions or self.puits else None
+                if historique:
+                    self._enregistrer_instantane(snapshot)
+                    self._enregistrer_stats(stats)
+
+                if not inclure_vitesses and "vitesses" in stats:
+                    stats = {nom: valeur for nom, valeur in stats.items() if nom != "vitesses"}
+                cadre = {
+                    "tour": tour + 1,
+                    "temps": self.temps,
+                    "stats": stats,
+                    "positions": snapshot["positions"] if snapshot is not None else None,
+                }
+                for puits in self.puits:
+                    puits.ecrire(cadre)
+                if not positions:
+                    cadre = dict(cadre, positions=None)
+                yield cadre
+        finally:
+            # aussi exécuté si le consommateur abandonne le générateur
+            if executeur is not None:
+                executeur.fermer()
+            if isinstance(self.historique, HistoriqueMemmap):
+                # en-tête et identifiants à jour: le fichier est relisible tel quel
+                self.historique.flush()
+            for puits in self.puits:
+                # sortie partielle durable, même sur KeyboardInterrupt
+                puits.vider()
+            if self.pipeline is not None:
+                self.pipeline.attendre()
+
+    def lancer_simulation(self, n_tours, delta_t, historique=True):
+        """Exécute la simulation pendant `n_tours` incréments de `delta_t`.
+
+        À chaque tour:
+        - avance le temps
+        - met à jour les véhicules sur chaque route
+        - calcule des statistiques via l'analyseur
+        - affiche l'état
+        - enregistre un snapshot des positions dans l'historique
 
-                # Enregistrement de l'historique
-                snapshot = {"temps": self.temps, "positions": {}}
-                for route in self.reseau.routes.values():
-                    for v in route.vehicules:
-                        snapshot["positions"][v.id] = v.position
-                self.historique.append(snapshot)
+        Simple enveloppe autour de `iter_simulation` avec historique activé,
+        suivie de l'export des statistiques finales.
+
+        Args:
+            n_tours (int): nombre de pas de simulation à exécuter.
+            delta_t (float): durée (en secondes) d'un pas de simulation.
+            historique (bool): enregistrer les snapshots dans `self.historique`.
+                À désactiver lorsque les positions partent dans un puits
+                (`puits`) pour ne rien garder en mémoire.
+            
+        Raises:
+            IterationsInvalidesException: Si n_tours est invalide (<= 0).
+            ValueError: Si delta_t est invalide (<= 0).
+        """
+        try:
+            stats = None
+            # statistiques finales exportées complètes (avec la liste des vitesses)
+            for cadre in self.iter_simulation(n_tours, delta_t, historique=historique,
+                                              inclure_vitesses=True):
+                stats = cadre["stats"]
 
             # Export des résultats finaux
             try:
-                self.exporteur.exporter_resultats(stats, "data/resultats.json")
+                self.exporteur.exporter_resultats(self._resultats_finaux(stats),
+                                                  "data/resultats.json")
             except Exception as e:
                 print(f"⚠️  Avertissement: Impossible d'exporter les résultats: {e}")
                 
@@ -179,35 +366,361 @@ class Simulateur:
         except Exception as e:
             print(f"❌ Erreur critique lors de la simulation: {e}")
             raise
+
+    def _avancer_reseau(self, delta_t, tour, executeur=None):
+        """Met à jour les véhicules du réseau pour un pas `delta_t`.
+
+        Les erreurs sont signalées mais n'interrompent pas la simulation.
+        """
+        if executeur is not None:
+            # chaque processus avance sa tranche de routes
+            try:
+                executeur.avancer(delta_t)
+            except Exception as e:
+                print(f"⚠️  Avertissement au tour {tour + 1}: Erreur sur le réseau: {e}")
+        elif self.reseau.moteur is not None:
+            # un seul noyau vectorisé pour tout le réseau
+            try:
+                self.reseau.mettre_a_jour(delta_t)
+            except Exception as e:
+                print(f"⚠️  Avertissement au tour {tour + 1}: Erreur sur le réseau: {e}")
+        else:
             for route in self.reseau.routes.values():
-                route.mettre_a_jour_vehicules(delta_t)
+                try:
+                    route.mettre_a_jour_vehicules(delta_t)
+                except Exception as e:
+                    print(f"⚠️  Avertissement au tour {tour + 1}: Erreur sur la route {route.nom}: {e}")
+                    # On continue la simulation malgré l'erreur sur une route
+            # passage des véhicules arrivés au bout d'une route sur la suivante
+            try:
+                self.reseau.transferer()
+            except Exception as e:
+                print(f"⚠️  Avertissement au tour {tour + 1}: "
+                      f"Erreur de transfert entre routes: {e}")
+
+    def _analyser_et_afficher(self):
+        """Calcule les statistiques courantes et affiche l'état.
 
+        Returns:
+            dict: statistiques de l'analyseur (valeurs nulles en cas d'erreur).
+        """
+        try:
             stats = self.analyseur.analyser(self.reseau)
             self.affichage.afficher_etat(self.temps, self.reseau, stats)
+        except Exception as e:
+            print(f"⚠️  Avertissement: Erreur lors de l'analyse au temps {self.temps}s: {e}")
+            stats = {"nb_vehicules": 0, "vitesses": [], "moyenne_vitesse": 0}
+        return stats
 
-            snapshot = {"temps": self.temps, "positions": {}}
-            for route in self.reseau.routes.values():
-                for v in route.vehicules:
-                    snapshot["positions"][v.id] = v.position
-            self.historique.append(snapshot)
+    def _doit_analyser(self, tour, dernier):
+        """Indique si le tour `tour` (numéroté depuis 0) donne lieu à l'analyse complète."""
+        if dernier:
+            return True
+        if self.analyse_intervalle is not None:
+            return (self._temps_derniere_analyse is None or
+                    self.temps - self._temps_derniere_analyse >= self.analyse_intervalle - 1e-9)
+        if self.analyse_tous_les is None:
+            return False
+        return (tour + 1) % self.analyse_tous_les == 0
+
+    def _compteurs(self, executeur=None):
+        """Compteurs bon marché, calculés à chaque tour.
+
+        Avec plusieurs processus, ils sont tirés des statistiques compactes
+        des tranches (avec la vitesse moyenne), sans recopier leur état.
+        """
+        if executeur is not None:
+            return executeur.statistiques()
+        moteur = self.reseau.moteur
+        if moteur is not None:
+            return {"nb_vehicules": moteur.n}
+        return {"nb_vehicules": sum(len(r.vehicules) for r in self.reseau.routes.values())}
+
+    def _stats_du_tour(self, tour, dernier, executeur=None):
+        """Analyse complète (et affichage) selon la cadence, compteurs sinon."""
+        if not self._doit_analyser(tour, dernier):
+            return self._compteurs(executeur)
+        self._temps_derniere_analyse = self.temps
+        if self.pipeline is not None:
+            if not dernier:
+                self.pipeline.soumettre(self.reseau, tour + 1, self.temps)
+                self._afficher_pipeline()
+                return self._compteurs(executeur)
+            # les analyses en cours peuvent partager l'analyseur (statistiques cumulées)
+            self.pipeline.attendre()
+        return self._analyser_et_afficher()
+
+    def _afficher_pipeline(self):
+        """Affiche les résultats du pipeline terminés depuis le dernier affichage."""
+        nouveaux = {nom: entree for nom, entree in list(self.pipeline.derniers.items())
+                    if entree[0] > self._tours_affiches.get(nom, 0)}
+        for nom, entree in nouveaux.items():
+            self._tours_affiches[nom] = entree[0]
+        self.affichage.afficher_analyses(self.temps, nouveaux)
+
+    def _resultats_finaux(self, stats):
+        """Statistiques exportées en fin de simulation.
+
+        Y ajoute les histogrammes de vitesses cumulés par l'analyseur (et
+        leurs quantiles par route) lorsqu'il en tient.
+        """
+        histogrammes = getattr(self.analyseur, "histogrammes", None)
+        if histogrammes is None or stats is None:
+            return stats
+        return dict(stats, histogrammes=histogrammes.vers_dict(),
+                    quantiles_routes=histogrammes.quantiles_routes())
+
+    def _instantane(self):
+        """Retourne un snapshot {"temps", "positions"} de l'état courant.
 
-        self.exporteur.exporter_resultats(stats, "data/resultats.json")
+        Avec `trajectoires`, le snapshot porte aussi "routes" et "vitesses".
+        """
+        snapshot = {"temps": self.temps, "positions": {}}
+        for route in self.reseau.routes.values():
+            for v in route.vehicules:
+                snapshot["positions"][v.id] = v.position
+        if self.trajectoires:
+            snapshot["routes"] = {v.id: route.nom for route in self.reseau.routes.values()
+                                  for v in route.vehicules}
+            snapshot["vitesses"] = {v.id: v.vitesse for route in self.reseau.routes.values()
+                                    for v in route.vehicules}
+        return snapshot
+
+    def _enregistrer_stats(self, stats):
+        """Conserve les statistiques scalaires du tour (sans la liste des vitesses)."""
+        ligne = {"temps": self.temps}
+        ligne.update((nom, valeur) for nom, valeur in stats.items()
+                     if isinstance(valeur, (int, float)))
+        self.stats_tours.append(ligne)
+
+    def _enregistrer_instantane(self, snapshot=None):
+        """Ajoute à l'historique un snapshot des positions au temps courant.
+
+        Args:
+            snapshot (dict, optional): snapshot déjà calculé pour ce tour.
+        """
+        if isinstance(self.historique, list):
+            self.historique.append(snapshot if snapshot is not None else self._instantane())
+        elif snapshot is not None:
+            self.historique.enregistrer_positions(snapshot["temps"], snapshot["positions"])
+        else:
+            # l'historique colonnaire lit directement le réseau (ou la table du moteur)
+            self.historique.enregistrer(self.temps, self.reseau)
+
+    def lancer_simulation_adaptative(self, duree, pas_min, pas_max):
+        """Simule `duree` secondes avec un pas de temps adaptatif.
+
+        À chaque pas, le plus grand `delta_t` sûr (borné par `pas_max`) est
+        choisi de sorte qu'aucun véhicule ne dépasse une ligne de feu ni le
+        véhicule qui le précède, et qu'aucun feu ne change d'état en cours de
+        pas. Le pas rétrécit donc à l'approche des événements, sans jamais
+        descendre sous `pas_min`.
+
+        Args:
+            duree (float): durée simulée totale (s).
+            pas_min (float): pas minimal (s).
+            pas_max (float): pas maximal (s).
+
+        Returns:
+            int: nombre de pas effectivement exécutés.
+
+        Raises:
+            ValueError: Si les bornes ou la durée sont invalides.
+        """
+        if not isinstance(duree, (int, float)) or duree <= 0:
+            raise ValueError(f"duree doit être un nombre strictement positif, reçu: {duree}")
+        if not (0 < pas_min <= pas_max):
+            raise ValueError(f"Bornes de pas invalides: pas_min={pas_min}, pas_max={pas_max}")
+
+        nb_pas = 0
+        ecoule = 0.0
+        stats = None
+        try:
+            # tolérance relative pour ne pas finir par un pas infinitésimal
+            while duree - ecoule > 1e-9 * duree:
+                delta_t = min(self._pas_adaptatif(pas_min, pas_max), duree - ecoule)
+                self.temps += delta_t
+                ecoule += delta_t
+                self._avancer_reseau(delta_t, nb_pas)
+                stats = self._stats_du_tour(nb_pas, duree - ecoule <= 1e-9 * duree)
+                self._enregistrer_instantane()
+                self._enregistrer_stats(stats)
+                nb_pas += 1
+
+            try:
+                self.exporteur.exporter_resultats(self._resultats_finaux(stats),
+                                                  "data/resultats.json")
+            except Exception as e:
+                print(f"⚠️  Avertissement: Impossible d'exporter les résultats: {e}")
+        except KeyboardInterrupt:
+            print("\n⚠️  Simulation interrompue par l'utilisateur")
+            raise
+
+        return nb_pas
+
+    def _pas_adaptatif(self, pas_min, pas_max):
+        """Retourne le plus grand pas sûr dans [pas_min, pas_max].
+
+        Contraintes prises en compte:
+        - temps restant avant le prochain changement d'état de chaque feu,
+        - temps pour qu'un véhicule atteigne la ligne du feu de sa route,
+        - temps pour qu'un véhicule rattrape celui qui le précède.
+        """
+        eps = 1e-12
+        pas = pas_max
+        for route in self.reseau.routes.values():
+            feu = route.feu_rouge
+            if feu is not None:
+                reste = feu.temps_avant_changement()
+                if reste > eps:
+                    pas = min(pas, reste)
+
+            vehicules = sorted(route.vehicules, key=lambda v: v.position)
+            position_feu = route.position_feu if feu is not None else None
+            for i, v in enumerate(vehicules):
+                if v.vitesse <= 0:
+                    continue
+                if position_feu is not None and v.position < position_feu:
+                    pas = min(pas, (position_feu - v.position) / v.vitesse)
+                if i + 1 < len(vehicules):
+                    devant = vehicules[i + 1]
+                    ecart = devant.position - v.position
+                    if ecart > eps and v.vitesse > devant.vitesse:
+                        pas = min(pas, ecart / (v.vitesse - devant.vitesse))
+        return max(pas_min, pas)
+
+    def lancer_simulation_evenements(self, n_tours, delta_t, instantanes=False):
+        """Avance rapide de `n_tours` pas de `delta_t` en ne traitant que les événements.
+
+        Les tours sans événement (changement de feu, arrivée à une ligne
+        d'arrêt ou au bout d'une route) sont sautés: l'état final est calculé
+        analytiquement (voir `core.evenements`). L'analyse, l'affichage et
+        l'export ne sont faits qu'une fois, à la fin.
+
+        Args:
+            n_tours (int): nombre de pas de simulation couverts.
+            delta_t (float): durée (en secondes) d'un pas de simulation.
+            instantanes (bool): si vrai, remplit aussi `historique` avec un
+                snapshot analytique par tour (coût proportionnel aux tours).
+
+        Returns:
+            int: nombre d'événements effectivement traités.
+
+        Raises:
+            IterationsInvalidesException: Si n_tours est invalide (<= 0).
+            ValueError: Si delta_t est invalide (<= 0) ou si des routes sont
+                connectées (les passages entre routes ne sont pas planifiés).
+        """
+        if not isinstance(n_tours, int) or n_tours <= 0:
+            raise IterationsInvalidesException(n_tours)
+
+        if not isinstance(delta_t, (int, float)) or delta_t <= 0:
+            raise ValueError(f"delta_t doit être un nombre strictement positif, reçu: {delta_t}")
+
+        if any(route.successeurs for route in self.reseau.routes.values()):
+            raise ValueError("L'avance rapide à événements ne gère pas les connexions "
+                             "entre routes")
+
+        planificateur = PlanificateurEvenements(self.reseau, delta_t)
+        rappel = None
+        if instantanes:
+            temps_initial = self.temps
+
+            def rappel(tour):
+                self._enregistrer_instantane({"temps": temps_initial + tour * delta_t,
+                                              "positions": planificateur.positions(tour)})
+
+        planificateur.avancer_jusqu_a(n_tours, rappel)
+        planificateur.synchroniser()
+        self.temps += n_tours * delta_t
+
+        try:
+            stats = self.analyseur.analyser(self.reseau)
+            self.affichage.afficher_etat(self.temps, self.reseau, stats)
+        except Exception as e:
+            print(f"⚠️  Avertissement: Erreur lors de l'analyse au temps {self.temps}s: {e}")
+            stats = {"nb_vehicules": 0, "vitesses": [], "moyenne_vitesse": 0}
+
+        try:
+            self.exporteur.exporter_resultats(self._resultats_finaux(stats),
+                                              "data/resultats.json")
+        except Exception as e:
+            print(f"⚠️  Avertissement: Impossible d'exporter les résultats: {e}")
 
-    def tracer_positions(self):
+        return planificateur.nb_evenements
+
+    def tracer_positions(self, format="large", compression=None, chemin=None):
         """Exporte les positions des véhicules au format CSV.
 
-        Le fichier produit contient une colonne 'temps' suivie d'une colonne par
-        véhicule (identifiée par son id). Ce jeu de données peut ensuite être
-        visualisé avec l'outil de votre choix.
+        Au format "large", le fichier produit contient une colonne 'temps'
+        suivie d'une colonne par véhicule (identifiée par son id). Au format
+        "long", il contient une ligne (temps, id, route, position, vitesse)
+        par véhicule présent à chaque tour: sa taille suit l'activité réelle
+        plutôt que le nombre de véhicules jamais vus. Route et vitesse
+        proviennent des snapshots enregistrés avec `trajectoires=True`; à
+        défaut, la route est la route actuelle du véhicule et la vitesse est
+        laissée vide (ce qui n'est possible que sans connexions entre
+        routes, un véhicule ne changeant alors jamais de route). Ce jeu de
+        données peut ensuite être visualisé avec l'outil de votre choix.
+
+        Args:
+            format (str): "large" ou "long".
+            compression (str, optional): None, "gzip" ou "lzma".
+            chemin (str, optional): fichier de sortie (par défaut
+                `data/positions.csv`, suffixé `.gz` ou `.xz` si compressé).
+
+        Raises:
+            ValueError: Si le format ou la compression est inconnu, ou si le
+                format "long" est demandé pour un réseau à connexions sans
+                snapshots `trajectoires` (la route de chaque tour est inconnue).
         """
+        if format not in ("large", "long"):
+            raise ValueError(f"Format inconnu: {format!r} (attendu: large, long)")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Compression inconnue: {compression!r} (attendu: None, gzip, lzma)")
+        if format == "long" and not self.trajectoires and any(
+                route.successeurs for route in self.reseau.routes.values()):
+            raise ValueError("Le format long d'un réseau à connexions nécessite les routes "
+                             "de chaque tour: utiliser trajectoires=True (historique \"liste\")")
+
         # Export position time-series to CSV using the standard library so plotting
         # is optional and doesn't require matplotlib.
         if not self.historique:
             print("Aucun historique disponible pour tracer les positions.")
             return
 
+        out_path = chemin or "data/positions.csv" + EXTENSIONS[compression]
+        with ouvrir_sortie_texte(out_path, compression) as csvfile:
+            writer = csv.writer(csvfile)
+            if format == "long":
+                self._ecrire_positions_long(writer)
+            elif isinstance(self.historique, HistoriqueColonnaire):
+                self._ecrire_positions_colonnaire(writer)
+            else:
+                self._ecrire_positions_large(writer)
+
+        print(f"Positions exportées vers {out_path} (CSV). "
+              "Use your preferred plotting tool to visualize it.")
+
+    def _blocs_historique(self):
+        """Parcourt l'historique colonnaire par blocs: (temps, lignes de positions)."""
+        historique = self.historique
+        for debut in range(0, len(historique), historique.taille_bloc):
+            fin = debut + historique.taille_bloc
+            yield historique.temps[debut:fin].tolist(), historique.matrice[debut:fin].tolist()
+
+    def _ecrire_positions_colonnaire(self, writer):
+        """Format large depuis la matrice: les colonnes sont déjà les véhicules."""
+        # lecture par blocs de lignes: un historique sur disque n'est jamais chargé en entier
+        writer.writerow(["temps"] + list(self.historique.ids))
+        for temps, lignes in self._blocs_historique():
+            for t, ligne in zip(temps, lignes):
+                # NaN (p != p) = véhicule absent à ce tour
+                writer.writerow([t] + ["" if p != p else p for p in ligne])
+
+    def _ecrire_positions_large(self, writer):
+        """Format large depuis la liste de snapshots."""
         # Collect all vehicle ids and sorted time steps
-        temps = [s["temps"] for s in self.historique]
         vehicules_ids = []
         seen = set()
         for s in self.historique:
@@ -216,15 +729,32 @@ class Simulateur:
                     seen.add(vid)
                     vehicules_ids.append(vid)
 
-        out_path = "data/positions.csv"
-        with open(out_path, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile)
-            # Header: time + vehicle ids
-            writer.writerow(["temps"] + list(vehicules_ids))
-            for s in self.historique:
-                row = [s["temps"]]
-                for vid in vehicules_ids:
-                    row.append(s["positions"].get(vid, ""))
-                writer.writerow(row)
-
-        print(f"Positions exportées vers {out_path} (CSV). Use your preferred plotting tool to visualize it.")
+        # Header: time + vehicle ids
+        writer.writerow(["temps"] + list(vehicules_ids))
+        for s in self.historique:
+            row = [s["temps"]]
+            for vid in vehicules_ids:
+                row.append(s["positions"].get(vid, ""))
+            writer.writerow(row)
+
+    def _ecrire_positions_long(self, writer):
+        """Format long: une ligne par véhicule présent et par tour."""
+        routes_actuelles = {v.id: route.nom for route in self.reseau.routes.values()
+                            for v in route.vehicules}
+        writer.writerow(["temps", "id", "route", "position", "vitesse"])
+
+        if isinstance(self.historique, HistoriqueColonnaire):
+            ids = self.historique.ids
+            routes = [routes_actuelles.get(vid, "") for vid in ids]
+            for temps, lignes in self._blocs_historique():
+                for t, ligne in zip(temps, lignes):
+                    writer.writerows((t, ids[j], routes[j], p, "")
+                                     for j, p in enumerate(ligne) if p == p)
+            return
+
+        for s in self.historique:
+            t = s["temps"]
+            routes = s.get("routes", routes_actuelles)
+            vitesses = s.get("vitesses", {})
+            writer.writerows((t, vid, routes.get(vid, ""), p, vitesses.get(vid, ""))
+                             for vid, p in s["positions"].items())
@@ -0,0 +1,264 @@
+"""Statistiques incrémentales (effectif, moyenne, variance, min, max).
+
+La variance est tenue par l'algorithme de Welford: une valeur à la fois avec
+`ajouter`, ou un lot entier (tableau NumPy) avec `ajouter_lot`, dont les
+moments sont calculés en une réduction vectorisée puis combinés à l'état
+courant (formule de Chan et al.). La même combinaison sert à `fusionner` les
+statistiques de deux sources (par exemple deux tranches parallèles).
+
+`HistogrammesVitesses` approche les quantiles de vitesse (p50, p90, p99)
+par route à l'aide d'histogrammes à classes fixes, eux aussi fusionnables.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+
+class StatistiquesWelford:
+    """Moments courants d'une série de valeurs, sans conserver les valeurs.
+
+    Attributs:
+        n (int): nombre de valeurs vues.
+        moyenne (float): moyenne des valeurs.
+        m2 (float): somme des carrés des écarts à la moyenne.
+        min (float): plus petite valeur (None si vide).
+        max (float): plus grande valeur (None si vide).
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.moyenne = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def ajouter(self, valeur):
+        """Ajoute une valeur (mise à jour de Welford)."""
+        valeur = float(valeur)
+        self.n += 1
+        ecart = valeur - self.moyenne
+        self.moyenne += ecart / self.n
+        self.m2 += ecart * (valeur - self.moyenne)
+        self.min = valeur if self.min is None else min(self.min, valeur)
+        self.max = valeur if self.max is None else max(self.max, valeur)
+
+    def ajouter_lot(self, valeurs):
+        """Ajoute un lot de valeurs en une seule réduction.
+
+        Args:
+            valeurs (numpy.ndarray | iterable): valeurs du lot.
+        """
+        if np is None or not isinstance(valeurs, np.ndarray):
+            for valeur in valeurs:
+                self.ajouter(valeur)
+            return
+        if valeurs.size == 0:
+            return
+        moyenne = float(valeurs.mean())
+        lot = StatistiquesWelford()
+        lot.n = int(valeurs.size)
+        lot.moyenne = moyenne
+        lot.m2 = float(np.square(valeurs - moyenne).sum())
+        lot.min = float(valeurs.min())
+        lot.max = float(valeurs.max())
+        self.fusionner(lot)
+
+    def fusionner(self, autre):
+        """Combine `autre` dans ces statistiques (résultat exact, ordre indifférent).
+
+        Args:
+            autre (StatistiquesWelford): statistiques à intégrer.
+
+        Returns:
+            StatistiquesWelford: self.
+        """
+        if autre.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.moyenne, self.m2 = autre.n, autre.moyenne, autre.m2
+            self.min, self.max = autre.min, autre.max
+            return self
+        n = self.n + autre.n
+        ecart = autre.moyenne - self.moyenne
+        self.moyenne += ecart * autre.n / n
+        self.m2 += autre.m2 + ecart * ecart * self.n * autre.n / n
+        self.n = n
+        self.min = min(self.min, autre.min)
+        self.max = max(self.max, autre.max)
+        return self
+
+    @property
+    def variance(self):
+        """Variance de population (0 si moins de deux valeurs)."""
+        return self.m2 / self.n if self.n > 1 else 0.0
+
+    @property
+    def ecart_type(self):
+        """Écart type de population."""
+        return math.sqrt(self.variance)
+
+    def resume(self):
+        """Retourne un dictionnaire {n, moyenne, variance, min, max}."""
+        return {"n": self.n, "moyenne": self.moyenne, "variance": self.variance,
+                "min": self.min, "max": self.max}
+
+
+def _quantiles_lignes(comptes, largeur, quantiles):
+    """Quantiles (interpolés dans leur classe) de chaque ligne d'histogrammes.
+
+    Args:
+        comptes (numpy.ndarray): effectifs, forme (lignes, classes).
+        largeur (float): largeur d'une classe.
+        quantiles (iterable): niveaux dans [0, 1].
+
+    Returns:
+        dict: niveau -> tableau des quantiles par ligne (NaN si ligne vide).
+    """
+    cumul = np.cumsum(comptes, axis=1)
+    totaux = cumul[:, -1]
+    lignes = np.arange(comptes.shape[0])
+    resultats = {}
+    for q in quantiles:
+        cible = q * totaux
+        # première classe dont l'effectif cumulé atteint la cible
+        classe = np.minimum((cumul < cible[:, None]).sum(axis=1), comptes.shape[1] - 1)
+        avant = np.where(classe > 0, cumul[lignes, classe - 1], 0)
+        dans = comptes[lignes, classe]
+        fraction = np.divide(cible - avant, dans, out=np.zeros(len(lignes)), where=dans > 0)
+        valeurs = (classe + np.clip(fraction, 0.0, 1.0)) * largeur
+        resultats[q] = np.where(totaux > 0, valeurs, np.nan)
+    return resultats
+
+
+def _nom_quantile(q):
+    return f"p{q * 100:g}"
+
+
+class HistogrammesVitesses:
+    """Histogrammes de vitesses à classes fixes, par route, fusionnables.
+
+    Chaque route a une ligne d'effectifs sur `nb_classes` classes de largeur
+    `vitesse_max / nb_classes`; les vitesses supérieures tombent dans la
+    dernière classe. L'ajout d'un tour entier est une seule accumulation
+    indexée sur (route, classe). Les quantiles (p50, p90, p99, ...) sont approchés à une
+    largeur de classe près, par route ou pour tout le réseau (somme des
+    lignes). Les effectifs étant entiers, la fusion de deux histogrammes (par
+    exemple de deux tranches parallèles) est exacte.
+
+    Attributs:
+        noms (list): noms des routes, dans l'ordre des lignes.
+        vitesse_max (float): borne supérieure des classes.
+        nb_classes (int): nombre de classes.
+        comptes (numpy.ndarray): effectifs, forme (routes, classes).
+    """
+
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, noms, vitesse_max=60.0, nb_classes=120):
+        """Crée des histogrammes vides pour les routes `noms`.
+
+        Args:
+            noms (iterable): noms des routes.
+            vitesse_max (float): borne supérieure des classes (m/s).
+            nb_classes (int): nombre de classes par route.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+            ValueError: Si `vitesse_max` <= 0 ou `nb_classes` < 1.
+        """
+        if np is None:
+            raise ImportError("Les histogrammes de vitesses nécessitent NumPy (pip install numpy)")
+        if vitesse_max <= 0 or not isinstance(nb_classes, int) or nb_classes < 1:
+            raise ValueError("vitesse_max doit être > 0 et nb_classes un entier >= 1")
+        self.noms = list(noms)
+        self.vitesse_max = float(vitesse_max)
+        self.nb_classes = nb_classes
+        self.comptes = np.zeros((len(self.noms), nb_classes), dtype=np.int64)
+        self._lignes = {nom: i for i, nom in enumerate(self.noms)}
+
+    @property
+    def largeur(self):
+        """Largeur d'une classe (m/s)."""
+        return self.vitesse_max / self.nb_classes
+
+    def __contains__(self, nom):
+        return nom in self._lignes
+
+    def ligne(self, nom):
+        """Indice de ligne de la route `nom`."""
+        return self._lignes[nom]
+
+    def ajouter(self, lignes, vitesses):
+        """Ajoute des vitesses observées sur les routes d'indices `lignes`.
+
+        Args:
+            lignes (array-like): indice de ligne (route) de chaque vitesse.
+            vitesses (array-like): vitesses observées.
+        """
+        vitesses = np.asarray(vitesses, dtype=np.float64)
+        if vitesses.size == 0:
+            return
+        classes = np.clip((vitesses / self.largeur).astype(np.int64), 0, self.nb_classes - 1)
+        cases = np.asarray(lignes, dtype=np.int64) * self.nb_classes + classes
+        if cases.size * 8 >= self.comptes.size:
+            self.comptes += np.bincount(cases, minlength=self.comptes.size).reshape(
+                self.comptes.shape)
+        else:
+            # peu de véhicules pour beaucoup de cases: éviter un tableau plein par tour
+            np.add.at(self.comptes.reshape(-1), cases, 1)
+
+    def fusionner(self, autre):
+        """Ajoute les effectifs de `autre` (routes absentes ajoutées).
+
+        Args:
+            autre (HistogrammesVitesses): histogrammes de mêmes classes.
+
+        Returns:
+            HistogrammesVitesses: self.
+
+        Raises:
+            ValueError: Si les classes diffèrent.
+        """
+        if (autre.vitesse_max, autre.nb_classes) != (self.vitesse_max, self.nb_classes):
+            raise ValueError("Impossible de fusionner des histogrammes de classes différentes")
+        nouveaux = [nom for nom in autre.noms if nom not in self._lignes]
+        if nouveaux:
+            for nom in nouveaux:
+                self._lignes[nom] = len(self.noms)
+                self.noms.append(nom)
+            self.comptes = np.vstack(
+                [self.comptes, np.zeros((len(nouveaux), self.nb_classes), dtype=np.int64)])
+        self.comptes[[self._lignes[nom] for nom in autre.noms]] += autre.comptes
+        return self
+
+    def quantiles_reseau(self, quantiles=QUANTILES):
+        """Quantiles de toutes les vitesses du réseau, ex. {"p50": ..., "p90": ...}."""
+        valeurs = _quantiles_lignes(self.comptes.sum(axis=0, keepdims=True),
+                                    self.largeur, quantiles)
+        return {_nom_quantile(q): (None if np.isnan(v[0]) else float(v[0]))
+                for q, v in valeurs.items()}
+
+    def quantiles_routes(self, quantiles=QUANTILES):
+        """Quantiles par route: {"noms": [...], "p50": [...], ...} (None si route vide)."""
+        valeurs = _quantiles_lignes(self.comptes, self.largeur, quantiles)
+        resultat = {"noms": list(self.noms)}
+        for q, v in valeurs.items():
+            resultat[_nom_quantile(q)] = [None if x != x else x for x in v.tolist()]
+        return resultat
+
+    def vers_dict(self):
+        """Forme sérialisable (JSON) des histogrammes."""
+        return {"noms": list(self.noms), "vitesse_max": self.vitesse_max,
+                "nb_classes": self.nb_classes, "comptes": self.comptes.tolist()}
+
+    @classmethod
+    def depuis_dict(cls, donnees):
+        """Reconstruit des histogrammes écrits par `vers_dict`."""
+        histogrammes = cls(donnees["noms"], donnees["vitesse_max"], donnees["nb_classes"])
+        if histogrammes.noms:
+            histogrammes.comptes[:] = np.asarray(donnees["comptes"], dtype=np.int64)
+        return histogrammes
@@ -9,14 +9,16 @@ from .base_exceptions import SimulateurException
 from .vehicule_exceptions import (
     VehiculeException,
     VitesseNegativeException,
-    PositionInvalideException
+    PositionInvalideException,
+    VehiculesInvalidesException
 )
 from .route_exceptions import (
     RouteException,
     RoutePleineException,
     VehiculeDejaPresent,
     RouteInexistanteException,
-    LongueurRouteInvalideException
+    LongueurRouteInvalideException,
+    VehiculeInexistantException
 )
 from .simulateur_exceptions import (
     ConfigurationException,
@@ -38,6 +40,7 @@ __all__ = [
     'VehiculeException',
     'VitesseNegativeException',
     'PositionInvalideException',
+    'VehiculesInvalidesException',
     
     # Route
     'RouteException',
@@ -45,6 +48,7 @@ __all__ = [
     'VehiculeDejaPresent',
     'RouteInexistanteException',
     'LongueurRouteInvalideException',
+    'VehiculeInexistantException',
     
     # Simulateur
     'ConfigurationException',
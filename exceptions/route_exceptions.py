@@ -128,3 +128,31 @@ class LongueurRouteInvalideException(RouteException):
             message = f"Longueur de route invalide: {longueur} m. Doit être > 0"
         
         super().__init__(message, code="RTE004")
+
+
+class VehiculeInexistantException(RouteException):
+    """
+    Exception levée lorsqu'un véhicule recherché par identifiant est introuvable.
+    
+    Attributes:
+        vehicule_id (str): Identifiant du véhicule.
+        route_id (str): Identifiant de la route (None pour le réseau entier).
+    """
+    
+    def __init__(self, vehicule_id: str, route_id: str = None):
+        """
+        Initialise l'exception pour un véhicule introuvable.
+        
+        Args:
+            vehicule_id (str): Identifiant du véhicule recherché.
+            route_id (str, optional): Identifiant de la route interrogée.
+        """
+        self.vehicule_id = vehicule_id
+        self.route_id = route_id
+        
+        if route_id:
+            message = f"Le véhicule '{vehicule_id}' n'est pas sur la route '{route_id}'"
+        else:
+            message = f"Le véhicule '{vehicule_id}' n'existe pas dans le réseau routier"
+        
+        super().__init__(message, code="RTE005")
@@ -79,3 +79,35 @@ class PositionInvalideException(VehiculeException):
             message = f"Position invalide: {position} m. La position doit être >= 0"
         
         super().__init__(message, code="VEH002")
+
+
+class VehiculesInvalidesException(VehiculeException):
+    """
+    Exception levée lorsqu'un chargement de véhicules par lot contient des lignes invalides.
+    
+    Toutes les lignes fautives sont rapportées ensemble; aucun véhicule du
+    lot n'est ajouté.
+    
+    Attributes:
+        erreurs (list): Tuples (ligne, vehicule_id, motifs) des lignes invalides,
+            où `motifs` est la liste des problèmes relevés sur la ligne.
+    """
+    
+    APERCU = 10
+    
+    def __init__(self, erreurs: list):
+        """
+        Initialise l'exception pour un lot de véhicules invalide.
+        
+        Args:
+            erreurs (list): Tuples (ligne, vehicule_id, motifs), par ligne croissante.
+        """
+        self.erreurs = erreurs
+        
+        details = "; ".join(f"ligne {ligne} ('{vehicule_id}'): {', '.join(motifs)}"
+                            for ligne, vehicule_id, motifs in erreurs[:self.APERCU])
+        if len(erreurs) > self.APERCU:
+            details += f"; ... ({len(erreurs) - self.APERCU} autres)"
+        message = f"{len(erreurs)} véhicule(s) invalide(s) dans le lot: {details}"
+        
+        super().__init__(message, code="VEH003")
@@ -1,4 +1,7 @@
 from .affichage import Affichage
 from .export import Export
+from .export_asynchrone import ExportAsynchrone
+from .export_sqlite import ExportSQLite
+from .flux import FluxPositionsCSV
 
-__all__ = ["Affichage", "Export"]
+__all__ = ["Affichage", "Export", "ExportAsynchrone", "ExportSQLite", "FluxPositionsCSV"]
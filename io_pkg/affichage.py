@@ -1,19 +1,89 @@
+import time
+
+
 class Affichage:
     """Composant d'affichage minimal pour la simulation.
 
     Fournit une méthode `afficher_etat` qui affiche sur la sortie standard
     une représentation textuelle de l'état du réseau et des statistiques.
+
+    L'affichage peut être désactivé (`silencieux`, mode headless) ou limité
+    à au plus un rendu tous les `tous_les` appels et/ou toutes les
+    `intervalle_ms` millisecondes. Lorsqu'un appel n'est pas rendu,
+    `ReseauRoutier.etat_reseau()` n'est pas calculé.
     """
 
+    def __init__(self, silencieux=False, tous_les=1, intervalle_ms=None):
+        """Configure la fréquence d'affichage.
+
+        Args:
+            silencieux (bool): ne jamais rien afficher (mode headless).
+            tous_les (int): afficher au plus un appel sur `tous_les`.
+            intervalle_ms (float, optional): délai minimal entre deux rendus.
+
+        Raises:
+            ValueError: Si `tous_les` < 1 ou `intervalle_ms` < 0.
+        """
+        if not isinstance(tous_les, int) or tous_les < 1:
+            raise ValueError(f"tous_les doit être un entier >= 1, reçu: {tous_les}")
+        if intervalle_ms is not None and intervalle_ms < 0:
+            raise ValueError(f"intervalle_ms doit être >= 0, reçu: {intervalle_ms}")
+        self.silencieux = silencieux
+        self.tous_les = tous_les
+        self.intervalle_ms = intervalle_ms
+        self.nb_rendus = 0
+        self._appels_depuis_rendu = None
+        self._dernier_rendu = None
+
+    def doit_afficher(self):
+        """Indique si l'appel courant doit être rendu (et le comptabilise).
+
+        Returns:
+            bool: vrai si l'état doit être affiché.
+        """
+        if self.silencieux:
+            return False
+
+        maintenant = time.monotonic()
+        if self._appels_depuis_rendu is not None:
+            self._appels_depuis_rendu += 1
+            if self._appels_depuis_rendu < self.tous_les:
+                return False
+            if (self.intervalle_ms is not None
+                    and (maintenant - self._dernier_rendu) * 1000.0 < self.intervalle_ms):
+                return False
+
+        self._appels_depuis_rendu = 0
+        self._dernier_rendu = maintenant
+        self.nb_rendus += 1
+        return True
+
     def afficher_etat(self, temps, reseau, stats):
-        """Affiche l'état courant de la simulation.
+        """Affiche l'état courant de la simulation (si la fréquence le permet).
 
         Args:
             temps (float): temps simulé (s).
             reseau (ReseauRoutier): instance contenant les routes et véhicules.
             stats (dict): statistiques calculées par l'analyseur.
         """
+        if not self.doit_afficher():
+            return
         print(f"\n--- Temps: {temps} s ---")
         for nom, etat in reseau.etat_reseau().items():
             print(f"Route {nom} : {etat}")
         print(f"Statistiques: {stats}")
+
+    def afficher_analyses(self, temps, resultats):
+        """Affiche des résultats d'analyse produits hors de la boucle (pipeline).
+
+        Args:
+            temps (float): temps simulé courant (s).
+            resultats (dict): nom -> (tour, temps, résultat) des analyses
+                terminées depuis le dernier affichage (en retard possible sur
+                `temps`).
+        """
+        if not resultats or not self.doit_afficher():
+            return
+        print(f"\n--- Temps: {temps} s ---")
+        for nom, (tour, temps_analyse, resultat) in resultats.items():
+            print(f"Analyse {nom} (tour {tour}, {temps_analyse} s): {resultat}")
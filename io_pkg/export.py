@@ -1,12 +1,31 @@
 import json
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    pa = pq = None
+
+
 class Export:
     """Export simple de résultats au format JSON.
 
     Méthode `exporter_resultats` écrit les statistiques fournies dans un
     fichier JSON indenté.
+
+    `exporter_binaire` écrit l'historique des positions et les statistiques
+    par tour en colonnes binaires (`.npz` NumPy, ou Parquet si `pyarrow` est
+    installé); `charger_binaire` les relit sans analyse de texte. Les
+    identifiants entiers restent des entiers.
     """
 
+    FORMATS_BINAIRES = ("npz", "parquet")
+
     def exporter_resultats(self, stats, fichier):
         """Écrit `stats` dans `fichier` au format JSON.
 
@@ -17,3 +36,147 @@ class Export:
         with open(fichier, "w") as f:
             json.dump(stats, f, indent=4)
         print(f"\nR\u00e9sultats export\u00e9s dans {fichier}")
+
+    @staticmethod
+    def _colonnes_stats(stats_tours):
+        """Convertit une liste de stats par tour en colonnes (valeurs scalaires seules)."""
+        if not stats_tours:
+            return {}
+        noms = list(dict.fromkeys(
+            nom for s in stats_tours for nom, valeur in s.items()
+            if nom != "temps" and isinstance(valeur, (int, float))
+            and not isinstance(valeur, bool)))
+        # NaN pour les tours sans analyse complète (voir Simulateur.analyse_tous_les)
+        return {nom: np.array([s.get(nom, np.nan) for s in stats_tours], dtype=np.float64)
+                for nom in noms}
+
+    @staticmethod
+    def _colonne_ids(ids):
+        """Colonne des identifiants: int64 s'ils sont tous entiers, texte sinon."""
+        if ids and all(isinstance(vid, (int, np.integer)) and not isinstance(vid, bool)
+                       for vid in ids):
+            return np.array(ids, dtype=np.int64)
+        return np.array([str(vid) for vid in ids], dtype=str)
+
+    @staticmethod
+    def fichier_tours(fichier):
+        """Fichier Parquet compagnon des colonnes par tour (temps, statistiques)."""
+        return fichier + ".tours.parquet"
+
+    def exporter_binaire(self, fichier, historique=None, stats_tours=None, format="npz"):
+        """Écrit l'historique et les statistiques par tour en colonnes binaires.
+
+        Au format npz, colonnes produites: "ids" (identifiants, int64 s'ils
+        sont tous entiers, texte sinon), "temps" et "positions" (matrice
+        tours × véhicules, NaN si absent) pour l'historique, puis
+        "stats.<nom>" pour chaque statistique scalaire par tour (les listes,
+        comme "vitesses", sont ignorées).
+
+        Au format Parquet, les positions sont rangées en format long, une
+        ligne par véhicule présent et par tour: "tour", "temps", "id" (même
+        type que ci-dessus), "position". Les colonnes par tour ("tour",
+        "temps", "stats.<nom>") sont écrites à côté, dans
+        `fichier_tours(fichier)`.
+
+        Args:
+            fichier (str): fichier de sortie.
+            historique (HistoriqueColonnaire | list, optional): historique à
+                écrire (une liste de snapshots est d'abord mise en colonnes).
+            stats_tours (list, optional): statistiques de chaque tour (dicts),
+                par exemple `Simulateur.stats_tours`.
+            format (str): "npz" ou "parquet".
+
+        Raises:
+            ValueError: Si le format est inconnu, ou si historique et
+                statistiques n'ont pas le même nombre de tours (Parquet).
+            ImportError: Si NumPy (ou pyarrow pour Parquet) n'est pas installé.
+        """
+        if format not in self.FORMATS_BINAIRES:
+            raise ValueError(f"Format inconnu: {format!r} "
+                             f"(attendu: {', '.join(self.FORMATS_BINAIRES)})")
+        if np is None:
+            raise ImportError("L'export binaire nécessite NumPy (pip install numpy)")
+        if format == "parquet" and pa is None:
+            raise ImportError("L'export Parquet nécessite pyarrow (pip install pyarrow)")
+
+        colonnes = {f"stats.{nom}": valeurs
+                    for nom, valeurs in self._colonnes_stats(stats_tours).items()}
+        if isinstance(historique, list):
+            # import tardif: core importe io_pkg
+            from core.historique import HistoriqueColonnaire
+            colonnaire = HistoriqueColonnaire()
+            for snapshot in historique:
+                colonnaire.enregistrer_positions(snapshot["temps"], snapshot["positions"])
+            historique = colonnaire
+
+        if historique is not None:
+            ids = self._colonne_ids(list(historique.ids))
+            temps = np.asarray(historique.temps, dtype=np.float64)
+            positions = np.asarray(historique.matrice)
+        elif stats_tours:
+            ids = self._colonne_ids([])
+            temps = np.array([s.get("temps", np.nan) for s in stats_tours], dtype=np.float64)
+            positions = np.empty((len(temps), 0), dtype=np.float64)
+        else:
+            ids, temps, positions = self._colonne_ids([]), np.empty(0), np.empty((0, 0))
+
+        if format == "npz":
+            np.savez(fichier, ids=ids, temps=temps, positions=positions, **colonnes)
+        else:
+            if any(len(valeurs) != len(temps) for valeurs in colonnes.values()):
+                raise ValueError("Historique et statistiques doivent couvrir les mêmes tours")
+            # parcours ligne par ligne: rangé par tour, puis par colonne
+            tours, colonnes_ids = np.nonzero(~np.isnan(positions))
+            pq.write_table(pa.table({"tour": tours.astype(np.int64), "temps": temps[tours],
+                                     "id": ids[colonnes_ids],
+                                     "position": positions[tours, colonnes_ids]}), fichier)
+            table_tours = {"tour": np.arange(len(temps), dtype=np.int64), "temps": temps}
+            table_tours.update(colonnes)
+            pq.write_table(pa.table(table_tours), self.fichier_tours(fichier))
+        print(f"\nR\u00e9sultats export\u00e9s dans {fichier}")
+
+    def charger_binaire(self, fichier):
+        """Relit un fichier écrit par `exporter_binaire` (format déduit de l'extension).
+
+        Args:
+            fichier (str): fichier `.npz` ou `.parquet`.
+
+        Returns:
+            dict: {"historique": HistoriqueColonnaire, "stats_tours": {nom: numpy.ndarray}}.
+
+        Raises:
+            ImportError: Si NumPy (ou pyarrow pour Parquet) n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("L'export binaire nécessite NumPy (pip install numpy)")
+        # import tardif: core importe io_pkg
+        from core.historique import HistoriqueColonnaire
+
+        if fichier.endswith(".parquet"):
+            if pq is None:
+                raise ImportError("L'export Parquet nécessite pyarrow (pip install pyarrow)")
+            table = pq.read_table(self.fichier_tours(fichier))
+            colonnes = {nom: table.column(nom).to_numpy() for nom in table.column_names}
+            temps = colonnes["temps"]
+            lignes = pq.read_table(fichier)
+            tours = lignes.column("tour").to_numpy()
+            # colonnes dans l'ordre de première apparition des identifiants
+            uniques, premiers, inverse = np.unique(lignes.column("id").to_numpy(zero_copy_only=False),
+                                                   return_index=True, return_inverse=True)
+            ordre = np.argsort(premiers, kind="stable")
+            rangs = np.empty(len(ordre), dtype=np.int64)
+            rangs[ordre] = np.arange(len(ordre))
+            ids = uniques[ordre].tolist()
+            positions = np.full((len(temps), len(ids)), np.nan)
+            positions[tours, rangs[inverse]] = lignes.column("position").to_numpy()
+        else:
+            with np.load(fichier) as donnees:
+                colonnes = {nom: donnees[nom] for nom in donnees.files}
+            ids = colonnes["ids"].tolist()
+            temps = colonnes["temps"]
+            positions = colonnes["positions"]
+
+        stats = {nom[len("stats."):]: valeurs for nom, valeurs in colonnes.items()
+                 if nom.startswith("stats.")}
+        return {"historique": HistoriqueColonnaire.depuis_tableaux(ids, temps, positions),
+                "stats_tours": stats}
@@ -0,0 +1,136 @@
+import queue
+import threading
+import time
+
+
+class ExportAsynchrone:
+    """Enveloppe un puits pour l'exécuter dans un fil d'écriture dédié.
+
+    La boucle de simulation dépose chaque cadre dans une file bornée et
+    continue aussitôt; un fil d'arrière-plan les transmet au puits enveloppé
+    (`FluxPositionsCSV`, `ExportSQLite`, ...). Quand la file est pleine, le
+    dépôt attend: c'est la contre-pression, mesurée pour savoir si les
+    entrées/sorties limitent la simulation.
+
+    `vider` attend que tous les cadres déposés soient écrits puis vide le
+    puits; `fermer` arrête le fil et ferme le puits. Le simulateur appelle
+    `vider` en fin de simulation, y compris sur `KeyboardInterrupt`: la
+    sortie partielle est alors durable.
+
+    Une erreur du puits est conservée: les cadres encore en file ne sont
+    plus écrits (ils sont comptés dans `nb_abandons`) et tout `ecrire`,
+    `vider` ou `fermer` ultérieur lève l'erreur, avec ce décompte.
+
+    Attributs:
+        puits: puits enveloppé (méthodes `ecrire`, `vider`, `fermer`).
+        nb_cadres (int): nombre de cadres déposés.
+        nb_attentes (int): nombre de dépôts ayant trouvé la file pleine.
+        temps_attente (float): temps total passé à attendre une place (s).
+        occupation_max (int): plus grand nombre de cadres en attente observé.
+        nb_abandons (int): cadres déposés mais non écrits après une erreur du puits.
+    """
+
+    _FIN = object()
+
+    def __init__(self, puits, taille_file=256):
+        """Démarre le fil d'écriture.
+
+        Args:
+            puits: puits à alimenter depuis le fil d'écriture.
+            taille_file (int): nombre maximal de cadres en attente.
+
+        Raises:
+            ValueError: Si `taille_file` < 1.
+        """
+        if not isinstance(taille_file, int) or taille_file < 1:
+            raise ValueError(f"taille_file doit être un entier >= 1, reçu: {taille_file}")
+        self.puits = puits
+        self.taille_file = taille_file
+        self.nb_cadres = 0
+        self.nb_attentes = 0
+        self.temps_attente = 0.0
+        self.occupation_max = 0
+        self.nb_abandons = 0
+        self._file = queue.Queue(maxsize=taille_file)
+        self._erreur = None
+        self._fil = threading.Thread(target=self._boucle, name="export-asynchrone", daemon=True)
+        self._fil.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fermer()
+        return False
+
+    def _boucle(self):
+        """Fil d'écriture: transmet les cadres au puits jusqu'au signal de fin."""
+        while True:
+            cadre = self._file.get()
+            try:
+                if cadre is self._FIN:
+                    return
+                if self._erreur is None:
+                    self.puits.ecrire(cadre)
+                else:
+                    self.nb_abandons += 1
+            except Exception as e:
+                # conservée et relevée côté simulation à chaque dépôt, vidage ou fermeture
+                self._erreur = e
+                self.nb_abandons += 1
+            finally:
+                self._file.task_done()
+
+    def _verifier(self):
+        """Relève l'erreur du puits, s'il y en a eu une (elle reste conservée)."""
+        erreur = self._erreur
+        if erreur is not None:
+            raise RuntimeError(f"Échec de l'écriture asynchrone: {erreur} "
+                               f"({self.nb_abandons} cadre(s) non écrit(s))") from erreur
+
+    def ecrire(self, cadre):
+        """Dépose `cadre` dans la file (attend une place si elle est pleine).
+
+        Raises:
+            RuntimeError: Si une écriture précédente a échoué ou si le fil est arrêté.
+        """
+        self._verifier()
+        if not self._fil.is_alive():
+            raise RuntimeError("Export asynchrone fermé")
+        try:
+            self._file.put_nowait(cadre)
+        except queue.Full:
+            debut = time.perf_counter()
+            self._file.put(cadre)
+            self.nb_attentes += 1
+            self.temps_attente += time.perf_counter() - debut
+        self.nb_cadres += 1
+        self.occupation_max = max(self.occupation_max, self._file.qsize())
+
+    def metriques(self):
+        """Retourne les mesures de contre-pression sous forme de dictionnaire."""
+        return {
+            "nb_cadres": self.nb_cadres,
+            "en_attente": self._file.qsize(),
+            "occupation_max": self.occupation_max,
+            "nb_attentes": self.nb_attentes,
+            "temps_attente": self.temps_attente,
+            "nb_abandons": self.nb_abandons,
+        }
+
+    def vider(self):
+        """Attend l'écriture de tous les cadres déposés puis vide le puits."""
+        if self._fil.is_alive():
+            self._file.join()
+        self.puits.vider()
+        self._verifier()
+
+    def fermer(self):
+        """Écrit les cadres restants, arrête le fil et ferme le puits."""
+        try:
+            if self._fil.is_alive():
+                self._file.put(self._FIN)
+                self._fil.join()
+            self._verifier()
+        finally:
+            self.puits.fermer()
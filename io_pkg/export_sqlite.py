@@ -0,0 +1,156 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class ExportSQLite:
+    """Puits de résultats écrivant statistiques et trajectoires dans SQLite.
+
+    Plusieurs simulations partagent un même fichier: chaque exécution reçoit
+    un `run_id`. Les lignes sont accumulées puis insérées par `executemany`,
+    une transaction tous les `tours_par_transaction` tours, en mode WAL (un
+    lecteur peut interroger la base pendant l'écriture).
+
+    Tables:
+        runs(run_id, debut, resultats)
+        stats(run_id, tour, temps, nb_vehicules, moyenne_vitesse)
+        trajectoires(run_id, tour, temps, vehicule_id, position)
+
+    S'utilise avec `Simulateur(puits=[...])` (voir `ecrire`) et se ferme avec
+    `fermer` ou en gestionnaire de contexte. La connexion peut être utilisée
+    depuis un autre fil que celui qui l'a ouverte (fil d'écriture de
+    `ExportAsynchrone`): un verrou sérialise tous ses accès.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY,
+            debut REAL NOT NULL,
+            resultats TEXT
+        );
+        CREATE TABLE IF NOT EXISTS stats (
+            run_id TEXT NOT NULL,
+            tour INTEGER NOT NULL,
+            temps REAL NOT NULL,
+            nb_vehicules INTEGER,
+            moyenne_vitesse REAL
+        );
+        CREATE TABLE IF NOT EXISTS trajectoires (
+            run_id TEXT NOT NULL,
+            tour INTEGER NOT NULL,
+            temps REAL NOT NULL,
+            vehicule_id TEXT NOT NULL,
+            position REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_stats_run_temps ON stats (run_id, temps);
+        CREATE INDEX IF NOT EXISTS idx_trajectoires_run_temps ON trajectoires (run_id, temps);
+        CREATE INDEX IF NOT EXISTS idx_trajectoires_run_vehicule
+            ON trajectoires (run_id, vehicule_id);
+    """
+
+    def __init__(self, chemin, run_id=None, tours_par_transaction=100):
+        """Ouvre (ou crée) la base et enregistre l'exécution.
+
+        Args:
+            chemin (str): fichier SQLite.
+            run_id (str, optional): identifiant de l'exécution (généré sinon).
+            tours_par_transaction (int): nombre de tours regroupés par transaction.
+
+        Raises:
+            ValueError: Si `tours_par_transaction` < 1.
+        """
+        if not isinstance(tours_par_transaction, int) or tours_par_transaction < 1:
+            raise ValueError(f"tours_par_transaction doit être un entier >= 1, "
+                             f"reçu: {tours_par_transaction}")
+        self.chemin = chemin
+        self.run_id = run_id or uuid.uuid4().hex
+        self.tours_par_transaction = tours_par_transaction
+        self._stats = []
+        self._trajectoires = []
+        self._tours_en_attente = 0
+        self._verrou = threading.RLock()
+
+        # un seul fil à la fois utilise la connexion (voir `_verrou`)
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute("PRAGMA synchronous=NORMAL")
+        with self._connexion:
+            self._connexion.executescript(self.SCHEMA)
+            self._connexion.execute("INSERT INTO runs (run_id, debut) VALUES (?, ?)",
+                                    (self.run_id, time.time()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fermer()
+        return False
+
+    def ecrire(self, cadre):
+        """Ajoute un cadre de `Simulateur.iter_simulation` (stats et positions).
+
+        Les lignes sont écrites par lots de `tours_par_transaction` tours.
+        """
+        tour = cadre["tour"]
+        temps = cadre["temps"]
+        stats = cadre.get("stats") or {}
+        positions = cadre.get("positions") or {}
+        with self._verrou:
+            self._stats.append((self.run_id, tour, temps, stats.get("nb_vehicules"),
+                                stats.get("moyenne_vitesse")))
+            self._trajectoires.extend((self.run_id, tour, temps, str(vid), p)
+                                      for vid, p in positions.items())
+            self._tours_en_attente += 1
+            if self._tours_en_attente >= self.tours_par_transaction:
+                self.vider()
+
+    def vider(self):
+        """Écrit les lignes en attente dans une seule transaction."""
+        with self._verrou:
+            if self._connexion is None or not self._tours_en_attente:
+                return
+            with self._connexion:
+                self._connexion.executemany(
+                    "INSERT INTO stats VALUES (?, ?, ?, ?, ?)", self._stats)
+                self._connexion.executemany(
+                    "INSERT INTO trajectoires VALUES (?, ?, ?, ?, ?)", self._trajectoires)
+            self._stats = []
+            self._trajectoires = []
+            self._tours_en_attente = 0
+
+    def enregistrer_resultats(self, stats):
+        """Associe les statistiques finales `stats` (JSON) à l'exécution.
+
+        Contrairement à `Export.exporter_resultats`, aucun fichier n'est
+        désigné: les résultats vont dans la ligne `runs` de l'exécution.
+        """
+        with self._verrou, self._connexion:
+            self._connexion.execute("UPDATE runs SET resultats = ? WHERE run_id = ?",
+                                    (json.dumps(stats), self.run_id))
+
+    def trajectoire(self, vehicule_id, run_id=None):
+        """Retourne la liste (temps, position) d'un véhicule pour une exécution.
+
+        Args:
+            vehicule_id: identifiant du véhicule.
+            run_id (str, optional): exécution interrogée (par défaut la courante).
+        """
+        with self._verrou:
+            self.vider()
+            curseur = self._connexion.execute(
+                "SELECT temps, position FROM trajectoires WHERE run_id = ? AND vehicule_id = ? "
+                "ORDER BY temps", (run_id or self.run_id, str(vehicule_id)))
+            return curseur.fetchall()
+
+    def fermer(self):
+        """Écrit les lignes en attente et ferme la connexion."""
+        with self._verrou:
+            if self._connexion is None:
+                return
+            try:
+                self.vider()
+            finally:
+                self._connexion.close()
+                self._connexion = None
@@ -0,0 +1,133 @@
+import csv
+import gzip
+import lzma
+
+
+COMPRESSIONS = (None, "gzip", "lzma")
+EXTENSIONS = {None: "", "gzip": ".gz", "lzma": ".xz"}
+
+
+def ouvrir_sortie_texte(chemin, compression=None, taille_tampon=1 << 16):
+    """Ouvre un fichier texte en écriture, éventuellement compressé à la volée.
+
+    Args:
+        chemin (str): fichier de destination.
+        compression (str, optional): None, "gzip" ou "lzma".
+        taille_tampon (int): taille du tampon d'écriture (sans compression).
+
+    Returns:
+        file: fichier texte (UTF-8, fins de ligne gérées par le module csv).
+
+    Raises:
+        ValueError: Si la compression est inconnue.
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Compression inconnue: {compression!r} (attendu: None, gzip, lzma)")
+    if compression == "gzip":
+        return gzip.open(chemin, "wt", newline="", encoding="utf-8")
+    if compression == "lzma":
+        return lzma.open(chemin, "wt", newline="", encoding="utf-8")
+    return open(chemin, "w", newline="", encoding="utf-8", buffering=taille_tampon)
+
+
+class FluxPositionsCSV:
+    """Puits de positions écrivant chaque tour en CSV pendant la simulation.
+
+    Contrairement à `Simulateur.tracer_positions`, qui relit tout
+    l'historique en fin de simulation, le flux écrit les lignes d'un tour dès
+    qu'il est produit, à travers un tampon d'écriture: aucun historique n'a
+    besoin d'être conservé en mémoire.
+
+    Deux formats sont proposés:
+        - "long": une ligne (temps, vehicule_id, position) par véhicule
+          présent; les véhicules apparus en cours de route n'exigent rien.
+        - "large": une ligne par tour et une colonne par véhicule, comme
+          `tracer_positions`; les identifiants doivent être déclarés à la
+          création (cellule vide pour un véhicule absent).
+
+    Un puits s'utilise avec `Simulateur(puits=[...])` ou directement via
+    `ecrire_positions`. Il se ferme avec `fermer` ou en gestionnaire de
+    contexte.
+    """
+
+    FORMATS = ("long", "large")
+
+    def __init__(self, chemin, format="long", ids=None, taille_tampon=1 << 16,
+                 compression=None):
+        """Ouvre `chemin` et écrit l'en-tête.
+
+        Args:
+            chemin (str): fichier CSV de destination.
+            format (str): "long" ou "large".
+            ids (iterable, optional): identifiants des véhicules (obligatoire
+                pour le format "large", qui fixe l'ordre des colonnes).
+            taille_tampon (int): taille du tampon d'écriture en octets.
+            compression (str, optional): None, "gzip" ou "lzma".
+
+        Raises:
+            ValueError: Si le format ou la compression est inconnu, ou si
+                `ids` manque au format "large".
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"Format inconnu: {format!r} (attendu: {', '.join(self.FORMATS)})")
+        if format == "large" and ids is None:
+            raise ValueError("Le format 'large' nécessite la liste des identifiants (ids)")
+
+        self.chemin = chemin
+        self.format = format
+        self.nb_lignes = 0
+        self._fichier = ouvrir_sortie_texte(chemin, compression, taille_tampon)
+        self._writer = csv.writer(self._fichier)
+        if format == "long":
+            self.ids = None
+            self._colonnes = None
+            self._writer.writerow(["temps", "vehicule_id", "position"])
+        else:
+            self.ids = list(ids)
+            self._colonnes = {vid: i for i, vid in enumerate(self.ids)}
+            self._writer.writerow(["temps"] + self.ids)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fermer()
+        return False
+
+    def ecrire(self, cadre):
+        """Écrit un cadre de `Simulateur.iter_simulation` (clés "temps" et "positions")."""
+        self.ecrire_positions(cadre["temps"], cadre["positions"] or {})
+
+    def ecrire_positions(self, temps, positions):
+        """Écrit les positions d'un tour.
+
+        Args:
+            temps (float): temps simulé du tour.
+            positions (dict): {vehicule_id: position} des véhicules présents.
+
+        Raises:
+            ValueError: Au format "large", si un véhicule n'a pas été déclaré.
+        """
+        if self.format == "long":
+            self._writer.writerows((temps, vid, p) for vid, p in positions.items())
+            self.nb_lignes += len(positions)
+            return
+
+        ligne = [""] * len(self.ids)
+        for vid, p in positions.items():
+            colonne = self._colonnes.get(vid)
+            if colonne is None:
+                raise ValueError(f"Véhicule {vid!r} absent des identifiants déclarés")
+            ligne[colonne] = p
+        self._writer.writerow([temps] + ligne)
+        self.nb_lignes += 1
+
+    def vider(self):
+        """Force l'écriture du tampon sur disque."""
+        if not self._fichier.closed:
+            self._fichier.flush()
+
+    def fermer(self):
+        """Vide le tampon et ferme le fichier."""
+        if not self._fichier.closed:
+            self._fichier.close()
@@ -2,9 +2,36 @@
 
 Exécuter ce fichier pour lancer une simulation à partir de
 `data/config_reseau.json`.
+
+Options:
+    --moteur {python,vectoriel,reseau}  moteur de mise à jour des véhicules
+    --workers N                         nombre de processus (réseau réparti)
+    --memoire-partagee                  état des véhicules en mémoire partagée
+    --headless                          aucun affichage pendant la simulation
+    --affichage-tous-les N              afficher au plus un tour sur N
+    --affichage-intervalle-ms M         au plus un affichage toutes les M ms
+    --flux-positions FICHIER            écrire les positions en CSV (format long)
+                                        pendant la simulation, sans historique
+    --stats-resumees                    statistiques résumées et cumulées, sans
+                                        liste des vitesses par véhicule
+    --stats-par-route                   agrégats par route (effectif, vitesse
+                                        moyenne, densité, occupation)
+    --stats-quantiles                   quantiles de vitesse (p50, p90, p99)
+                                        par tour et histogrammes par route
+    --analyse-tous-les N                analyse complète un tour sur N
+    --analyse-intervalle T              analyse complète toutes les T secondes
+                                        simulées
+    --analyse-finale                    analyse complète au dernier tour seulement
+    --analyse-asynchrone                analyses intermédiaires dans un fil de
+                                        travail (pipeline d'instantanés)
 """
 
+import argparse
+
+from core.analyseur import Analyseur
+from core.pipeline import PipelineAnalyse
 from core.simulateur import Simulateur
+from io_pkg import Affichage, ExportAsynchrone, FluxPositionsCSV
 from exceptions import (
     SimulateurException,
     FichierConfigurationException,
@@ -12,7 +39,49 @@ from exceptions import (
 )
 
 
+def lire_arguments(argv=None):
+    """Analyse les options de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Simulateur de trafic routier")
+    parser.add_argument("--moteur", choices=Simulateur.MOTEURS, default="python",
+                        help="moteur de mise à jour des véhicules (défaut: python)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="nombre de processus pour répartir les routes (défaut: 1)")
+    parser.add_argument("--memoire-partagee", action="store_true",
+                        help="avec --workers > 1, partager l'état des véhicules sans copie")
+    parser.add_argument("--headless", action="store_true",
+                        help="ne rien afficher pendant la simulation")
+    parser.add_argument("--affichage-tous-les", type=int, default=1,
+                        help="afficher au plus un tour sur N (défaut: 1)")
+    parser.add_argument("--affichage-intervalle-ms", type=float, default=None,
+                        help="délai minimal entre deux affichages, en millisecondes")
+    parser.add_argument("--flux-positions", default=None, metavar="FICHIER",
+                        help="écrire les positions au fil de la simulation (CSV long) "
+                             "au lieu de les conserver en mémoire")
+    parser.add_argument("--stats-resumees", action="store_true",
+                        help="statistiques résumées et cumulées (Welford), "
+                             "sans liste des vitesses par véhicule")
+    parser.add_argument("--stats-par-route", action="store_true",
+                        help="ajouter les agrégats par route aux statistiques")
+    parser.add_argument("--stats-quantiles", action="store_true",
+                        help="quantiles de vitesse par tour et histogrammes par route")
+    cadence = parser.add_mutually_exclusive_group()
+    cadence.add_argument("--analyse-tous-les", type=int, default=1, metavar="N",
+                         help="analyse complète un tour sur N, compteurs seuls sinon "
+                              "(défaut: 1)")
+    cadence.add_argument("--analyse-intervalle", type=float, default=None, metavar="T",
+                         help="analyse complète toutes les T secondes simulées")
+    cadence.add_argument("--analyse-finale", action="store_true",
+                         help="analyse complète uniquement au dernier tour")
+    parser.add_argument("--analyse-asynchrone", action="store_true",
+                        help="exécuter les analyses intermédiaires dans un fil de travail")
+    args = parser.parse_args(argv)
+    if args.memoire_partagee and args.workers <= 1:
+        parser.error("--memoire-partagee nécessite --workers > 1")
+    return args
+
+
 if __name__ == "__main__":
+    args = lire_arguments()
     try:
         print("=" * 60)
         print("🚦 SIMULATEUR DE TRAFIC ROUTIER")
@@ -21,19 +90,48 @@ if __name__ == "__main__":
         
         # Initialisation du simulateur
         print("📂 Chargement de la configuration...")
-        simu = Simulateur("data/config_reseau.json")
+        analyseur = Analyseur(incremental=args.stats_resumees,
+                              inclure_vitesses=not args.stats_resumees,
+                              par_route=args.stats_par_route,
+                              quantiles=args.stats_quantiles)
+        pipeline = PipelineAnalyse({"analyseur": analyseur}, conserver=False) \
+            if args.analyse_asynchrone else None
+        # écriture du CSV dans un fil dédié: la simulation n'attend pas le disque
+        flux = ExportAsynchrone(FluxPositionsCSV(args.flux_positions)) \
+            if args.flux_positions else None
+        simu = Simulateur("data/config_reseau.json", moteur=args.moteur, workers=args.workers,
+                           memoire_partagee=args.memoire_partagee,
+                           affichage=Affichage(silencieux=args.headless,
+                                               tous_les=args.affichage_tous_les,
+                                               intervalle_ms=args.affichage_intervalle_ms),
+                           puits=[flux] if flux is not None else None,
+                           analyseur=analyseur,
+                           analyse_tous_les=None if args.analyse_finale else args.analyse_tous_les,
+                           analyse_intervalle=args.analyse_intervalle,
+                           pipeline=pipeline)
         print("✅ Configuration chargée avec succès\n")
         
         # Lancement de la simulation
         print("▶️  Démarrage de la simulation...")
         print("-" * 60)
-        simu.lancer_simulation(n_tours=10, delta_t=1.0)
+        try:
+            simu.lancer_simulation(n_tours=10, delta_t=1.0, historique=flux is None)
+        finally:
+            try:
+                if flux is not None:
+                    flux.fermer()  # relève une erreur d'écriture conservée
+            finally:
+                if pipeline is not None:
+                    pipeline.fermer()
         print("-" * 60)
         print("✅ Simulation terminée avec succès\n")
         
         # Export des positions
-        print("📊 Export des positions en CSV...")
-        simu.tracer_positions()
+        if flux is not None:
+            print(f"📊 Positions écrites au fil de l'eau dans {flux.puits.chemin}")
+        else:
+            print("📊 Export des positions en CSV...")
+            simu.tracer_positions()
         
         print()
         print("=" * 60)
@@ -0,0 +1,144 @@
+"""Validation des chargements de véhicules par lot (colonnes).
+
+`Route.ajouter_vehicules_bulk` et `ReseauRoutier.charger_vehicules` reçoivent
+des colonnes (identifiants, routes, positions, vitesses) au lieu d'objets
+`Vehicule` construits et validés un par un. `valider_lot` contrôle toutes
+les lignes en une passe: avec NumPy, vitesses, positions (rapportées à la
+longueur de leur route) et capacités restantes sont comparées en quelques
+opérations vectorisées; sans NumPy, une boucle équivalente est utilisée.
+Toutes les lignes fautives sont rapportées ensemble par
+`VehiculesInvalidesException`.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+from exceptions import VehiculesInvalidesException
+
+
+def en_liste(colonne):
+    """Convertit une colonne (liste, tuple, tableau NumPy) en liste Python."""
+    return colonne.tolist() if hasattr(colonne, "tolist") else list(colonne)
+
+
+def rangs_par_groupe(groupes):
+    """Rang de chaque élément parmi ceux de son groupe, dans l'ordre d'apparition.
+
+    Sert à comparer des arrivées à la place restante de chaque route.
+
+    Args:
+        groupes (numpy.ndarray): numéro de groupe (entier) de chaque élément.
+
+    Returns:
+        tuple: (rangs, ordre, tries) où `ordre` trie les éléments par groupe
+            (tri stable) et `tries` = groupes[ordre].
+    """
+    ordre = np.argsort(groupes, kind="stable")
+    tries = groupes[ordre]
+    rangs = np.empty(len(groupes), dtype=np.int64)
+    rangs[ordre] = np.arange(len(groupes)) - np.searchsorted(tries, tries, side="left")
+    return rangs, ordre, tries
+
+
+def valider_lot(ids, noms_routes, positions, vitesses, routes, existants=()):
+    """Valide un lot de véhicules et regroupe ses lignes par route.
+
+    Args:
+        ids (list): identifiants des véhicules.
+        noms_routes (list): nom de la route de chaque véhicule.
+        positions (list): positions initiales (m).
+        vitesses (list): vitesses initiales (m/s).
+        routes (dict): nom -> `Route` des routes pouvant recevoir le lot.
+        existants: identifiants déjà présents (index d'une route ou du réseau).
+
+    Returns:
+        dict: nom de route -> liste des lignes du lot qui lui sont destinées
+            (dans l'ordre du lot).
+
+    Raises:
+        ValueError: Si les colonnes n'ont pas toutes la même longueur.
+        VehiculesInvalidesException: Si au moins une ligne est invalide
+            (route inconnue, identifiant en double ou déjà présent, vitesse
+            négative, position hors de la route, capacité dépassée).
+    """
+    n = len(ids)
+    if not len(noms_routes) == len(positions) == len(vitesses) == n:
+        raise ValueError("Les colonnes ids, routes, positions et vitesses doivent avoir "
+                         "la même longueur")
+    noms = list(routes)
+    rangs = {nom: i for i, nom in enumerate(noms)}
+    indices = [rangs.get(nom, -1) for nom in noms_routes]
+    motifs = {}
+
+    def signaler(lignes, motif):
+        for ligne in lignes:
+            motifs.setdefault(int(ligne), []).append(motif)
+
+    vus = set()
+    for ligne, vid in enumerate(ids):
+        if vid in vus:
+            signaler([ligne], "identifiant en double dans le lot")
+        elif vid in existants:
+            signaler([ligne], "identifiant déjà présent")
+        vus.add(vid)
+
+    if np is not None:
+        groupes = _valider_colonnes(indices, positions, vitesses, noms, routes, signaler)
+    else:
+        groupes = _valider_lignes(indices, positions, vitesses, noms, routes, signaler)
+
+    if motifs:
+        raise VehiculesInvalidesException(
+            [(ligne, ids[ligne], motifs[ligne]) for ligne in sorted(motifs)])
+    return groupes
+
+
+def _valider_colonnes(indices, positions, vitesses, noms, routes, signaler):
+    """Contrôles vectorisés (NumPy) de `valider_lot`."""
+    indices = np.asarray(indices, dtype=np.int64)
+    positions = np.asarray(positions, dtype=np.float64)
+    vitesses = np.asarray(vitesses, dtype=np.float64)
+    # une case supplémentaire (indice -1) pour les routes inconnues
+    longueurs = np.array([float(routes[nom].longueur) for nom in noms] + [np.inf])
+    restantes = np.array([routes[nom].capacite_max - len(routes[nom].vehicules)
+                          for nom in noms] + [np.inf])
+
+    inconnues = indices < 0
+    signaler(np.flatnonzero(inconnues), "route inconnue")
+    # comparaisons écrites pour que NaN soit aussi rejeté
+    signaler(np.flatnonzero(~(vitesses >= 0)), "vitesse négative")
+    signaler(np.flatnonzero(~(positions >= 0)), "position négative")
+    signaler(np.flatnonzero(positions > longueurs[indices]), "position au-delà de la route")
+
+    # rang de chaque ligne parmi les lignes de sa route, comparé à la place restante
+    rangs, ordre, tries = rangs_par_groupe(indices)
+    signaler(np.flatnonzero((rangs >= restantes[indices]) & ~inconnues),
+             "capacité de la route dépassée")
+
+    bornes = np.searchsorted(tries, np.arange(len(noms) + 1), side="left")
+    return {noms[i]: ordre[bornes[i]:bornes[i + 1]].tolist()
+            for i in range(len(noms)) if bornes[i + 1] > bornes[i]}
+
+
+def _valider_lignes(indices, positions, vitesses, noms, routes, signaler):
+    """Contrôles ligne à ligne de `valider_lot` (sans NumPy)."""
+    groupes = {}
+    for ligne, (indice, position, vitesse) in enumerate(zip(indices, positions, vitesses)):
+        if indice < 0:
+            signaler([ligne], "route inconnue")
+        if not vitesse >= 0:
+            signaler([ligne], "vitesse négative")
+        if not position >= 0:
+            signaler([ligne], "position négative")
+        if indice < 0:
+            continue
+        route = routes[noms[indice]]
+        if position > route.longueur:
+            signaler([ligne], "position au-delà de la route")
+        lignes = groupes.setdefault(noms[indice], [])
+        if len(route.vehicules) + len(lignes) >= route.capacite_max:
+            signaler([ligne], "capacité de la route dépassée")
+        lignes.append(ligne)
+    return groupes
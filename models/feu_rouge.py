@@ -3,23 +3,36 @@ class FeuRouge:
 
     Le feu a trois états: 'rouge' -> 'vert' -> 'orange' -> 'rouge' ...
     Le paramètre `cycle` définit la durée (en secondes) de chaque état.
+    `etat` et `temps_ecoule` permettent de recréer un feu en cours de cycle
+    (par exemple dans un processus de calcul parallèle).
     """
 
-    def __init__(self, cycle=5):
+    def __init__(self, cycle=5, etat='rouge', temps_ecoule=0.0):
         # durée (en secondes) de chaque état
         self.cycle = float(cycle)
         # ordre des états
         self._etats = ['rouge', 'vert', 'orange']
+        if etat not in self._etats:
+            raise ValueError(f"État de feu inconnu: {etat!r}")
         # index de l'état courant
-        self._index = 0
+        self._index = self._etats.index(etat)
         # compteur de temps dans l'état courant
-        self._t = 0.0
+        self._t = float(temps_ecoule)
 
     @property
     def etat(self):
         """Retourne l'état courant: 'rouge', 'vert' ou 'orange'."""
         return self._etats[self._index]
 
+    @property
+    def temps_ecoule(self):
+        """Temps (en secondes) passé dans l'état courant."""
+        return self._t
+
+    def temps_avant_changement(self):
+        """Retourne le temps (en secondes) restant avant le prochain changement d'état."""
+        return self.cycle - self._t
+
     def avancer_temps(self, dt):
         """Fait avancer le temps du feu de `dt` secondes et change d'état si nécessaire."""
         if dt <= 0:
@@ -0,0 +1,90 @@
+"""Vue compilée de la topologie d'un réseau routier (format CSR).
+
+Les routes reçoivent des identifiants entiers denses (0..R-1) et les
+connexions (`ReseauRoutier.connecter`) sont rangées en lignes compressées:
+les successeurs de la route i sont `succ_indices[succ_indptr[i]:succ_indptr[i + 1]]`,
+dans l'ordre des connexions, et de même pour les prédécesseurs. Transferts
+entre routes, parcours et partitionnement peuvent alors travailler sur des
+tableaux d'entiers plutôt que par recherche de noms dans des dictionnaires.
+
+NumPy est requis (dépendance optionnelle du projet).
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+
+def _lignes_compressees(sources, cibles, nb_noeuds):
+    """Construit (indptr, indices) d'arcs sources -> cibles, ordre des arcs conservé."""
+    ordre = np.argsort(sources, kind="stable")
+    indptr = np.zeros(nb_noeuds + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=nb_noeuds), out=indptr[1:])
+    return indptr, cibles[ordre].astype(np.int32)
+
+
+class GrapheRoutier:
+    """Graphe orienté des routes en représentation CSR.
+
+    Attributs:
+        noms (list): nom de chaque route, par identifiant.
+        indices (dict): nom -> identifiant entier.
+        longueurs (numpy.ndarray): longueur de chaque route (m).
+        limites (numpy.ndarray): limite de vitesse de chaque route.
+        succ_indptr, succ_indices (numpy.ndarray): successeurs (CSR).
+        pred_indptr, pred_indices (numpy.ndarray): prédécesseurs (CSR).
+    """
+
+    def __init__(self, routes):
+        """Compile la topologie de `routes` (les successeurs hors de `routes` sont ignorés).
+
+        Args:
+            routes (iterable): routes, dans l'ordre des identifiants souhaité.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("Le graphe compilé nécessite NumPy (pip install numpy)")
+        routes = list(routes)
+        self.noms = [route.nom for route in routes]
+        self.indices = {nom: i for i, nom in enumerate(self.noms)}
+        self.longueurs = np.array([float(r.longueur) for r in routes], dtype=np.float64)
+        self.limites = np.array([float(r.limite_vitesse) for r in routes], dtype=np.float64)
+
+        rangs = {id(route): i for i, route in enumerate(routes)}
+        arcs = [(i, rangs[id(suivante)]) for i, route in enumerate(routes)
+                for suivante in route.successeurs if id(suivante) in rangs]
+        sources = np.array([a for a, _ in arcs], dtype=np.int64)
+        cibles = np.array([b for _, b in arcs], dtype=np.int64)
+        self.succ_indptr, self.succ_indices = _lignes_compressees(sources, cibles, len(routes))
+        self.pred_indptr, self.pred_indices = _lignes_compressees(cibles, sources, len(routes))
+
+    @property
+    def nb_routes(self):
+        """Nombre de routes (noeuds)."""
+        return len(self.noms)
+
+    @property
+    def nb_connexions(self):
+        """Nombre de connexions (arcs)."""
+        return len(self.succ_indices)
+
+    @property
+    def degres_sortants(self):
+        """Nombre de successeurs de chaque route."""
+        return np.diff(self.succ_indptr)
+
+    @property
+    def degres_entrants(self):
+        """Nombre de prédécesseurs de chaque route."""
+        return np.diff(self.pred_indptr)
+
+    def successeurs(self, i):
+        """Identifiants des successeurs de la route `i` (vue sur `succ_indices`)."""
+        return self.succ_indices[self.succ_indptr[i]:self.succ_indptr[i + 1]]
+
+    def predecesseurs(self, i):
+        """Identifiants des prédécesseurs de la route `i` (vue sur `pred_indices`)."""
+        return self.pred_indices[self.pred_indptr[i]:self.pred_indptr[i + 1]]
@@ -0,0 +1,492 @@
+"""Moteur vectoriel (struct-of-arrays) pour la mise à jour des véhicules.
+
+Les positions, vitesses et identifiants des véhicules sont rangés dans des
+tableaux NumPy contigus. Un pas de simulation devient alors une poignée
+d'opérations vectorisées au lieu d'une boucle Python sur `Vehicule.avancer`.
+Les objets `Vehicule` restent utilisables: une fois attachés au moteur, ils
+servent de vues légères sur leur emplacement dans les tableaux.
+
+NumPy est une dépendance optionnelle: le module s'importe sans elle, mais la
+création d'un moteur lève `ImportError`.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+from exceptions import VitesseNegativeException, PositionInvalideException
+
+
+def numpy_disponible():
+    """Indique si NumPy est installé (et donc si le moteur est utilisable)."""
+    return np is not None
+
+
+class MoteurVectoriel:
+    """Stockage en colonnes des véhicules d'une ou plusieurs routes.
+
+    Chaque véhicule occupe un emplacement (indice) dans les tableaux. La
+    colonne `indices_routes` indique la route du véhicule, ce qui permet à un
+    même moteur de servir une seule route ou tout un réseau.
+
+    Attributs:
+        routes (list): routes liées au moteur, dans l'ordre de leur indice.
+        longueurs (numpy.ndarray): longueur de chaque route.
+        limites (numpy.ndarray): limite de vitesse de chaque route.
+        capacites (numpy.ndarray): capacité maximale de chaque route.
+        occupation (numpy.ndarray): nombre de véhicules de chaque route.
+        positions_feu (numpy.ndarray): position du feu de chaque route (NaN si aucun).
+        bornes (numpy.ndarray): borne des positions sur chaque route: sa
+            longueur, ou l'infini si la route a des successeurs (le surplus
+            est transféré par `ReseauRoutier.transferer`).
+        ids (numpy.ndarray): identifiants des véhicules (dtype objet).
+        positions (numpy.ndarray): positions des véhicules (m).
+        vitesses (numpy.ndarray): vitesses des véhicules (m/s).
+        indices_routes (numpy.ndarray): indice de route de chaque véhicule.
+        vues (list): objets `Vehicule` liés à chaque emplacement.
+        n (int): nombre d'emplacements occupés.
+        version (int): incrémenté à chaque changement de la disposition des
+            emplacements (ajout, retrait, déplacement de véhicules).
+    """
+
+    CAPACITE_INITIALE = 64
+
+    def __init__(self, routes=(), capacite=None):
+        """Crée un moteur vide puis y lie les `routes` fournies.
+
+        Args:
+            routes (iterable): routes à lier au moteur.
+            capacite (int, optional): nombre d'emplacements préalloués.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("Le moteur vectoriel nécessite NumPy (pip install numpy)")
+
+        routes = list(routes)
+        if capacite is None:
+            capacite = max(self.CAPACITE_INITIALE, sum(len(r.vehicules) for r in routes))
+        capacite = max(int(capacite), 1)
+        self.routes = []
+        self.longueurs = np.empty(0, dtype=np.float64)
+        self.limites = np.empty(0, dtype=np.float64)
+        self.capacites = np.empty(0, dtype=np.float64)
+        self.occupation = np.empty(0, dtype=np.int64)
+        self.positions_feu = np.empty(0, dtype=np.float64)
+        self.bornes = np.empty(0, dtype=np.float64)
+        self._indices_feux = set()
+        # indices des routes dont la liste `vehicules` est à reconstruire (voir `deplacer`)
+        self._routes_perimees = set()
+
+        self.ids = np.empty(capacite, dtype=object)
+        self.positions = np.zeros(capacite, dtype=np.float64)
+        self.vitesses = np.zeros(capacite, dtype=np.float64)
+        self.indices_routes = np.zeros(capacite, dtype=np.int32)
+        self.vues = []
+        self.n = 0
+        self.version = 0
+        # vrai lorsque positions/vitesses sont des tampons externes (mémoire partagée)
+        self._memoire_externe = False
+
+        self.ajouter_routes(routes)
+
+    @classmethod
+    def depuis_reseau(cls, reseau):
+        """Construit un moteur unique regroupant toutes les routes de `reseau`.
+
+        Tous les véhicules du réseau sont rangés dans une seule table
+        (avec une colonne d'indice de route): un pas de simulation coûte
+        alors quelques opérations vectorisées, quel que soit le nombre de
+        routes.
+
+        Args:
+            reseau (ReseauRoutier): réseau à compiler.
+
+        Returns:
+            MoteurVectoriel: le moteur global (les routes y sont liées).
+        """
+        return cls(reseau.routes.values())
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+    def ajouter_route(self, route):
+        """Lie `route` au moteur et y attache les véhicules qu'elle porte déjà.
+
+        Args:
+            route (Route): route à lier.
+
+        Returns:
+            int: indice de la route dans le moteur.
+        """
+        return self.ajouter_routes([route])[0]
+
+    def ajouter_routes(self, routes):
+        """Lie plusieurs routes d'un coup (tables par route étendues une seule fois).
+
+        Args:
+            routes (iterable): routes à lier.
+
+        Returns:
+            list: indices attribués aux routes, dans l'ordre.
+        """
+        routes = list(routes)
+        # listes lues avant de re-lier les routes (elles peuvent venir d'un autre moteur)
+        listes = [route.vehicules for route in routes]
+        debut = len(self.routes)
+        indices = list(range(debut, debut + len(routes)))
+        self.routes.extend(routes)
+        self.longueurs = np.concatenate(
+            [self.longueurs, np.array([float(r.longueur) for r in routes], dtype=np.float64)])
+        self.limites = np.concatenate(
+            [self.limites, np.array([float(r.limite_vitesse) for r in routes], dtype=np.float64)])
+        self.capacites = np.concatenate(
+            [self.capacites, np.array([float(r.capacite_max) for r in routes], dtype=np.float64)])
+        self.occupation = np.concatenate([self.occupation, np.zeros(len(routes), dtype=np.int64)])
+        self.positions_feu = np.concatenate(
+            [self.positions_feu, np.full(len(routes), np.nan)])
+        self.bornes = np.concatenate(
+            [self.bornes, np.array([np.inf if r.successeurs else float(r.longueur)
+                                    for r in routes], dtype=np.float64)])
+
+        for indice, route, vehicules in zip(indices, routes, listes):
+            route._moteur = self
+            route._indice_moteur = indice
+            if route.feu_rouge is not None:
+                self.synchroniser_feu(indice)
+            self.attacher_lot(vehicules, indice)
+        return indices
+
+    def remplacer_route(self, ancienne, route):
+        """Lie `route` à l'indice de `ancienne`, qui quitte le moteur avec ses véhicules.
+
+        Les véhicules de `ancienne` sont détachés (ils redeviennent des objets
+        autonomes portant leur état courant) et ceux de `route` attachés.
+
+        Args:
+            ancienne (Route): route liée à ce moteur.
+            route (Route): route qui prend sa place.
+
+        Returns:
+            int: indice de la route dans le moteur.
+        """
+        indice = ancienne._indice_moteur
+        for vehicule in list(ancienne.vehicules):
+            self.detacher(vehicule)
+        ancienne._moteur = None
+        ancienne._indice_moteur = None
+
+        vehicules = route.vehicules
+        self.routes[indice] = route
+        self.longueurs[indice] = float(route.longueur)
+        self.limites[indice] = float(route.limite_vitesse)
+        self.capacites[indice] = float(route.capacite_max)
+        route._moteur = self
+        route._indice_moteur = indice
+        self.synchroniser_feu(indice)
+        self.synchroniser_sorties(indice)
+        self.attacher_lot(vehicules, indice)
+        return indice
+
+    def synchroniser_feu(self, indice):
+        """Recopie dans le moteur le feu de la route d'indice `indice`."""
+        route = self.routes[indice]
+        if route.feu_rouge is not None and route.position_feu is not None:
+            self.positions_feu[indice] = float(route.position_feu)
+            self._indices_feux.add(indice)
+        else:
+            self.positions_feu[indice] = np.nan
+            self._indices_feux.discard(indice)
+
+    def synchroniser_sorties(self, indice):
+        """Recopie dans `bornes` la présence de successeurs de la route d'indice `indice`."""
+        route = self.routes[indice]
+        self.bornes[indice] = np.inf if route.successeurs else float(route.longueur)
+
+    def avancer_feux(self, delta_t):
+        """Fait avancer le temps de tous les feux des routes liées."""
+        for i in self._indices_feux:
+            try:
+                self.routes[i].feu_rouge.avancer_temps(delta_t)
+            except Exception:
+                pass
+
+    def _routes_au_rouge(self):
+        """Retourne un masque booléen (par route) des feux actuellement rouges."""
+        rouge = np.zeros(len(self.routes), dtype=bool)
+        for i in self._indices_feux:
+            rouge[i] = self.routes[i].feu_rouge.etat == 'rouge'
+        return rouge
+
+    # ------------------------------------------------------------------
+    # Véhicules
+    # ------------------------------------------------------------------
+    def utiliser_memoire(self, positions, vitesses):
+        """Place les colonnes positions et vitesses dans des tableaux fournis.
+
+        Les valeurs courantes y sont recopiées. Sert à loger l'état dans un
+        bloc de mémoire partagée: ces colonnes ne peuvent alors plus être
+        agrandies tant que `liberer_memoire` n'a pas été appelé.
+
+        Args:
+            positions (numpy.ndarray): tableau float64 d'au moins `n` éléments.
+            vitesses (numpy.ndarray): tableau float64 d'au moins `n` éléments.
+
+        Raises:
+            ValueError: Si les tableaux sont trop petits.
+        """
+        n = self.n
+        if len(positions) < n or len(vitesses) < n:
+            raise ValueError(f"Tableaux trop petits pour {n} véhicules")
+        positions[:n] = self.positions[:n]
+        vitesses[:n] = self.vitesses[:n]
+        self.positions = positions
+        self.vitesses = vitesses
+        self._memoire_externe = True
+
+    def liberer_memoire(self):
+        """Recopie positions et vitesses dans des tableaux privés au moteur."""
+        if not self._memoire_externe:
+            return
+        capacite = len(self.ids)
+        for nom in ("positions", "vitesses"):
+            tableau = np.zeros(capacite, dtype=np.float64)
+            tableau[:self.n] = getattr(self, nom)[:self.n]
+            setattr(self, nom, tableau)
+        self._memoire_externe = False
+
+    def _agrandir(self, capacite):
+        """Réalloue les colonnes pour contenir au moins `capacite` emplacements."""
+        if self._memoire_externe:
+            raise RuntimeError("Impossible d'agrandir un moteur logé en mémoire externe")
+        nouvelle = max(capacite, 2 * len(self.positions))
+        for nom in ("ids", "positions", "vitesses", "indices_routes"):
+            ancien = getattr(self, nom)
+            tableau = np.zeros(nouvelle, dtype=ancien.dtype) if ancien.dtype != object \
+                else np.empty(nouvelle, dtype=object)
+            tableau[:self.n] = ancien[:self.n]
+            setattr(self, nom, tableau)
+
+    def attacher(self, vehicule, indice_route):
+        """Range `vehicule` dans les tableaux et en fait une vue sur son emplacement.
+
+        Args:
+            vehicule (Vehicule): véhicule à attacher.
+            indice_route (int): indice de sa route dans le moteur.
+
+        Returns:
+            int: emplacement attribué au véhicule.
+        """
+        # lire l'état courant avant de re-lier la vue (il peut venir d'un autre moteur)
+        position = vehicule.position
+        vitesse = vehicule.vitesse
+        if self.n >= len(self.positions):
+            self._agrandir(self.n + 1)
+
+        slot = self.n
+        self.ids[slot] = vehicule.id
+        self.positions[slot] = position
+        self.vitesses[slot] = vitesse
+        self.indices_routes[slot] = indice_route
+        self.occupation[indice_route] += 1
+        self.vues.append(vehicule)
+        self.n += 1
+        self.version += 1
+
+        vehicule._moteur = self
+        vehicule._slot = slot
+        return slot
+
+    def attacher_lot(self, vehicules, indice_route):
+        """Attache plusieurs véhicules d'une même route en une seule écriture par colonne.
+
+        Args:
+            vehicules (list): véhicules à attacher.
+            indice_route (int): indice de leur route dans le moteur.
+
+        Returns:
+            range: emplacements attribués, dans l'ordre de `vehicules`.
+        """
+        k = len(vehicules)
+        debut = self.n
+        if not k:
+            return range(debut, debut)
+        # lire l'état courant avant de re-lier les vues (il peut venir d'un autre moteur)
+        positions = np.fromiter((v.position for v in vehicules), dtype=np.float64, count=k)
+        vitesses = np.fromiter((v.vitesse for v in vehicules), dtype=np.float64, count=k)
+        if debut + k > len(self.positions):
+            self._agrandir(debut + k)
+
+        fin = debut + k
+        for slot, vehicule in enumerate(vehicules, debut):
+            self.ids[slot] = vehicule.id
+            vehicule._moteur = self
+            vehicule._slot = slot
+        self.positions[debut:fin] = positions
+        self.vitesses[debut:fin] = vitesses
+        self.indices_routes[debut:fin] = indice_route
+        self.occupation[indice_route] += k
+        self.vues.extend(vehicules)
+        self.n = fin
+        self.version += 1
+        return range(debut, fin)
+
+    def detacher(self, vehicule):
+        """Retire `vehicule` des tableaux en O(1) (le dernier emplacement comble le trou).
+
+        Les colonnes restent denses: le véhicule du dernier emplacement est
+        déplacé dans l'emplacement libéré et sa vue mise à jour. La capacité
+        allouée est conservée pour les prochains `attacher`. Le véhicule
+        retiré redevient un objet autonome portant son état courant.
+
+        Args:
+            vehicule (Vehicule): véhicule attaché à ce moteur.
+
+        Returns:
+            int: emplacement libéré (occupé désormais par l'ancien dernier
+                véhicule, s'il y en avait un autre).
+        """
+        slot = vehicule._slot
+        position = float(self.positions[slot])
+        vitesse = float(self.vitesses[slot])
+        indice_route = self.indices_routes[slot]
+        self.occupation[indice_route] -= 1
+        dernier = self.n - 1
+        if slot != dernier:
+            self.ids[slot] = self.ids[dernier]
+            self.positions[slot] = self.positions[dernier]
+            self.vitesses[slot] = self.vitesses[dernier]
+            self.indices_routes[slot] = self.indices_routes[dernier]
+            deplace = self.vues[dernier]
+            self.vues[slot] = deplace
+            deplace._slot = slot
+        self.ids[dernier] = None
+        self.vues.pop()
+        self.n = dernier
+        self.version += 1
+
+        vehicule._moteur = None
+        vehicule._slot = None
+        vehicule._route = self.routes[indice_route]
+        vehicule.position = position
+        vehicule.vitesse = vitesse
+        return slot
+
+    def deplacer(self, slots, destinations):
+        """Fait passer les véhicules des emplacements `slots` sur les routes `destinations`.
+
+        Opération par lot (sans parcourir les véhicules): `indices_routes`
+        et `occupation` sont réécrits, les routes touchées sont marquées
+        et leurs listes `vehicules` reconstruites à la prochaine lecture
+        (`reconstruire_routes`). Les emplacements ne changent pas.
+
+        Args:
+            slots (numpy.ndarray): emplacements des véhicules à déplacer.
+            destinations (numpy.ndarray): indice de la nouvelle route de chacun.
+        """
+        if not len(slots):
+            return
+        origines = self.indices_routes[slots]
+        nb_routes = len(self.routes)
+        self.occupation -= np.bincount(origines, minlength=nb_routes)
+        self.occupation += np.bincount(destinations, minlength=nb_routes)
+        self.indices_routes[slots] = destinations
+        for indice in np.union1d(origines, destinations).tolist():
+            self.routes[indice]._perime = True
+            self._routes_perimees.add(indice)
+
+    def reconstruire_routes(self):
+        """Reconstruit liste `vehicules` et index des routes marquées par `deplacer`.
+
+        Les emplacements sont groupés par route en un tri stable (bornes
+        tirées de `occupation`); chaque liste suit l'ordre des emplacements.
+        """
+        perimees = self._routes_perimees
+        if not perimees:
+            return
+        self._routes_perimees = set()
+        ordre = np.argsort(self.indices_routes[:self.n], kind="stable")
+        bornes = np.zeros(len(self.routes) + 1, dtype=np.int64)
+        np.cumsum(self.occupation, out=bornes[1:])
+        for indice in perimees:
+            slots = ordre[bornes[indice]:bornes[indice + 1]].tolist()
+            route = self.routes[indice]
+            route._vehicules = [self.vues[slot] for slot in slots]
+            route._index = dict(zip(self.ids[slots].tolist(), range(len(slots))))
+            route._perime = False
+
+    # ------------------------------------------------------------------
+    # Mise à jour
+    # ------------------------------------------------------------------
+    def avancer(self, delta_t, indice_route=None):
+        """Avance les véhicules de `delta_t` secondes en une mise à jour vectorisée.
+
+        Applique les mêmes règles que `Route.mettre_a_jour_vehicules`: arrêt
+        juste avant un feu rouge que le véhicule franchirait, puis position
+        bornée par la longueur de la route (sauf si la route a des
+        successeurs, voir `bornes`). L'état des feux n'est pas avancé ici
+        (voir `avancer_feux`).
+
+        Args:
+            delta_t (float): Intervalle de temps en secondes.
+            indice_route (int, optional): ne mettre à jour que cette route.
+
+        Raises:
+            VitesseNegativeException: Si un véhicule a une vitesse négative.
+            PositionInvalideException: Si une position devient négative.
+        """
+        n = self.n
+        if n == 0:
+            return
+
+        if indice_route is None or len(self.routes) == 1:
+            sel = slice(0, n)
+        else:
+            sel = np.flatnonzero(self.indices_routes[:n] == indice_route)
+            if sel.size == 0:
+                return
+
+        p = self.positions[sel]
+        v = self.vitesses[sel]
+
+        negatives = v < 0
+        if negatives.any():
+            i = int(np.argmax(negatives))
+            raise VitesseNegativeException(float(v[i]), str(self.ids[sel][i]))
+
+        nouvelles = p + v * delta_t
+        if delta_t < 0 and (nouvelles < 0).any():
+            i = int(np.argmax(nouvelles < 0))
+            raise PositionInvalideException(float(nouvelles[i]), vehicule_id=str(self.ids[sel][i]))
+
+        if len(self.routes) == 1:
+            routes_v = None
+            bornes = self.bornes[0]
+        else:
+            routes_v = self.indices_routes[sel]
+            bornes = self.bornes[routes_v]
+
+        arret = None
+        rouge = self._routes_au_rouge() if self._indices_feux else None
+        if rouge is not None and rouge.any():
+            # arrêt juste avant un feu rouge que le véhicule franchirait pendant le pas
+            if routes_v is None:
+                feux = self.positions_feu[0]
+                arret = (p < feux) & (nouvelles >= feux)
+            else:
+                feux = self.positions_feu[routes_v]
+                arret = rouge[routes_v] & (p < feux) & (nouvelles >= feux)
+
+        np.minimum(nouvelles, bornes, out=nouvelles)
+
+        if arret is not None and arret.any():
+            nouvelles[arret] = np.maximum(feux - 1.0, 0.0) if routes_v is None \
+                else np.maximum(feux[arret] - 1.0, 0.0)
+            v[arret] = 0.0
+            if not isinstance(sel, slice):
+                # `v` est une copie lorsque la sélection est indexée
+                self.vitesses[sel] = v
+
+        self.positions[sel] = nouvelles
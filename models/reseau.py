@@ -1,24 +1,398 @@
-from exceptions import RouteInexistanteException
+from itertools import groupby
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+from exceptions import RouteInexistanteException, VehiculeDejaPresent, VehiculeInexistantException
+from .chargement import en_liste, rangs_par_groupe, valider_lot
+from .graphe import GrapheRoutier
+from .moteur_vectoriel import MoteurVectoriel
+
+
+def _rangs_identifiants(ids):
+    """Rang de chaque identifiant dans l'ordre croissant (ordre du texte si les types sont mêlés)."""
+    try:
+        ordre = sorted(range(len(ids)), key=ids.__getitem__)
+    except TypeError:
+        ordre = sorted(range(len(ids)), key=lambda i: str(ids[i]))
+    rangs = [0] * len(ids)
+    for rang, i in enumerate(ordre):
+        rangs[i] = rang
+    return rangs
 
 class ReseauRoutier:
     """Représente l'ensemble des routes composant le réseau.
 
     Fournit des méthodes pour ajouter des routes, récupérer une route par nom
-    et obtenir un état synthétique du réseau.
+    ou un véhicule par identifiant, et obtenir un état synthétique du réseau.
+    Un index id -> véhicule couvre tous les véhicules du réseau (la route
+    d'un véhicule est `vehicule.route`): un identifiant ne peut être présent
+    que sur une seule route.
+
+    Les routes peuvent être reliées (`connecter`): un véhicule qui atteint le
+    bout d'une route passe sur l'un de ses successeurs avec la distance
+    restante du pas (`transferer`, appelé après chaque mise à jour).
     """
 
     def __init__(self):
         """Initialise un réseau vide (sans routes)."""
         self.routes = {}
+        # index global id -> véhicule
+        self._index_vehicules = {}
+        # nom de route -> prochain successeur servi (rotation entre successeurs);
+        # tant que le graphe est compilé, la rotation est tenue dans _rotations_graphe
+        self._rotations = {}
+        # moteur vectoriel global, renseigné par `compiler_moteur`
+        self.moteur = None
+        # topologie compilée (CSR), renseignée par `compiler_graphe`
+        self.graphe = None
+        # rotation entre successeurs par identifiant de route du graphe (voir _invalider_graphe)
+        self._rotations_graphe = None
 
     def ajouter_route(self, route):
         """Ajoute une instance `Route` au réseau.
 
+        Les véhicules déjà présents sur la route sont indexés. Si le réseau
+        a été compilé (`compiler_moteur`), la route et ses véhicules
+        rejoignent la table globale; une route de même nom y est remplacée
+        (ses véhicules quittent la table avec elle).
+
         Args:
             route (Route): instance à ajouter.
+
+        Raises:
+            VehiculeDejaPresent: Si un véhicule de la route est déjà présent
+                sur une autre route du réseau.
         """
+        ancienne = self.routes.get(route.nom)
+        for vehicule in route.vehicules:
+            present = self._index_vehicules.get(vehicule.id)
+            if present is not None and present.route is not ancienne and present.route is not route:
+                raise VehiculeDejaPresent(str(vehicule.id), present.route.nom)
+        if ancienne is not None and ancienne is not route:
+            # la route remplacée quitte le réseau avec ses véhicules
+            for vehicule in ancienne.vehicules:
+                del self._index_vehicules[vehicule.id]
+            ancienne._reseau = None
+        for vehicule in route.vehicules:
+            self._index_vehicules[vehicule.id] = vehicule
+        route._reseau = self
         self.routes[route.nom] = route
+        self._invalider_graphe()
+        if self.moteur is not None:
+            if ancienne is not None and ancienne is not route and ancienne._moteur is self.moteur:
+                self.moteur.remplacer_route(ancienne, route)
+            elif route._moteur is not self.moteur:
+                self.moteur.ajouter_route(route)
+
+    def compiler_moteur(self, ordre=None):
+        """Range tous les véhicules du réseau dans un seul `MoteurVectoriel`.
+
+        Les routes sont liées au moteur global (indice de route, longueur,
+        limite et feu sont des colonnes de tables par route) et les
+        véhicules deviennent des vues sur la table globale.
+
+        Args:
+            ordre (list, optional): routes dans l'ordre souhaité pour la
+                table (par défaut l'ordre d'insertion dans le réseau).
+
+        Returns:
+            MoteurVectoriel: le moteur global.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if ordre is None:
+            self.moteur = MoteurVectoriel.depuis_reseau(self)
+        else:
+            self.moteur = MoteurVectoriel(ordre)
+        self._invalider_graphe()
+        return self.moteur
+
+    def compiler_graphe(self):
+        """Construit la vue CSR de la topologie (`GrapheRoutier`) dans `self.graphe`.
+
+        Les identifiants entiers des routes sont leurs indices dans le
+        moteur global s'il existe (ils coïncident alors avec
+        `moteur.indices_routes`), sinon leur ordre d'insertion. La vue est
+        invalidée par `ajouter_route`, `connecter` et `compiler_moteur`.
+        Tant qu'elle existe, la rotation entre successeurs est tenue par
+        identifiant de route (`_rotations_graphe`), par les deux chemins de
+        `transferer`.
+
+        Returns:
+            GrapheRoutier: le graphe compilé.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        routes = self.moteur.routes if self.moteur is not None else self.routes.values()
+        self._invalider_graphe()
+        self.graphe = GrapheRoutier(routes)
+        self._rotations_graphe = np.array([self._rotations.get(nom, 0)
+                                           for nom in self.graphe.noms], dtype=np.int64)
+        return self.graphe
+
+    def _invalider_graphe(self):
+        """Abandonne le graphe compilé après y avoir relu la rotation entre successeurs."""
+        if self.graphe is not None:
+            self._rotations.update(zip(self.graphe.noms, self._rotations_graphe.tolist()))
+        self.graphe = None
+        self._rotations_graphe = None
+
+    def mettre_a_jour(self, delta_t):
+        """Avance tout le réseau d'un pas `delta_t` avec le moteur global.
+
+        Les feux sont avancés puis l'ensemble des véhicules est mis à jour
+        en une seule passe vectorisée.
+
+        Args:
+            delta_t (float): Intervalle de temps en secondes.
+
+        Raises:
+            RuntimeError: Si le réseau n'a pas été compilé.
+        """
+        if self.moteur is None:
+            raise RuntimeError("Le réseau doit être compilé (compiler_moteur) avant mettre_a_jour")
+        self.moteur.avancer_feux(delta_t)
+        self.moteur.avancer(delta_t)
+        self.transferer()
+
+    def connecter(self, origine, destination):
+        """Relie la fin de la route `origine` au début de la route `destination`.
+
+        Une route peut avoir plusieurs successeurs: les véhicules sortants
+        leur sont alors répartis à tour de rôle.
+
+        Args:
+            origine (str): nom de la route de départ.
+            destination (str): nom de la route d'arrivée.
+
+        Raises:
+            RouteInexistanteException: Si l'une des routes n'existe pas.
+        """
+        route = self.get_route(origine)
+        suivante = self.get_route(destination)
+        if suivante in route.successeurs:
+            return
+        route.successeurs.append(suivante)
+        self._invalider_graphe()
+        if route._moteur is not None:
+            route._moteur.synchroniser_sorties(route._indice_moteur)
+
+    def transferer(self):
+        """Fait passer sur leur route suivante les véhicules arrivés au bout de leur route.
+
+        Chaque véhicule sortant entre sur un successeur (à tour de rôle) avec
+        la distance parcourue au-delà du bout de sa route, éventuellement à
+        travers plusieurs routes courtes. Si le successeur est plein, il
+        attend au bout de sa route. Le feu de la route d'arrivée s'applique
+        à partir du pas suivant.
+
+        Les passages se font par vagues (une route traversée par vague), et
+        dans chaque vague les sortants sont rangés par route (ordre du
+        réseau, ou du moteur s'il est compilé), puis du plus grand au plus
+        petit dépassement, puis par identifiant. Dans cet ordre, le k-ième
+        sortant d'une route reçoit le k-ième successeur de la rotation, et
+        une route d'arrivée accepte autant de véhicules qu'elle avait de
+        places libres au début de la vague. Réseau compilé ou non, le
+        résultat est donc le même.
+
+        Sur un réseau compilé, les sortants sont traités par lot: leurs
+        successeurs sont choisis dans le graphe CSR (`compiler_graphe`),
+        positions, indices de route et occupation des routes sont réécrits
+        en quelques opérations vectorisées dans la table du moteur (les
+        emplacements ne changent pas, voir `MoteurVectoriel.deplacer`); les
+        listes de véhicules des routes touchées sont reconstruites à leur
+        prochaine lecture.
+
+        Returns:
+            int: nombre de passages d'une route à la suivante.
+        """
+        if self.moteur is not None:
+            graphe = self.graphe if self.graphe is not None else self.compiler_graphe()
+            return self._transferer_moteur() if graphe.nb_connexions else 0
+        if not any(route.successeurs for route in self.routes.values()):
+            return 0
+        return self._transferer_routes()
+
+    def _prochains_successeurs(self, route, nombre):
+        """Successeurs attribués aux `nombre` prochains véhicules sortant de `route`."""
+        successeurs = route.successeurs
+        if self.graphe is not None:
+            i = self.graphe.indices[route.nom]
+            debut = int(self._rotations_graphe[i])
+            self._rotations_graphe[i] = (debut + nombre) % len(successeurs)
+        else:
+            debut = self._rotations.get(route.nom, 0)
+            self._rotations[route.nom] = (debut + nombre) % len(successeurs)
+        return [successeurs[(debut + k) % len(successeurs)] for k in range(nombre)]
+
+    def _transferer_moteur(self):
+        """`transferer` sur la table du moteur global (graphe déjà compilé)."""
+        moteur = self.moteur
+        n = moteur.n
+        if n == 0:
+            return 0
+        routes_v = moteur.indices_routes[:n]
+        candidats = np.flatnonzero((moteur.positions[:n] >= moteur.longueurs[routes_v])
+                                   & np.isinf(moteur.bornes[routes_v]))
+        graphe = self.graphe
+        degres = graphe.degres_sortants
+        rotations = self._rotations_graphe
+        total = 0
+        while candidats.size:
+            origines = moteur.indices_routes[candidats]
+            ordre = np.lexsort((_rangs_identifiants(moteur.ids[candidats].tolist()),
+                                moteur.longueurs[origines] - moteur.positions[candidats],
+                                origines))
+            candidats = candidats[ordre]
+            origines = origines[ordre]
+            # k-ième sortant d'une route: son (rotation + k)-ième successeur, modulo le degré
+            rangs = rangs_par_groupe(origines)[0]
+            choix = (rotations[origines] + rangs) % degres[origines]
+            destinations = graphe.succ_indices[graphe.succ_indptr[origines] + choix]
+            rotations += np.bincount(origines, minlength=len(rotations))
+            np.remainder(rotations, np.maximum(degres, 1), out=rotations)
+
+            libres = moteur.capacites - moteur.occupation
+            rangs = rangs_par_groupe(destinations)[0]
+            acceptes = rangs < libres[destinations]
+            # successeur plein: attente au bout de la route
+            refuses = candidats[~acceptes]
+            moteur.positions[refuses] = moteur.longueurs[moteur.indices_routes[refuses]]
+
+            candidats = candidats[acceptes]
+            origines = origines[acceptes]
+            destinations = destinations[acceptes]
+            moteur.positions[candidats] -= moteur.longueurs[origines]
+            moteur.deplacer(candidats, destinations)
+            total += len(candidats)
+
+            # routes courtes traversées en un seul pas: vague suivante
+            depassent = moteur.positions[candidats] >= moteur.longueurs[destinations]
+            sorties = np.isinf(moteur.bornes[destinations])
+            bloques = candidats[depassent & ~sorties]
+            moteur.positions[bloques] = moteur.longueurs[moteur.indices_routes[bloques]]
+            candidats = candidats[depassent & sorties]
+        return total
+
+    def _transferer_routes(self):
+        """`transferer` route par route (réseau non compilé), dans l'ordre de `_transferer_moteur`."""
+        rangs_routes = {id(route): i for i, route in enumerate(self.routes.values())}
+        candidats = [(vehicule, route) for route in self.routes.values() if route.successeurs
+                     for vehicule in route.vehicules if vehicule.position >= route.longueur]
+        total = 0
+        while candidats:
+            rangs_ids = _rangs_identifiants([vehicule.id for vehicule, _ in candidats])
+            cles = [(rangs_routes[id(route)], route.longueur - vehicule.position, rang)
+                    for (vehicule, route), rang in zip(candidats, rangs_ids)]
+            candidats = [candidats[i] for i in sorted(range(len(candidats)), key=cles.__getitem__)]
+
+            destinations = []
+            for origine, groupe in groupby(candidats, key=lambda candidat: candidat[1]):
+                destinations.extend(self._prochains_successeurs(origine, len(list(groupe))))
+            libres = {}
+            for suivante in destinations:
+                libres.setdefault(id(suivante), suivante.capacite_max - len(suivante.vehicules))
+
+            suivants = []
+            for (vehicule, origine), suivante in zip(candidats, destinations):
+                if libres[id(suivante)] <= 0:
+                    # successeur plein: attente au bout de la route
+                    vehicule.position = origine.longueur
+                    continue
+                libres[id(suivante)] -= 1
+                reste = vehicule.position - origine.longueur
+                origine.retirer_vehicule(vehicule.id)
+                vehicule.changer_de_route(suivante, reste)
+                suivante.ajouter_vehicule(vehicule)
+                total += 1
+                if reste >= suivante.longueur:
+                    if suivante.successeurs:
+                        suivants.append((vehicule, suivante))
+                    else:
+                        vehicule.position = suivante.longueur
+            candidats = suivants
+        return total
+
+    def _indexer_vehicule(self, vehicule):
+        """Inscrit un véhicule ajouté à une route (appelé par `Route.ajouter_vehicule`).
+
+        Raises:
+            VehiculeDejaPresent: Si l'identifiant est déjà sur une route du réseau.
+        """
+        present = self._index_vehicules.get(vehicule.id)
+        if present is not None:
+            raise VehiculeDejaPresent(str(vehicule.id), present.route.nom)
+        self._index_vehicules[vehicule.id] = vehicule
+
+    def charger_vehicules(self, ids, routes, positions, vitesses):
+        """Charge un lot de véhicules décrit par colonnes sur les routes du réseau.
+
+        Le lot est validé en une passe (routes existantes, identifiants
+        uniques dans le réseau, vitesses, positions rapportées à la longueur
+        de chaque route, capacités), puis les véhicules sont ajoutés route
+        par route. Si une ligne est invalide, aucun véhicule n'est ajouté.
+
+        Args:
+            ids (list | numpy.ndarray): identifiants des véhicules.
+            routes (list | numpy.ndarray): nom de la route de chaque véhicule.
+            positions (list | numpy.ndarray): positions initiales (m).
+            vitesses (list | numpy.ndarray): vitesses initiales (m/s).
+
+        Returns:
+            list: les véhicules créés, regroupés par route.
+
+        Raises:
+            ValueError: Si les colonnes n'ont pas la même longueur.
+            VehiculesInvalidesException: Si des lignes sont invalides (toutes
+                rapportées, avec leurs motifs).
+        """
+        ids, positions, vitesses = en_liste(ids), en_liste(positions), en_liste(vitesses)
+        groupes = valider_lot(ids, en_liste(routes), positions, vitesses, self.routes,
+                              self._index_vehicules)
+        vehicules = []
+        for nom, lignes in groupes.items():
+            vehicules.extend(self.routes[nom]._inserer_lot(
+                [ids[i] for i in lignes], [positions[i] for i in lignes],
+                [vitesses[i] for i in lignes]))
+        return vehicules
+
+    def get_vehicule(self, identifiant):
+        """Retourne le véhicule d'identifiant `identifiant`, quelle que soit sa route.
+
+        Args:
+            identifiant: identifiant du véhicule.
+
+        Returns:
+            Vehicule: le véhicule correspondant (sa route est `vehicule.route`).
+
+        Raises:
+            VehiculeInexistantException: Si aucun véhicule du réseau n'a cet identifiant.
+        """
+        vehicule = self._index_vehicules.get(identifiant)
+        if vehicule is None:
+            raise VehiculeInexistantException(str(identifiant))
+        return vehicule
+
+    def retirer_vehicule(self, identifiant):
+        """Retire du réseau le véhicule d'identifiant `identifiant`, en O(1).
+
+        Voir `Route.retirer_vehicule`.
+
+        Returns:
+            Vehicule: le véhicule retiré.
+
+        Raises:
+            VehiculeInexistantException: Si aucun véhicule du réseau n'a cet identifiant.
+        """
+        vehicule = self._index_vehicules.get(identifiant)
+        if vehicule is None:
+            raise VehiculeInexistantException(str(identifiant))
+        return vehicule.route.retirer_vehicule(identifiant)
 
     def get_route(self, nom):
         """Retourne la route nommée `nom` ou lève une exception si elle n'existe pas.
@@ -1,8 +1,12 @@
 from exceptions import (
     LongueurRouteInvalideException,
     RoutePleineException,
-    VehiculeDejaPresent
+    VehiculeDejaPresent,
+    VehiculeInexistantException
 )
+from .chargement import en_liste, valider_lot
+from .moteur_vectoriel import MoteurVectoriel
+from .vehicule import Vehicule
 
 
 class Route:
@@ -13,9 +17,11 @@ class Route:
         longueur (float): longueur en mètres
         limite_vitesse (float): limite de vitesse
         vehicules (list): véhicules présents sur la route
+        successeurs (list): routes pouvant suivre celle-ci (voir
+            `ReseauRoutier.connecter`)
     """
 
-    def __init__(self, nom, longueur, limite_vitesse, capacite_max=100):
+    def __init__(self, nom, longueur, limite_vitesse, capacite_max=100, vectoriel=False):
         """Crée une nouvelle route.
 
         Args:
@@ -23,10 +29,13 @@ class Route:
             longueur (float): longueur de la route en mètres.
             limite_vitesse (float): vitesse maximale autorisée.
             capacite_max (int): capacité maximale de véhicules (défaut: 100).
+            vectoriel (bool): si vrai, les véhicules sont stockés dans un
+                `MoteurVectoriel` (NumPy) et avancés en une seule opération.
             
         Raises:
             LongueurRouteInvalideException: Si la longueur est <= 0.
             ValueError: Si la limite de vitesse est négative.
+            ImportError: Si `vectoriel` est demandé sans NumPy installé.
         """
         # Validation de la longueur
         if longueur <= 0:
@@ -40,10 +49,40 @@ class Route:
         self.longueur = longueur
         self.limite_vitesse = limite_vitesse
         self.capacite_max = capacite_max
-        self.vehicules = []
+        self._vehicules = []
+        # index id -> emplacement dans self.vehicules (recherche et doublons en O(1))
+        self._index = {}
+        # vrai si des transferts par lot du moteur ont rendu la liste périmée
+        self._perime = False
+        # réseau propriétaire, renseigné par ReseauRoutier.ajouter_route
+        self._reseau = None
+        # routes suivantes (ReseauRoutier.connecter): le surplus y est transféré
+        self.successeurs = []
         # support pour un feu de circulation (objet FeuRouge et position)
         self.feu_rouge = None
         self.position_feu = None
+        # moteur vectoriel optionnel (voir models.moteur_vectoriel)
+        self._moteur = None
+        self._indice_moteur = None
+        if vectoriel:
+            # le moteur se lie à la route (renseigne _moteur et _indice_moteur)
+            MoteurVectoriel([self])
+
+    @property
+    def vehicules(self):
+        """Véhicules présents sur la route.
+
+        Après des transferts par lot (`MoteurVectoriel.deplacer`), la liste
+        et l'index sont reconstruits depuis la table du moteur à la première
+        lecture.
+        """
+        self._synchroniser()
+        return self._vehicules
+
+    def _synchroniser(self):
+        """Reconstruit liste et index s'ils sont périmés (voir `vehicules`)."""
+        if self._perime:
+            self._moteur.reconstruire_routes()
 
     def ajouter_vehicule(self, vehicule):
         """Ajoute un véhicule à la route.
@@ -53,19 +92,120 @@ class Route:
             
         Raises:
             RoutePleineException: Si la route a atteint sa capacité maximale.
-            VehiculeDejaPresent: Si le véhicule est déjà sur cette route.
+            VehiculeDejaPresent: Si le véhicule est déjà sur cette route (ou,
+                si la route appartient à un réseau, sur une autre route du réseau).
         """
+        self._synchroniser()
         # Vérifier si la route est pleine
         if len(self.vehicules) >= self.capacite_max:
             raise RoutePleineException(self.nom, self.capacite_max)
         
-        # Vérifier si le véhicule est déjà présent
-        for v in self.vehicules:
-            if v.id == vehicule.id:
-                raise VehiculeDejaPresent(str(vehicule.id), self.nom)
-        
+        # Vérifier si le véhicule est déjà présent (ici ou sur une autre route du réseau)
+        if vehicule.id in self._index:
+            raise VehiculeDejaPresent(str(vehicule.id), self.nom)
+        if self._reseau is not None:
+            self._reseau._indexer_vehicule(vehicule)
+
         # Ajouter le véhicule
+        self._index[vehicule.id] = len(self.vehicules)
         self.vehicules.append(vehicule)
+        if self._moteur is not None:
+            self._moteur.attacher(vehicule, self._indice_moteur)
+
+    def ajouter_vehicules_bulk(self, ids, positions, vitesses):
+        """Ajoute un lot de véhicules décrit par colonnes, validé en une passe.
+
+        Toutes les lignes sont contrôlées ensemble (voir
+        `models.chargement.valider_lot`); si l'une est invalide, aucun
+        véhicule n'est ajouté.
+
+        Args:
+            ids (list | numpy.ndarray): identifiants des véhicules.
+            positions (list | numpy.ndarray): positions initiales (m).
+            vitesses (list | numpy.ndarray): vitesses initiales (m/s).
+
+        Returns:
+            list: les véhicules créés, dans l'ordre du lot.
+
+        Raises:
+            ValueError: Si les colonnes n'ont pas la même longueur.
+            VehiculesInvalidesException: Si des lignes sont invalides (toutes
+                rapportées, avec leurs motifs).
+        """
+        ids, positions, vitesses = en_liste(ids), en_liste(positions), en_liste(vitesses)
+        self._synchroniser()
+        existants = self._reseau._index_vehicules if self._reseau is not None else self._index
+        valider_lot(ids, [self.nom] * len(ids), positions, vitesses, {self.nom: self}, existants)
+        return self._inserer_lot(ids, positions, vitesses)
+
+    def _inserer_lot(self, ids, positions, vitesses):
+        """Ajoute des véhicules déjà validés et met à jour index et moteur."""
+        debut = len(self.vehicules)
+        nouveaux = [Vehicule._creer(vid, self, position, vitesse)
+                    for vid, position, vitesse in zip(ids, positions, vitesses)]
+        slots = range(debut, debut + len(nouveaux))
+        self._index.update(zip(ids, slots))
+        if self._reseau is not None:
+            self._reseau._index_vehicules.update(zip(ids, nouveaux))
+        self.vehicules.extend(nouveaux)
+        if self._moteur is not None:
+            self._moteur.attacher_lot(nouveaux, self._indice_moteur)
+        return nouveaux
+
+    def retirer_vehicule(self, identifiant):
+        """Retire de la route le véhicule d'identifiant `identifiant`, en O(1).
+
+        Le dernier véhicule de la liste prend la place du véhicule retiré
+        (l'ordre de `vehicules` n'est donc pas conservé); index de la route,
+        index du réseau et moteur vectoriel sont mis à jour. Le véhicule
+        retiré garde sa position et sa vitesse courantes.
+
+        Args:
+            identifiant: identifiant du véhicule.
+
+        Returns:
+            Vehicule: le véhicule retiré.
+
+        Raises:
+            VehiculeInexistantException: Si le véhicule n'est pas sur la route.
+        """
+        self._synchroniser()
+        if identifiant not in self._index:
+            raise VehiculeInexistantException(str(identifiant), self.nom)
+        vehicule = self._retirer(identifiant)
+        if self._moteur is not None:
+            self._moteur.detacher(vehicule)
+        return vehicule
+
+    def _retirer(self, identifiant):
+        """Retire un véhicule de la liste et des index (échange avec le dernier)."""
+        slot = self._index.pop(identifiant)
+        vehicule = self.vehicules[slot]
+        dernier = self.vehicules.pop()
+        if dernier is not vehicule:
+            self.vehicules[slot] = dernier
+            self._index[dernier.id] = slot
+        if self._reseau is not None:
+            del self._reseau._index_vehicules[identifiant]
+        return vehicule
+
+    def get_vehicule(self, identifiant):
+        """Retourne le véhicule d'identifiant `identifiant` présent sur la route.
+
+        Args:
+            identifiant: identifiant du véhicule.
+
+        Returns:
+            Vehicule: le véhicule correspondant.
+
+        Raises:
+            VehiculeInexistantException: Si le véhicule n'est pas sur la route.
+        """
+        self._synchroniser()
+        slot = self._index.get(identifiant)
+        if slot is None:
+            raise VehiculeInexistantException(str(identifiant), self.nom)
+        return self.vehicules[slot]
 
     def ajouter_feu_rouge(self, feu, position=None):
         """Ajoute un feu rouge à la route à la position donnée.
@@ -83,6 +223,8 @@ class Route:
             position = self.longueur
         self.feu_rouge = feu
         self.position_feu = position
+        if self._moteur is not None:
+            self._moteur.synchroniser_feu(self._indice_moteur)
 
     def mettre_a_jour_vehicules(self, delta_t):
         """Met à jour la position de chaque véhicule pour un pas `delta_t`.
@@ -90,14 +232,19 @@ class Route:
         Args:
             delta_t (float): Intervalle de temps en secondes.
         """
-        try:
-            # Mettre à jour le feu s'il existe
-            if self.feu_rouge is not None:
-                try:
-                    self.feu_rouge.avancer_temps(delta_t)
-                except Exception:
-                    pass
+        # Mettre à jour le feu s'il existe
+        if self.feu_rouge is not None:
+            try:
+                self.feu_rouge.avancer_temps(delta_t)
+            except Exception:
+                pass
 
+        if self._moteur is not None:
+            # Mise à jour vectorisée: les véhicules sont des vues sur les tableaux du moteur
+            self._moteur.avancer(delta_t, self._indice_moteur)
+            return
+
+        try:
             for v in self.vehicules:
                 # si un feu est présent et rouge, empêcher de traverser la position
                 if self.feu_rouge is not None and self.feu_rouge.etat == 'rouge' and self.position_feu is not None:
@@ -35,15 +35,105 @@ class Vehicule:
         if route and position > route.longueur:
             raise PositionInvalideException(position, route.longueur, str(identifiant))
         
+        # moteur vectoriel éventuel: le véhicule devient une vue sur son emplacement
+        self._moteur = None
+        self._slot = None
+
         self.id = identifiant
         self.route = route
         self.position = position
         self.vitesse = vitesse
 
+    @classmethod
+    def _creer(cls, identifiant, route, position, vitesse):
+        """Construit un véhicule sans validation (valeurs déjà contrôlées par lot).
+
+        Utilisé par `Route.ajouter_vehicules_bulk` après `valider_lot`.
+        """
+        vehicule = cls.__new__(cls)
+        vehicule._moteur = None
+        vehicule._slot = None
+        vehicule.id = identifiant
+        vehicule._route = route
+        vehicule._position = position
+        vehicule._vitesse = vitesse
+        return vehicule
+
+    @property
+    def route(self):
+        """Route du véhicule, lue dans la colonne `indices_routes` s'il est attaché à un moteur.
+
+        Les transferts par lot du moteur (`MoteurVectoriel.deplacer`) changent
+        ainsi la route des véhicules sans les parcourir un à un. Affecter une
+        autre route à un véhicule attaché le fait passer d'une route à l'autre
+        (voir `_deplacer_vers`).
+        """
+        if self._moteur is None:
+            return self._route
+        return self._moteur.routes[self._moteur.indices_routes[self._slot]]
+
+    @route.setter
+    def route(self, valeur):
+        if self._moteur is not None and valeur is not self.route:
+            self._deplacer_vers(valeur)
+        else:
+            self._route = valeur
+
+    def _deplacer_vers(self, route):
+        """Fait passer un véhicule attaché à un moteur sur `route`.
+
+        Sa route étant une colonne du moteur, il est retiré de sa route
+        (`Route.retirer_vehicule`) puis ajouté à `route` (`ajouter_vehicule`):
+        listes, index et moteurs restent cohérents.
+
+        Raises:
+            RoutePleineException: Si `route` est pleine (le véhicule reste
+                alors sur sa route).
+            VehiculeDejaPresent: Si l'identifiant est déjà présent sur `route`.
+        """
+        ancienne = self.route
+        ancienne.retirer_vehicule(self.id)
+        self._route = route
+        try:
+            route.ajouter_vehicule(self)
+        except Exception:
+            self._route = ancienne
+            ancienne.ajouter_vehicule(self)
+            raise
+
+    @property
+    def position(self):
+        """Position actuelle (m), lue dans le moteur vectoriel si le véhicule y est attaché."""
+        if self._moteur is None:
+            return self._position
+        return float(self._moteur.positions[self._slot])
+
+    @position.setter
+    def position(self, valeur):
+        if self._moteur is None:
+            self._position = valeur
+        else:
+            self._moteur.positions[self._slot] = valeur
+
+    @property
+    def vitesse(self):
+        """Vitesse actuelle (m/s), lue dans le moteur vectoriel si le véhicule y est attaché."""
+        if self._moteur is None:
+            return self._vitesse
+        return float(self._moteur.vitesses[self._slot])
+
+    @vitesse.setter
+    def vitesse(self, valeur):
+        if self._moteur is None:
+            self._vitesse = valeur
+        else:
+            self._moteur.vitesses[self._slot] = valeur
+
     def avancer(self, delta_t):
         """Fait avancer le véhicule en fonction de sa vitesse pendant `delta_t`.
 
-        La position est bornée par la longueur de la route.
+        La position est bornée par la longueur de la route, sauf si la route
+        a des successeurs (voir `ReseauRoutier.transferer`).
         
         Args:
             delta_t (float): Intervalle de temps en secondes.
@@ -64,8 +154,12 @@ class Vehicule:
             if nouvelle_position < 0:
                 raise PositionInvalideException(nouvelle_position, self.route.longueur, str(self.id))
             
-            # Mise à jour de la position (bornée par la longueur de la route)
-            self.position = min(nouvelle_position, self.route.longueur)
+            # Mise à jour de la position (bornée par la longueur de la route,
+            # sauf si elle a des successeurs: ReseauRoutier.transferer reporte le surplus)
+            if getattr(self.route, "successeurs", None):
+                self.position = nouvelle_position
+            else:
+                self.position = min(nouvelle_position, self.route.longueur)
             
         except (VitesseNegativeException, PositionInvalideException):
             # Re-lever les exceptions personnalisées
@@ -78,7 +172,17 @@ class Vehicule:
                 str(self.id)
             ) from e
 
-    def changer_de_route(self, nouvelle_route):
-        """Change la route du véhicule et réinitialise sa position à 0."""
+    def changer_de_route(self, nouvelle_route, position=0):
+        """Change la route du véhicule et le place à `position` (0 par défaut).
+
+        Utilisé par `ReseauRoutier.transferer` avec la distance restante du
+        pas en cours. Ne modifie pas les listes de véhicules des routes, sauf
+        pour un véhicule attaché à un moteur vectoriel: il est alors retiré de
+        sa route et ajouté à `nouvelle_route` (voir `route`).
+
+        Raises:
+            RoutePleineException: Si le véhicule est attaché à un moteur et
+                que `nouvelle_route` est pleine.
+        """
         self.route = nouvelle_route
-        self.position = 0
+        self.position = position
@@ -0,0 +1,42 @@
+from io_pkg.affichage import Affichage
+
+
+class _ReseauEspion:
+    """Réseau minimal qui compte les appels à `etat_reseau`."""
+
+    def __init__(self):
+        self.appels = 0
+
+    def etat_reseau(self):
+        self.appels += 1
+        return {"R1": [("V1", 0.0)]}
+
+
+def test_mode_silencieux_ne_calcule_pas_l_etat(capsys):
+    """En mode headless, rien n'est affiché et `etat_reseau` n'est jamais appelé."""
+    affichage = Affichage(silencieux=True)
+    reseau = _ReseauEspion()
+    for t in range(10):
+        affichage.afficher_etat(t, reseau, {})
+    assert reseau.appels == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_affichage_limite_tous_les_n_tours(capsys):
+    """Avec `tous_les=3`, seuls les tours 0, 3, 6 et 9 sont rendus."""
+    affichage = Affichage(tous_les=3)
+    reseau = _ReseauEspion()
+    for t in range(10):
+        affichage.afficher_etat(t, reseau, {})
+    assert reseau.appels == 4
+    assert affichage.nb_rendus == 4
+    assert "--- Temps: 3 s ---" in capsys.readouterr().out
+
+
+def test_affichage_limite_par_intervalle():
+    """Un intervalle minimal très long ne laisse passer que le premier rendu."""
+    affichage = Affichage(intervalle_ms=60_000)
+    reseau = _ReseauEspion()
+    for t in range(5):
+        affichage.afficher_etat(t, reseau, {})
+    assert reseau.appels == 1
@@ -0,0 +1,120 @@
+import pytest
+
+from core.analyseur import Analyseur
+from core.simulateur import Simulateur
+from core.statistiques import StatistiquesWelford
+
+
+def test_welford_et_fusion():
+    """Ajout valeur par valeur, par lot et fusion donnent les mêmes moments."""
+    valeurs = [3.0, 7.0, 7.0, 19.0, 4.0]
+    seq = StatistiquesWelford()
+    for v in valeurs:
+        seq.ajouter(v)
+    a, b = StatistiquesWelford(), StatistiquesWelford()
+    a.ajouter_lot(valeurs[:2])
+    b.ajouter_lot(valeurs[2:])
+    a.fusionner(b)
+
+    assert seq.n == a.n == 5
+    assert seq.moyenne == pytest.approx(8.0) and a.moyenne == pytest.approx(8.0)
+    assert seq.variance == pytest.approx(32.8) and a.variance == pytest.approx(32.8)
+    assert (a.min, a.max) == (3.0, 19.0)
+
+
+def test_analyse_resumee_sans_liste_des_vitesses():
+    simu = Simulateur("data/config_reseau.json",
+                      analyseur=Analyseur(incremental=True, inclure_vitesses=False))
+    simu.lancer_simulation(2, 1.0)
+    stats = simu.analyseur.analyser(simu.reseau)
+
+    assert "vitesses" not in stats
+    assert stats["nb_vehicules"] == 2
+    assert stats["moyenne_vitesse"] == pytest.approx(11.0)
+    assert (stats["min_vitesse"], stats["max_vitesse"]) == (10, 12)
+    # deux tours de simulation + cet appel: 3 × 2 vitesses observées
+    assert stats["cumul"]["n"] == 6
+    assert stats["cumul"]["variance"] == pytest.approx(1.0)
+
+
+def test_analyse_resumee_depuis_la_table_du_moteur():
+    pytest.importorskip("numpy")
+    ref = Simulateur("data/config_reseau.json").analyseur.analyser(
+        Simulateur("data/config_reseau.json").reseau)
+    simu = Simulateur("data/config_reseau.json", moteur="reseau",
+                      analyseur=Analyseur(incremental=True))
+    stats = simu.analyseur.analyser(simu.reseau)
+
+    assert stats["vitesses"] == ref["vitesses"]
+    assert stats["moyenne_vitesse"] == pytest.approx(ref["moyenne_vitesse"])
+    assert stats["variance_vitesse"] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("moteur", ["python", "vectoriel", "reseau"])
+def test_agregats_par_route(moteur):
+    """Effectif, vitesse moyenne, densité et occupation de chaque route."""
+    if moteur != "python":
+        pytest.importorskip("numpy")
+    simu = Simulateur("data/config_reseau.json", moteur=moteur,
+                      analyseur=Analyseur(par_route=True))
+    routes = simu.analyseur.analyser(simu.reseau)["routes"]
+
+    assert routes["noms"] == ["R1", "R2"]
+    assert routes["nb_vehicules"] == [1, 1]
+    assert routes["moyenne_vitesse"] == [10.0, 12.0]
+    assert routes["densite"] == pytest.approx([1.0, 1.25])
+    assert routes["occupation"] == pytest.approx([0.01, 0.01])
+
+
+def test_quantiles_et_fusion_des_histogrammes():
+    """Quantiles approchés à une classe près; la fusion de tranches est exacte."""
+    pytest.importorskip("numpy")
+    from core.statistiques import HistogrammesVitesses
+
+    complet = HistogrammesVitesses(["R1", "R2"], vitesse_max=100.0, nb_classes=100)
+    complet.ajouter([0] * 100 + [1] * 100, list(range(100)) + [50.0] * 100)
+    tranche_1 = HistogrammesVitesses(["R1"], vitesse_max=100.0, nb_classes=100)
+    tranche_1.ajouter([0] * 100, list(range(100)))
+    tranche_2 = HistogrammesVitesses(["R2"], vitesse_max=100.0, nb_classes=100)
+    tranche_2.ajouter([0] * 100, [50.0] * 100)
+    fusion = tranche_1.fusionner(tranche_2)
+
+    assert fusion.noms == ["R1", "R2"]
+    assert (fusion.comptes == complet.comptes).all()
+    routes = fusion.quantiles_routes()
+    assert routes["p50"][0] == pytest.approx(50.0, abs=1.0)
+    assert routes["p90"][0] == pytest.approx(90.0, abs=1.0)
+    assert 50.0 <= routes["p99"][1] <= 51.0
+    relu = HistogrammesVitesses.depuis_dict(fusion.vers_dict())
+    assert relu.quantiles_reseau() == fusion.quantiles_reseau()
+
+
+def test_quantiles_dans_les_resultats(tmp_path):
+    pytest.importorskip("numpy")
+    simu = Simulateur("data/config_reseau.json", moteur="reseau",
+                      analyseur=Analyseur(quantiles=True))
+    simu.lancer_simulation(2, 1.0)
+    stats = simu.analyseur.analyser(simu.reseau)
+
+    assert 10.0 <= stats["quantiles_vitesse"]["p50"] <= 10.5
+    assert 12.0 <= stats["quantiles_vitesse"]["p99"] <= 12.5
+    assert simu.analyseur.histogrammes.comptes.sum() == 6
+    resultats = simu._resultats_finaux(stats)
+    assert resultats["quantiles_routes"]["noms"] == ["R1", "R2"]
+    assert resultats["histogrammes"]["nb_classes"] == 120
+
+
+@pytest.mark.parametrize("moteur", ["python", "vectoriel", "reseau"])
+def test_quantiles_par_route_a_chaque_tour(moteur):
+    """Chaque analyse porte les quantiles du tour par route, quel que soit le moteur."""
+    pytest.importorskip("numpy")
+    simu = Simulateur("data/config_reseau.json", moteur=moteur,
+                      analyseur=Analyseur(quantiles=True))
+    cadres = list(simu.iter_simulation(2, 1.0))
+
+    for cadre in cadres:
+        routes = cadre["stats"]["quantiles_vitesse_routes"]
+        assert routes["noms"] == ["R1", "R2"]
+        assert 10.0 <= routes["p50"][0] <= 10.5
+        assert 12.0 <= routes["p50"][1] <= 12.5
+    assert simu.analyseur.histogrammes.comptes.sum() == 4
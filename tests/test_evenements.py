@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from core.evenements import PlanificateurEvenements
+from core.simulateur import Simulateur
+from models.feu_rouge import FeuRouge
+from models.reseau import ReseauRoutier
+from models.route import Route
+from models.vehicule import Vehicule
+
+
+def _reseau(graine=7):
+    """Réseau de test: positions et vitesses entières pour des calculs exacts."""
+    rng = random.Random(graine)
+    reseau = ReseauRoutier()
+    for r in range(6):
+        route = Route(f"R{r}", longueur=rng.randint(100, 400), limite_vitesse=20)
+        if r % 2 == 0:
+            route.ajouter_feu_rouge(FeuRouge(cycle=rng.choice([2, 5, 7])))
+        for i in range(rng.randint(1, 6)):
+            route.ajouter_vehicule(Vehicule(f"V{r}_{i}", route,
+                                            position=rng.randint(0, route.longueur),
+                                            vitesse=rng.randint(0, 15)))
+        reseau.ajouter_route(route)
+    return reseau
+
+
+def test_avance_rapide_identique_au_pas_fixe():
+    """L'état final et les feux doivent être ceux obtenus tour par tour."""
+    ref = _reseau()
+    rapide = _reseau()
+    for _ in range(60):
+        for route in ref.routes.values():
+            route.mettre_a_jour_vehicules(1.0)
+
+    planificateur = PlanificateurEvenements(rapide, 1.0)
+    planificateur.avancer_jusqu_a(60)
+    planificateur.synchroniser()
+
+    for nom, route in ref.routes.items():
+        autre = rapide.routes[nom]
+        if route.feu_rouge is not None:
+            assert autre.feu_rouge.etat == route.feu_rouge.etat
+        for a, b in zip(route.vehicules, autre.vehicules):
+            assert b.position == pytest.approx(a.position)
+            assert b.vitesse == pytest.approx(a.vitesse)
+
+    # bien moins d'événements que de mises à jour individuelles
+    nb_vehicules = sum(len(r.vehicules) for r in ref.routes.values())
+    assert planificateur.nb_evenements < 60 * nb_vehicules
+
+
+def test_simulateur_evenements_instantanes():
+    """Les snapshots analytiques doivent égaler l'historique du pas fixe."""
+    ref = Simulateur("data/config_reseau.json")
+    rapide = Simulateur("data/config_reseau.json")
+    ref.lancer_simulation(5, 1.0)
+    nb = rapide.lancer_simulation_evenements(5, 1.0, instantanes=True)
+
+    assert rapide.historique == ref.historique
+    assert rapide.temps == ref.temps
+    assert nb == 0
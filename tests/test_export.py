@@ -0,0 +1,61 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.historique import HistoriqueColonnaire
+from core.simulateur import Simulateur
+from io_pkg import Export
+
+
+def test_export_npz_et_relecture(tmp_path):
+    """Historique et statistiques par tour se relisent sans analyse de texte."""
+    fichier = str(tmp_path / "resultats.npz")
+    simu = Simulateur("data/config_reseau.json")
+    simu.lancer_simulation(3, 1.0)
+    Export().exporter_binaire(fichier, simu.historique, simu.stats_tours)
+
+    charge = Export().charger_binaire(fichier)
+    assert isinstance(charge["historique"], HistoriqueColonnaire)
+    assert list(charge["historique"]) == simu.historique
+    assert charge["stats_tours"]["nb_vehicules"].tolist() == [2.0, 2.0, 2.0]
+    assert "vitesses" not in charge["stats_tours"]
+
+
+def test_export_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    fichier = str(tmp_path / "resultats.parquet")
+    simu = Simulateur("data/config_reseau.json", historique="colonnaire")
+    simu.lancer_simulation(2, 1.0)
+    Export().exporter_binaire(fichier, simu.historique, simu.stats_tours, format="parquet")
+
+    charge = Export().charger_binaire(fichier)
+    assert list(charge["historique"]) == list(simu.historique)
+    assert charge["stats_tours"]["moyenne_vitesse"].tolist() == [11.0, 11.0]
+
+
+@pytest.mark.parametrize("format", ["npz", "parquet"])
+def test_export_binaire_identifiants_entiers(tmp_path, format):
+    """Les identifiants entiers restent des entiers; les absences sont conservées."""
+    if format == "parquet":
+        pytest.importorskip("pyarrow")
+    historique = HistoriqueColonnaire()
+    historique.enregistrer_positions(1.0, {7: 10.0, 42: 5.0})
+    historique.enregistrer_positions(2.0, {42: 6.0, 3: 0.0})
+    historique.enregistrer_positions(3.0, {})
+    fichier = str(tmp_path / f"entiers.{format}")
+    Export().exporter_binaire(fichier, historique, [{"nb_vehicules": 2}] * 3, format=format)
+
+    charge = Export().charger_binaire(fichier)
+    assert charge["historique"].ids == [7, 42, 3]
+    assert list(charge["historique"]) == list(historique)
+    assert charge["stats_tours"]["nb_vehicules"].tolist() == [2.0, 2.0, 2.0]
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(fichier)
+        assert table.column_names == ["tour", "temps", "id", "position"]
+        assert table.num_rows == 4
+
+
+def test_export_binaire_format_inconnu(tmp_path):
+    with pytest.raises(ValueError):
+        Export().exporter_binaire(str(tmp_path / "x.bin"), format="hdf5")
@@ -0,0 +1,111 @@
+import csv
+import threading
+
+import pytest
+
+from core.simulateur import Simulateur
+from io_pkg import Affichage, ExportAsynchrone, FluxPositionsCSV
+
+
+class PuitsLent:
+    """Puits de test bloqué tant que `ouvert` n'est pas levé."""
+
+    def __init__(self):
+        self.ouvert = threading.Event()
+        self.cadres = []
+        self.ferme = False
+
+    def ecrire(self, cadre):
+        self.ouvert.wait()
+        self.cadres.append(cadre["tour"])
+
+    def vider(self):
+        pass
+
+    def fermer(self):
+        self.ferme = True
+
+
+class AffichageInterrompu(Affichage):
+    """Simule un Ctrl+C au tour `tour`."""
+
+    def __init__(self, tour):
+        super().__init__(silencieux=True)
+        self.tour = tour
+        self.appels = 0
+
+    def afficher_etat(self, temps, reseau, stats):
+        self.appels += 1
+        if self.appels == self.tour:
+            raise KeyboardInterrupt
+
+
+def test_contre_pression_mesuree():
+    """Une file pleine fait attendre le dépôt; tous les cadres sont écrits dans l'ordre."""
+    puits = PuitsLent()
+    export = ExportAsynchrone(puits, taille_file=1)
+    minuteur = threading.Timer(0.05, puits.ouvert.set)
+    minuteur.start()
+    for tour in range(1, 5):
+        export.ecrire({"tour": tour})
+    export.fermer()
+
+    assert puits.cadres == [1, 2, 3, 4]
+    assert puits.ferme
+    metriques = export.metriques()
+    assert metriques["nb_cadres"] == 4
+    assert metriques["nb_attentes"] >= 1
+    assert metriques["temps_attente"] > 0
+
+
+def test_sortie_partielle_durable_sur_interruption(tmp_path):
+    """Sur KeyboardInterrupt, les cadres déjà produits sont écrits sur disque."""
+    chemin = str(tmp_path / "positions.csv")
+    export = ExportAsynchrone(FluxPositionsCSV(chemin))
+    simu = Simulateur("data/config_reseau.json", affichage=AffichageInterrompu(3),
+                      puits=[export])
+    with pytest.raises(KeyboardInterrupt):
+        simu.lancer_simulation(5, 1.0, historique=False)
+
+    # vidé par le simulateur, avant même la fermeture
+    with open(chemin, newline="", encoding="utf-8") as f:
+        assert len(list(csv.reader(f))) == 1 + 2 * 2
+    export.fermer()
+
+
+def test_erreur_du_puits_relevee():
+    class PuitsDefaillant(PuitsLent):
+        def ecrire(self, cadre):
+            raise OSError("disque plein")
+
+    puits = PuitsDefaillant()
+    puits.ouvert.set()
+    export = ExportAsynchrone(puits)
+    export.ecrire({"tour": 1})
+    with pytest.raises(RuntimeError, match="1 cadre"):
+        export.vider()
+    # l'erreur reste levée: plus aucun cadre n'est accepté, ni perdu en silence
+    with pytest.raises(RuntimeError):
+        export.ecrire({"tour": 2})
+    with pytest.raises(RuntimeError):
+        export.fermer()
+    assert puits.ferme
+    assert export.metriques()["nb_abandons"] == 1
+
+
+def test_cadres_en_file_apres_erreur_comptes():
+    """Les cadres déjà en file lors d'une erreur sont comptés comme non écrits."""
+    class PuitsDefaillant(PuitsLent):
+        def ecrire(self, cadre):
+            self.ouvert.wait()
+            raise OSError("disque plein")
+
+    puits = PuitsDefaillant()
+    export = ExportAsynchrone(puits)
+    for tour in range(1, 4):
+        export.ecrire({"tour": tour})
+    puits.ouvert.set()
+    with pytest.raises(RuntimeError, match="3 cadre"):
+        export.vider()
+    with pytest.raises(RuntimeError, match="3 cadre"):
+        export.fermer()
@@ -0,0 +1,111 @@
+import json
+import sqlite3
+
+import pytest
+
+from core.simulateur import Simulateur
+from io_pkg import ExportAsynchrone, ExportSQLite
+
+
+def test_export_sqlite_par_lots(tmp_path):
+    """Deux exécutions partagent une base; les tours sont écrits par transaction."""
+    chemin = str(tmp_path / "runs.db")
+    for run_id in ("a", "b"):
+        with ExportSQLite(chemin, run_id=run_id, tours_par_transaction=2) as base:
+            simu = Simulateur("data/config_reseau.json", puits=[base])
+            simu.lancer_simulation(3, 1.0, historique=False)
+            assert base.trajectoire("V1") == [(1.0, 10.0), (2.0, 20.0), (3.0, 30.0)]
+
+    connexion = sqlite3.connect(chemin)
+    try:
+        assert connexion.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert connexion.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+        assert connexion.execute(
+            "SELECT COUNT(*) FROM trajectoires WHERE run_id = 'b'").fetchone()[0] == 6
+        assert connexion.execute(
+            "SELECT nb_vehicules FROM stats WHERE run_id = 'a' AND tour = 3").fetchone()[0] == 2
+    finally:
+        connexion.close()
+
+
+def test_export_sqlite_asynchrone(tmp_path):
+    """Le fil d'écriture de ExportAsynchrone peut alimenter une base SQLite."""
+    chemin = str(tmp_path / "runs.db")
+    base = ExportSQLite(chemin, run_id="async", tours_par_transaction=2)
+    export = ExportAsynchrone(base, taille_file=1)
+    simu = Simulateur("data/config_reseau.json", puits=[export])
+    simu.lancer_simulation(3, 1.0, historique=False)
+    assert export.nb_abandons == 0
+    assert base.trajectoire("V1") == [(1.0, 10.0), (2.0, 20.0), (3.0, 30.0)]
+    export.fermer()
+
+    connexion = sqlite3.connect(chemin)
+    try:
+        assert connexion.execute("SELECT COUNT(*) FROM stats").fetchone()[0] == 3
+    finally:
+        connexion.close()
+
+
+def _compter(chemin, table):
+    connexion = sqlite3.connect(chemin)
+    try:
+        return connexion.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        connexion.close()
+
+
+def _cadre(tour):
+    return {"tour": tour, "temps": float(tour), "stats": {"nb_vehicules": 1},
+            "positions": {"V1": 10.0 * tour}}
+
+
+def test_transaction_tous_les_n_tours(tmp_path):
+    """Les lignes ne sont visibles qu'une fois le lot de tours validé."""
+    chemin = str(tmp_path / "runs.db")
+    with ExportSQLite(chemin, tours_par_transaction=3) as base:
+        base.ecrire(_cadre(1))
+        base.ecrire(_cadre(2))
+        assert _compter(chemin, "stats") == 0
+        base.ecrire(_cadre(3))
+        assert _compter(chemin, "stats") == 3
+        base.ecrire(_cadre(4))
+        assert _compter(chemin, "trajectoires") == 3
+    assert _compter(chemin, "trajectoires") == 4
+
+
+def test_reouverture_ajoute_une_execution(tmp_path):
+    """Rouvrir une base existante ajoute une exécution sans toucher aux précédentes."""
+    chemin = str(tmp_path / "runs.db")
+    with ExportSQLite(chemin, run_id="a", tours_par_transaction=1) as base:
+        base.ecrire(_cadre(1))
+        base.enregistrer_resultats({"nb_vehicules": 1})
+    with ExportSQLite(chemin, run_id="b", tours_par_transaction=1) as base:
+        base.ecrire(_cadre(1))
+        base.ecrire(_cadre(2))
+        assert base.trajectoire("V1", run_id="a") == [(1.0, 10.0)]
+        assert base.trajectoire("V1") == [(1.0, 10.0), (2.0, 20.0)]
+    assert _compter(chemin, "runs") == 2
+    with pytest.raises(sqlite3.IntegrityError):
+        ExportSQLite(chemin, run_id="a")
+
+    connexion = sqlite3.connect(chemin)
+    try:
+        resultats = connexion.execute("SELECT resultats FROM runs WHERE run_id = 'a'").fetchone()[0]
+        assert json.loads(resultats) == {"nb_vehicules": 1}
+    finally:
+        connexion.close()
+
+
+def test_index_declares(tmp_path):
+    """Les index sur (run_id, temps) et (run_id, vehicule_id) sont créés."""
+    chemin = str(tmp_path / "runs.db")
+    ExportSQLite(chemin).fermer()
+    connexion = sqlite3.connect(chemin)
+    try:
+        index = {nom: table for nom, table in connexion.execute(
+            "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index'")}
+    finally:
+        connexion.close()
+    assert index["idx_stats_run_temps"] == "stats"
+    assert index["idx_trajectoires_run_temps"] == "trajectoires"
+    assert index["idx_trajectoires_run_vehicule"] == "trajectoires"
@@ -1,3 +1,5 @@
+import pytest
+
 from models.feu_rouge import FeuRouge
 
 
@@ -11,3 +13,18 @@ def test_cycle_du_feu():
     assert feu.etat == 'orange'
     feu.avancer_temps(1)
     assert feu.etat == 'rouge'
+
+
+def test_temps_avant_changement_et_reprise():
+    """Le temps restant est exposé et un feu peut être recréé en cours de cycle."""
+    feu = FeuRouge(cycle=4)
+    feu.avancer_temps(5)
+    assert feu.etat == 'vert'
+    assert feu.temps_ecoule == 1
+    assert feu.temps_avant_changement() == 3
+
+    copie = FeuRouge(feu.cycle, feu.etat, feu.temps_ecoule)
+    copie.avancer_temps(3)
+    assert copie.etat == 'orange'
+    with pytest.raises(ValueError):
+        FeuRouge(4, etat='bleu')
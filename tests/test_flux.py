@@ -0,0 +1,84 @@
+import csv
+import gzip
+import lzma
+
+import pytest
+
+from core.simulateur import Simulateur
+from io_pkg import FluxPositionsCSV
+
+
+def _lire(chemin):
+    with open(chemin, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_flux_long_pendant_la_simulation(tmp_path):
+    """Le flux écrit chaque tour pendant le run, sans historique en mémoire."""
+    chemin = str(tmp_path / "positions.csv")
+    with FluxPositionsCSV(chemin) as flux:
+        simu = Simulateur("data/config_reseau.json", puits=[flux])
+        simu.lancer_simulation(2, 1.0, historique=False)
+
+    lignes = _lire(chemin)
+    assert simu.historique == []
+    assert lignes[0] == ["temps", "vehicule_id", "position"]
+    assert lignes[1:] == [["1.0", "V1", "10.0"], ["1.0", "V2", "112.0"],
+                          ["2.0", "V1", "20.0"], ["2.0", "V2", "124.0"]]
+
+
+def test_flux_large_avec_identifiants_declares(tmp_path):
+    """Au format large, un véhicule absent laisse une cellule vide."""
+    chemin = str(tmp_path / "positions.csv")
+    with FluxPositionsCSV(chemin, format="large", ids=["V1", "V2"]) as flux:
+        flux.ecrire_positions(1.0, {"V1": 10.0})
+        flux.ecrire_positions(2.0, {"V1": 20.0, "V2": 5.0})
+        with pytest.raises(ValueError):
+            flux.ecrire_positions(3.0, {"V3": 1.0})
+
+    assert _lire(chemin) == [["temps", "V1", "V2"], ["1.0", "10.0", ""], ["2.0", "20.0", "5.0"]]
+
+
+def test_flux_large_sans_identifiants(tmp_path):
+    with pytest.raises(ValueError):
+        FluxPositionsCSV(str(tmp_path / "positions.csv"), format="large")
+
+
+@pytest.mark.parametrize("compression, ouvrir", [(None, open), ("gzip", gzip.open),
+                                                 ("lzma", lzma.open)])
+def test_tracer_positions_format_long(tmp_path, compression, ouvrir):
+    """Le format long ne contient que les véhicules présents, avec route et vitesse."""
+    chemin = str(tmp_path / "trajectoires.csv")
+    simu = Simulateur("data/config_reseau.json", trajectoires=True)
+    simu.lancer_simulation(2, 1.0)
+    simu.tracer_positions(format="long", compression=compression, chemin=chemin)
+
+    with ouvrir(chemin, "rt", newline="", encoding="utf-8") as f:
+        lignes = list(csv.reader(f))
+    assert lignes[0] == ["temps", "id", "route", "position", "vitesse"]
+    assert lignes[1] == ["1.0", "V1", "R1", "10.0", "10"]
+    assert len(lignes) == 5
+
+
+def test_format_long_exige_les_trajectoires(tmp_path):
+    """Sans routes par tour, le format long est refusé sur un réseau à connexions."""
+    import json
+
+    config = json.loads(open("data/config_reseau.json", encoding="utf-8").read())
+    config["connexions"] = [{"de": "R1", "vers": "R2"}]
+    fichier = tmp_path / "connexions.json"
+    fichier.write_text(json.dumps(config))
+    simu = Simulateur(str(fichier))
+    simu.lancer_simulation(1, 1.0)
+    with pytest.raises(ValueError):
+        simu.tracer_positions(format="long", chemin=str(tmp_path / "positions.csv"))
+    with pytest.raises(ValueError):
+        Simulateur("data/config_reseau.json", historique="colonnaire", trajectoires=True)
+
+
+def test_tracer_positions_format_inconnu():
+    simu = Simulateur("data/config_reseau.json")
+    with pytest.raises(ValueError):
+        simu.tracer_positions(format="xml")
+    with pytest.raises(ValueError):
+        simu.tracer_positions(compression="zip")
@@ -0,0 +1,88 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from models.reseau import ReseauRoutier
+from models.route import Route
+
+
+def _reseau():
+    """A -> B, A -> C, B -> C, C -> A, et D isolée."""
+    reseau = ReseauRoutier()
+    for nom, longueur, limite in (("A", 100, 20), ("B", 50, 10), ("C", 80, 30), ("D", 10, 5)):
+        reseau.ajouter_route(Route(nom, longueur=longueur, limite_vitesse=limite))
+    for origine, destination in (("A", "B"), ("A", "C"), ("B", "C"), ("C", "A")):
+        reseau.connecter(origine, destination)
+    return reseau
+
+
+def test_graphe_csr():
+    """Successeurs et prédécesseurs sont rangés en lignes compressées."""
+    graphe = _reseau().compiler_graphe()
+    assert graphe.noms == ["A", "B", "C", "D"]
+    assert graphe.succ_indptr.tolist() == [0, 2, 3, 4, 4]
+    assert graphe.succ_indices.tolist() == [1, 2, 2, 0]
+    assert graphe.pred_indptr.tolist() == [0, 1, 2, 4, 4]
+    assert graphe.predecesseurs(graphe.indices["C"]).tolist() == [0, 1]
+    assert graphe.degres_sortants.tolist() == [2, 1, 1, 0]
+    assert graphe.longueurs.tolist() == [100, 50, 80, 10]
+    assert graphe.limites.tolist() == [20, 10, 30, 5]
+    assert graphe.nb_connexions == 4
+
+
+def test_graphe_suit_l_ordre_du_moteur_et_est_invalide():
+    """Les identifiants du graphe sont ceux du moteur; une connexion invalide la vue."""
+    reseau = _reseau()
+    routes = reseau.routes
+    reseau.compiler_moteur([routes["D"], routes["C"], routes["B"], routes["A"]])
+    graphe = reseau.compiler_graphe()
+    assert graphe.noms == ["D", "C", "B", "A"]
+    assert graphe.successeurs(3).tolist() == [2, 1]
+
+    reseau.connecter("D", "A")
+    assert reseau.graphe is None
+    assert reseau.compiler_graphe().successeurs(0).tolist() == [3]
+
+
+@pytest.mark.parametrize("compile", [False, True])
+def test_rotation_entre_successeurs(compile):
+    """Les sortants d'une route sont répartis à tour de rôle, avec ou sans moteur."""
+    reseau = ReseauRoutier()
+    for nom in ("A", "B", "C"):
+        reseau.ajouter_route(Route(nom, longueur=100, limite_vitesse=30))
+    reseau.connecter("A", "B")
+    reseau.connecter("A", "C")
+    reseau.charger_vehicules(["V1", "V2", "V3", "V4", "V5"], ["A"] * 5,
+                             [90, 91, 92, 93, 10], [20, 20, 20, 20, 20])
+    if compile:
+        reseau.compiler_moteur()
+        reseau.mettre_a_jour(1.0)
+    else:
+        for route in reseau.routes.values():
+            route.mettre_a_jour_vehicules(1.0)
+        reseau.transferer()
+
+    # sortants rangés du plus grand au plus petit dépassement: V4, V3, V2, V1
+    assert sorted(v.id for v in reseau.routes["B"].vehicules) == ["V2", "V4"]
+    assert sorted(v.id for v in reseau.routes["C"].vehicules) == ["V1", "V3"]
+    assert reseau.get_vehicule("V4").position == pytest.approx(13)
+    assert [v.id for v in reseau.routes["A"].vehicules] == ["V5"]
+
+
+def test_rotation_conservee_apres_invalidation():
+    """La rotation tenue par le graphe compilé survit à son invalidation."""
+    reseau = ReseauRoutier()
+    for nom in ("A", "B", "C", "D"):
+        reseau.ajouter_route(Route(nom, longueur=100, limite_vitesse=30))
+    reseau.connecter("A", "B")
+    reseau.connecter("A", "C")
+    reseau.charger_vehicules(["V1", "V2"], ["A", "A"], [95, 50], [10, 10])
+    reseau.compiler_moteur()
+    reseau.mettre_a_jour(1.0)
+    assert reseau.get_vehicule("V1").route.nom == "B"
+
+    reseau.connecter("D", "A")
+    assert reseau.graphe is None
+    for _ in range(5):
+        reseau.mettre_a_jour(1.0)
+    assert reseau.get_vehicule("V2").route.nom == "C"
@@ -0,0 +1,86 @@
+import csv
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.historique import HistoriqueColonnaire, HistoriqueMemmap
+from core.simulateur import Simulateur
+
+
+def test_enregistrement_et_arrivee_en_cours_de_route():
+    """Un véhicule apparu en cours de route a des NaN avant son arrivée."""
+    hist = HistoriqueColonnaire(taille_bloc=2, nb_colonnes=1)
+    hist.enregistrer_positions(1.0, {"V1": 10.0})
+    hist.enregistrer_positions(2.0, {"V1": 20.0, "V2": 5.0})
+    hist.enregistrer_positions(3.0, {"V2": 7.0})
+
+    assert len(hist) == 3
+    assert hist.ids == ["V1", "V2"]
+    assert list(hist.temps) == [1.0, 2.0, 3.0]
+    assert np.isnan(hist.positions_vehicule("V2")[0])
+    assert list(hist.positions_vehicule("V2")[1:]) == [5.0, 7.0]
+    assert hist[2] == {"temps": 3.0, "positions": {"V2": 7.0}}
+
+
+def test_historique_colonnaire_identique_a_la_liste():
+    """Les modes "liste" et "colonnaire" (y compris via la table du moteur) concordent."""
+    ref = Simulateur("data/config_reseau.json")
+    col = Simulateur("data/config_reseau.json", historique="colonnaire")
+    col_reseau = Simulateur("data/config_reseau.json", moteur="reseau", historique="colonnaire")
+    for simu in (ref, col, col_reseau):
+        simu.lancer_simulation(4, 1.0)
+
+    assert list(col.historique) == ref.historique
+    assert list(col_reseau.historique) == ref.historique
+
+
+def test_tracer_positions_depuis_historique_colonnaire():
+    """`tracer_positions` lit directement la matrice colonnaire."""
+    simu = Simulateur("data/config_reseau.json", historique="colonnaire")
+    simu.lancer_simulation(2, 1.0)
+    simu.tracer_positions()
+    try:
+        with open("data/positions.csv", newline="", encoding="utf-8") as f:
+            lignes = list(csv.reader(f))
+        assert lignes[0] == ["temps", "V1", "V2"]
+        assert [float(x) for x in lignes[2]] == [2.0, 20.0, 124.0]
+    finally:
+        os.remove("data/positions.csv")
+
+
+def test_historique_memmap_agrandi_et_relu(tmp_path):
+    """Le fichier grandit par blocs (lignes et colonnes) et se relit en accès direct."""
+    chemin = str(tmp_path / "historique.bin")
+    hist = HistoriqueMemmap(chemin, nb_colonnes=1, taille_bloc=2)
+    for tour in range(5):
+        positions = {"V1": 10.0 * tour}
+        if tour >= 3:
+            positions["V2"] = float(tour)
+        hist.enregistrer_positions(float(tour), positions)
+    hist.fermer()
+
+    relu = HistoriqueMemmap.ouvrir(chemin)
+    assert len(relu) == 5
+    assert relu.ids == ["V1", "V2"]
+    assert list(relu.positions_vehicule("V1")) == [0.0, 10.0, 20.0, 30.0, 40.0]
+    temps, positions = relu.lire(slice(3, 5), vehicules=["V2"])
+    assert list(temps) == [3.0, 4.0]
+    assert positions.tolist() == [[3.0], [4.0]]
+    assert relu[1] == {"temps": 1.0, "positions": {"V1": 10.0}}
+    with pytest.raises(RuntimeError):
+        relu.enregistrer_positions(5.0, {"V1": 50.0})
+
+
+def test_simulateur_historique_memmap(tmp_path):
+    """Le mode "memmap" enregistre les mêmes snapshots que la liste."""
+    chemin = str(tmp_path / "historique.bin")
+    ref = Simulateur("data/config_reseau.json")
+    simu = Simulateur("data/config_reseau.json", moteur="reseau", historique="memmap",
+                      fichier_historique=chemin)
+    for s in (ref, simu):
+        s.lancer_simulation(3, 1.0)
+
+    assert list(simu.historique) == ref.historique
+    assert list(HistoriqueMemmap.ouvrir(chemin)) == ref.historique
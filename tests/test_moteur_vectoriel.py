@@ -0,0 +1,299 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.simulateur import Simulateur
+from exceptions import RoutePleineException, VitesseNegativeException
+from models.feu_rouge import FeuRouge
+from models.route import Route
+from models.vehicule import Vehicule
+
+
+def _route_peuplee(vectoriel, graine=0, n=200):
+    """Crée une route avec feu et `n` véhicules pseudo-aléatoires."""
+    rng = random.Random(graine)
+    route = Route("R", longueur=500, limite_vitesse=30, capacite_max=n, vectoriel=vectoriel)
+    route.ajouter_feu_rouge(FeuRouge(cycle=3), position=250)
+    for i in range(n):
+        v = Vehicule(f"V{i}", route, position=rng.uniform(0, 500), vitesse=rng.uniform(0, 30))
+        route.ajouter_vehicule(v)
+    return route
+
+
+def test_moteur_vectoriel_equivalent_boucle_python():
+    """Le moteur vectoriel doit produire les mêmes positions et vitesses que la boucle Python."""
+    ref = _route_peuplee(vectoriel=False)
+    vec = _route_peuplee(vectoriel=True)
+
+    for _ in range(20):
+        ref.mettre_a_jour_vehicules(0.5)
+        vec.mettre_a_jour_vehicules(0.5)
+
+    for a, b in zip(ref.vehicules, vec.vehicules):
+        assert a.id == b.id
+        assert b.position == pytest.approx(a.position)
+        assert b.vitesse == pytest.approx(a.vitesse)
+
+
+def test_vehicules_sont_des_vues_sur_le_moteur():
+    """Lire ou écrire un `Vehicule` attaché doit passer par les tableaux du moteur."""
+    route = Route("R", longueur=100, limite_vitesse=20, vectoriel=True)
+    v = Vehicule("V1", route, position=10, vitesse=5)
+    route.ajouter_vehicule(v)
+
+    route.mettre_a_jour_vehicules(2)
+    assert v.position == 20.0
+    assert route._moteur.positions[v._slot] == 20.0
+
+    v.vitesse = 50
+    route.mettre_a_jour_vehicules(10)
+    # bornée par la longueur de la route
+    assert v.position == 100.0
+
+
+def test_moteur_vectoriel_vitesse_negative():
+    """Une vitesse négative doit lever VitesseNegativeException comme en mode Python."""
+    route = Route("R", longueur=100, limite_vitesse=20, vectoriel=True)
+    v = Vehicule("V1", route, position=10, vitesse=5)
+    route.ajouter_vehicule(v)
+    v.vitesse = -1
+
+    with pytest.raises(VitesseNegativeException):
+        route.mettre_a_jour_vehicules(1)
+
+
+def test_simulateur_moteur_vectoriel():
+    """Le simulateur en mode vectoriel doit donner les mêmes positions qu'en mode Python."""
+    ref = Simulateur("data/config_reseau.json")
+    vec = Simulateur("data/config_reseau.json", moteur="vectoriel")
+    ref.lancer_simulation(3, 1.0)
+    vec.lancer_simulation(3, 1.0)
+    assert vec.historique == ref.historique
+
+
+def _reseau_peuple(graine=1, nb_routes=30):
+    """Crée un réseau de petites routes (certaines avec feu) et leurs véhicules."""
+    from models.reseau import ReseauRoutier
+
+    rng = random.Random(graine)
+    reseau = ReseauRoutier()
+    for r in range(nb_routes):
+        route = Route(f"R{r}", longueur=rng.uniform(50, 300), limite_vitesse=20)
+        if r % 3 == 0:
+            route.ajouter_feu_rouge(FeuRouge(cycle=rng.choice([1, 2, 4])))
+        for i in range(rng.randint(0, 8)):
+            route.ajouter_vehicule(Vehicule(f"V{r}_{i}", route,
+                                            position=rng.uniform(0, route.longueur),
+                                            vitesse=rng.uniform(0, 25)))
+        reseau.ajouter_route(route)
+    return reseau
+
+
+def test_moteur_reseau_equivalent_mise_a_jour_par_route():
+    """Un pas global sur le réseau compilé doit égaler la mise à jour route par route."""
+    ref = _reseau_peuple()
+    glob = _reseau_peuple()
+    moteur = glob.compiler_moteur()
+    assert moteur.n == sum(len(r.vehicules) for r in ref.routes.values())
+
+    for _ in range(15):
+        for route in ref.routes.values():
+            route.mettre_a_jour_vehicules(0.7)
+        glob.mettre_a_jour(0.7)
+
+    for nom, route in ref.routes.items():
+        for a, b in zip(route.vehicules, glob.routes[nom].vehicules):
+            assert b.position == pytest.approx(a.position)
+            assert b.vitesse == pytest.approx(a.vitesse)
+
+
+def test_simulateur_moteur_reseau():
+    """Le mode "reseau" du simulateur doit reproduire l'historique du mode Python."""
+    ref = Simulateur("data/config_reseau.json")
+    glob = Simulateur("data/config_reseau.json", moteur="reseau")
+    assert glob.reseau.moteur is not None
+    ref.lancer_simulation(3, 1.0)
+    glob.lancer_simulation(3, 1.0)
+    assert glob.historique == ref.historique
+
+
+def test_chargement_par_lot_dans_le_moteur():
+    """Un lot ajouté à une route vectorielle est rangé en colonnes et les véhicules en sont des vues."""
+    route = Route("R", longueur=500, limite_vitesse=30, capacite_max=1000, vectoriel=True)
+    n = 300
+    ids = np.array([f"V{i}" for i in range(n)], dtype=object)
+    vehicules = route.ajouter_vehicules_bulk(ids, np.linspace(0, 400, n), np.full(n, 10.0))
+    moteur = route._moteur
+    assert moteur.n == n
+    assert list(moteur.ids[:n]) == list(ids)
+    route.mettre_a_jour_vehicules(1.0)
+    assert vehicules[0].position == 10.0
+    assert vehicules[-1].position == 410.0
+    assert route.get_vehicule("V299") is vehicules[-1]
+
+
+def test_retrait_garde_les_colonnes_denses():
+    """Entrées et sorties répétées: colonnes denses, vues cohérentes, capacité réutilisée."""
+    from models.reseau import ReseauRoutier
+
+    reseau = ReseauRoutier()
+    for nom in ("R1", "R2"):
+        reseau.ajouter_route(Route(nom, longueur=1000, limite_vitesse=30, capacite_max=500))
+    n = 200
+    reseau.charger_vehicules([f"V{i}" for i in range(n)], ["R1", "R2"] * (n // 2),
+                             np.arange(n, dtype=float), np.ones(n))
+    moteur = reseau.compiler_moteur()
+    capacite = len(moteur.positions)
+    rng = random.Random(1)
+    sortis = []
+    for _ in range(1000):
+        if sortis and rng.random() < 0.5:
+            v = sortis.pop(rng.randrange(len(sortis)))
+            reseau.routes[rng.choice(["R1", "R2"])].ajouter_vehicule(v)
+        else:
+            sortis.append(reseau.retirer_vehicule(rng.choice(moteur.ids[:moteur.n])))
+
+    assert moteur.n == n - len(sortis)
+    assert len(moteur.positions) == capacite
+    for slot, vue in enumerate(moteur.vues):
+        assert vue._slot == slot and moteur.ids[slot] == vue.id
+        assert reseau._index_vehicules[vue.id] is vue
+        assert moteur.routes[moteur.indices_routes[slot]] is vue.route
+        assert vue.route.get_vehicule(vue.id) is vue
+    assert moteur.occupation.tolist() == [len(r.vehicules) for r in moteur.routes]
+    avant = {v.id: v.position for v in moteur.vues}
+    reseau.mettre_a_jour(1.0)
+    assert all(v.position == avant[v.id] + 1 for v in moteur.vues)
+    assert all(v._moteur is None for v in sortis)
+
+
+def test_transferts_identiques_entre_moteurs(tmp_path):
+    """Anneau et impasse: les trois moteurs font les mêmes passages de route."""
+    import json
+
+    rng = random.Random(3)
+    routes = [{"nom": f"R{i}", "longueur": rng.randint(20, 200), "limite_vitesse": 30}
+              for i in range(8)]
+    connexions = [{"de": f"R{i}", "vers": f"R{(i + 1) % 6}"} for i in range(6)]
+    connexions.append({"de": "R6", "vers": "R7"})
+    vehicules = []
+    for i in range(120):
+        route = rng.choice(routes)
+        vehicules.append({"id": f"V{i}", "route": route["nom"],
+                          "position": rng.randint(0, route["longueur"]),
+                          "vitesse": rng.randint(0, 40)})
+    fichier = tmp_path / "anneau.json"
+    fichier.write_text(json.dumps({"routes": routes, "connexions": connexions,
+                                   "vehicules": vehicules}))
+
+    etats = []
+    for moteur in ("python", "vectoriel", "reseau"):
+        sim = Simulateur(str(fichier), moteur=moteur)
+        for tour in range(40):
+            sim._avancer_reseau(0.5, tour)
+        etats.append({v.id: (v.route.nom, v.position)
+                      for route in sim.reseau.routes.values() for v in route.vehicules})
+
+    assert len(etats[0]) == 120
+    for etat in etats[1:]:
+        assert etat.keys() == etats[0].keys()
+        for vid, (nom, position) in etat.items():
+            assert nom == etats[0][vid][0]
+            assert position == pytest.approx(etats[0][vid][1])
+    # des véhicules ont quitté leur route de départ; l'impasse R7 les retient à son bout
+    assert any(etats[0][v["id"]][0] != v["route"] for v in vehicules)
+    assert any(v["route"] == "R6" and etats[0][v["id"]] == ("R7", routes[7]["longueur"])
+               for v in vehicules)
+
+
+def test_transferts_avec_embranchements_identiques(tmp_path):
+    """Embranchements et capacités limitées: même historique pour les trois moteurs."""
+    import json
+
+    rng = random.Random(5)
+    routes = [{"nom": f"R{i}", "longueur": rng.randint(20, 120), "limite_vitesse": 30,
+               "capacite_max": 12} for i in range(6)]
+    connexions = [{"de": de, "vers": vers} for de, vers in (
+        ("R0", "R1"), ("R0", "R2"), ("R0", "R3"), ("R1", "R4"), ("R2", "R4"),
+        ("R3", "R0"), ("R4", "R0"), ("R4", "R5"), ("R5", "R1"), ("R5", "R3"))]
+    vehicules = []
+    for i in range(60):
+        route = routes[i % 6]
+        vehicules.append({"id": f"V{i}", "route": route["nom"],
+                          "position": rng.randint(0, route["longueur"]),
+                          "vitesse": rng.choice([10, 25, 40, 90])})
+    fichier = tmp_path / "embranchements.json"
+    fichier.write_text(json.dumps({"routes": routes, "connexions": connexions,
+                                   "vehicules": vehicules}))
+
+    historiques = []
+    for moteur in ("python", "vectoriel", "reseau"):
+        sim = Simulateur(str(fichier), moteur=moteur, trajectoires=True)
+        sim.lancer_simulation(30, 1.0)
+        historiques.append(sim.historique)
+        assert all(len(r.vehicules) <= 12 for r in sim.reseau.routes.values())
+
+    assert historiques[1] == historiques[0]
+    assert historiques[2] == historiques[0]
+    # les routes pleines ont bien retenu des véhicules au bout de leur route
+    assert any(position == routes[int(instantane["routes"][vid][1:])]["longueur"]
+               for instantane in historiques[0] for vid, position in instantane["positions"].items())
+
+
+def test_transferts_par_lot_listes_reconstruites():
+    """Les transferts du moteur réécrivent occupation et routes; les listes suivent à la lecture."""
+    from models.reseau import ReseauRoutier
+
+    reseau = ReseauRoutier()
+    for nom in ("A", "B", "C"):
+        reseau.ajouter_route(Route(nom, longueur=100, limite_vitesse=30))
+    reseau.connecter("A", "B")
+    n = 50
+    positions = np.arange(n, dtype=float)
+    positions[:30] += 70
+    reseau.charger_vehicules([f"V{i}" for i in range(n)], ["A"] * 30 + ["C"] * 20,
+                             positions, np.full(n, 10.0))
+    moteur = reseau.compiler_moteur()
+    reseau.mettre_a_jour(1.0)
+
+    routes = reseau.routes
+    assert routes["A"]._perime and routes["B"]._perime and not routes["C"]._perime
+    assert moteur.occupation.tolist() == [20, 10, 20]
+    assert sorted(v.id for v in routes["B"].vehicules) == [f"V{i}" for i in range(20, 30)]
+    assert not routes["A"]._perime and len(routes["A"].vehicules) == 20
+    vehicule = reseau.get_vehicule("V25")
+    assert vehicule.route is routes["B"] and vehicule.position == pytest.approx(5)
+    assert routes["B"].retirer_vehicule("V25") is vehicule
+    assert vehicule.route is routes["B"] and vehicule._moteur is None
+    assert moteur.occupation.tolist() == [20, 9, 20]
+
+
+def test_changer_de_route_d_un_vehicule_attache():
+    """Un véhicule attaché change de route par retrait puis ajout, dans le moteur."""
+    from models.reseau import ReseauRoutier
+
+    reseau = ReseauRoutier()
+    for nom, capacite in (("A", 10), ("B", 10), ("C", 1)):
+        reseau.ajouter_route(Route(nom, longueur=100, limite_vitesse=30, capacite_max=capacite))
+    reseau.charger_vehicules(["V1", "V2", "V3"], ["A", "A", "C"], [50, 60, 0], [10, 10, 10])
+    moteur = reseau.compiler_moteur()
+
+    v1 = reseau.get_vehicule("V1")
+    v1.changer_de_route(reseau.routes["B"], 5)
+    assert v1.route is reseau.routes["B"]
+    assert v1.position == 5 and v1.vitesse == 10
+    assert [v.id for v in reseau.routes["A"].vehicules] == ["V2"]
+    assert [v.id for v in reseau.routes["B"].vehicules] == ["V1"]
+    assert moteur.n == 3 and moteur.occupation.tolist() == [1, 1, 1]
+    assert reseau.get_vehicule("V1") is v1
+
+    reseau.mettre_a_jour(1.0)
+    assert v1.position == pytest.approx(15)
+
+    with pytest.raises(RoutePleineException):
+        v1.changer_de_route(reseau.routes["C"])
+    assert v1.route is reseau.routes["B"]
+    assert v1.position == pytest.approx(15)
+    assert moteur.occupation.tolist() == [1, 1, 1]
@@ -0,0 +1,125 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from core.parallele import ExecuteurParallele, partitionner_routes
+from core.simulateur import Simulateur
+from models.feu_rouge import FeuRouge
+from models.reseau import ReseauRoutier
+from models.route import Route
+from models.vehicule import Vehicule
+
+
+def _reseau(graine=3, nb_routes=12):
+    """Crée un réseau de test avec feux et charges de routes variées."""
+    rng = random.Random(graine)
+    reseau = ReseauRoutier()
+    for r in range(nb_routes):
+        route = Route(f"R{r}", longueur=rng.uniform(80, 400), limite_vitesse=20)
+        if r % 2 == 0:
+            route.ajouter_feu_rouge(FeuRouge(cycle=rng.choice([1, 3])))
+        for i in range(rng.randint(0, 10)):
+            route.ajouter_vehicule(Vehicule(f"V{r}_{i}", route,
+                                            position=rng.uniform(0, route.longueur),
+                                            vitesse=rng.uniform(0, 25)))
+        reseau.ajouter_route(route)
+    return reseau
+
+
+def test_partitionnement_equilibre_et_complet():
+    """Toutes les routes doivent être réparties une seule fois, sans tranche vide."""
+    reseau = _reseau()
+    tranches = partitionner_routes(reseau.routes.values(), 4)
+    assert len(tranches) == 4
+    noms = [r.nom for t in tranches for r in t]
+    assert sorted(noms) == sorted(reseau.routes)
+    charges = [sum(len(r.vehicules) for r in t) for t in tranches]
+    assert max(charges) - min(charges) <= max(len(r.vehicules) for r in reseau.routes.values())
+
+
+def test_execution_parallele_identique_a_la_serie():
+    """L'exécution répartie sur plusieurs processus doit reproduire l'exécution série."""
+    serie = _reseau()
+    parallele = _reseau()
+
+    with ExecuteurParallele(parallele, workers=3) as executeur:
+        for _ in range(8):
+            executeur.avancer(0.5)
+            for route in serie.routes.values():
+                route.mettre_a_jour_vehicules(0.5)
+
+    for nom, route in serie.routes.items():
+        for a, b in zip(route.vehicules, parallele.routes[nom].vehicules):
+            assert b.position == pytest.approx(a.position)
+            assert b.vitesse == pytest.approx(a.vitesse)
+
+
+def test_simulateur_workers():
+    """`Simulateur(workers=N)` doit produire le même historique que l'exécution série."""
+    ref = Simulateur("data/config_reseau.json")
+    par = Simulateur("data/config_reseau.json", workers=2)
+    ref.lancer_simulation(3, 1.0)
+    par.lancer_simulation(3, 1.0)
+    assert par.historique == ref.historique
+
+
+def test_simulateur_workers_invalide():
+    """Un nombre de processus invalide doit être refusé."""
+    with pytest.raises(ValueError):
+        Simulateur("data/config_reseau.json", workers=0)
+    with pytest.raises(ValueError):
+        Simulateur("data/config_reseau.json", memoire_partagee=True)
+
+
+def test_execution_memoire_partagee_identique_et_liberee():
+    """En mémoire partagée, le résultat est identique et les blocs sont détruits à la fin."""
+    from multiprocessing import shared_memory
+
+    serie = _reseau(graine=5)
+    parallele = _reseau(graine=5)
+
+    executeur = ExecuteurParallele(parallele, workers=2, memoire_partagee=True)
+    with executeur:
+        noms = executeur._etat.noms
+        # le coordinateur lit directement les tampons partagés
+        assert parallele.moteur.positions.base is not None
+        for _ in range(6):
+            executeur.avancer(1.0)
+            for route in serie.routes.values():
+                route.mettre_a_jour_vehicules(1.0)
+
+    for nom, route in serie.routes.items():
+        for a, b in zip(route.vehicules, parallele.routes[nom].vehicules):
+            assert b.position == pytest.approx(a.position)
+            assert b.vitesse == pytest.approx(a.vitesse)
+
+    for nom in noms:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=nom)
+
+
+def test_etat_recopie_seulement_a_la_demande():
+    """Un pas ne renvoie que des statistiques; l'état n'est recopié que par `synchroniser`."""
+    serie = _reseau(graine=7)
+    parallele = _reseau(graine=7)
+
+    with ExecuteurParallele(parallele, workers=3) as executeur:
+        moteur = parallele.moteur
+        avant = moteur.positions[:moteur.n].copy()
+        for _ in range(4):
+            executeur.avancer(1.0)
+            for route in serie.routes.values():
+                route.mettre_a_jour_vehicules(1.0)
+        assert (moteur.positions[:moteur.n] == avant).all()
+
+        vitesses = [v.vitesse for r in serie.routes.values() for v in r.vehicules]
+        stats = executeur.statistiques()
+        assert stats["nb_vehicules"] == len(vitesses)
+        assert stats["moyenne_vitesse"] == pytest.approx(sum(vitesses) / len(vitesses))
+
+        executeur.synchroniser()
+        for nom, route in serie.routes.items():
+            for a, b in zip(route.vehicules, parallele.routes[nom].vehicules):
+                assert b.position == pytest.approx(a.position)
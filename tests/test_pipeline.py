@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.analyseur import Analyseur
+from core.pipeline import InstantaneReseau, PipelineAnalyse
+from core.simulateur import Simulateur
+
+
+class AnalyseurLent:
+    """Greffon de test: bloqué tant que `ouvert` n'est pas levé."""
+
+    def __init__(self):
+        self.ouvert = threading.Event()
+        self.fils = set()
+
+    def analyser(self, reseau):
+        self.ouvert.wait()
+        self.fils.add(threading.current_thread().name)
+        return float(reseau.moteur.positions.sum())
+
+
+@pytest.mark.parametrize("moteur", ["python", "reseau"])
+def test_instantane_fige_et_compatible_avec_l_analyseur(moteur):
+    """L'instantané est immuable et l'Analyseur l'analyse comme le réseau."""
+    simu = Simulateur("data/config_reseau.json", moteur=moteur)
+    instantane = InstantaneReseau.depuis_reseau(simu.reseau, 1, 1.0)
+    simu.lancer_simulation(1, 1.0)
+
+    assert instantane.moteur.positions.tolist() == [0.0, 100.0]
+    assert [[v.id for v in route.vehicules] for route in instantane.moteur.routes] == [["V1"], ["V2"]]
+    with pytest.raises(ValueError):
+        instantane.moteur.vitesses[0] = 99.0
+    ref = Analyseur().analyser(Simulateur("data/config_reseau.json").reseau)
+    assert Analyseur().analyser(instantane) == ref
+    assert Analyseur(par_route=True).analyser(instantane)["routes"]["nb_vehicules"] == [1, 1]
+
+
+def test_analyses_hors_du_fil_de_simulation():
+    """La simulation n'attend pas un greffon lent; les résultats arrivent ensuite."""
+    lent = AnalyseurLent()
+    with PipelineAnalyse({"analyseur": Analyseur(), "lent": lent}, taille_file=8) as pipeline:
+        simu = Simulateur("data/config_reseau.json", pipeline=pipeline)
+        cadres = simu.iter_simulation(4, 1.0)
+        for _ in range(3):
+            next(cadres)
+        # trois tours simulés alors que le greffon lent n'a encore rien rendu
+        assert pipeline.nb_instantanes == 3
+        assert "lent" not in pipeline.derniers
+        lent.ouvert.set()
+        list(cadres)
+
+        assert [t for t, _, _ in pipeline.resultats["lent"]] == [1, 2, 3]
+        assert [r for _, _, r in pipeline.resultats["lent"]] == [122.0, 144.0, 166.0]
+        assert pipeline.resultats["analyseur"][0][2]["nb_vehicules"] == 2
+        assert lent.fils == {"pipeline-analyse"}
+
+
+def test_pipeline_abandonne_si_file_pleine():
+    lent = AnalyseurLent()
+    simu = Simulateur("data/config_reseau.json")
+    pipeline = PipelineAnalyse({"lent": lent}, taille_file=1, abandonner=True)
+    try:
+        for tour in range(1, 5):
+            pipeline.soumettre(simu.reseau, tour, float(tour))
+        assert pipeline.nb_abandons >= 1
+    finally:
+        lent.ouvert.set()
+        pipeline.fermer()
+
+
+def test_erreur_du_rappel_n_arrete_pas_le_fil():
+    """Un rappel en échec est rangé dans `erreurs`; la file continue d'être vidée."""
+    def rappel(nom, tour, temps, resultat):
+        raise KeyError(tour)
+
+    simu = Simulateur("data/config_reseau.json")
+    with PipelineAnalyse({"analyseur": Analyseur()}, taille_file=1, rappel=rappel) as pipeline:
+        for tour in range(1, 5):
+            pipeline.soumettre(simu.reseau, tour, float(tour))
+        pipeline.attendre()
+        assert [tour for _, tour, _ in pipeline.erreurs] == [1, 2, 3, 4]
+        assert pipeline.derniers["analyseur"][0] == 4
+
+
+def test_soumettre_apres_fermeture_leve():
+    simu = Simulateur("data/config_reseau.json")
+    pipeline = PipelineAnalyse({"analyseur": Analyseur()})
+    pipeline.fermer()
+    with pytest.raises(RuntimeError):
+        pipeline.soumettre(simu.reseau, 1, 1.0)
+
+
+def test_resultats_du_pipeline_affiches(capsys):
+    """Les analyses terminées dans le fil de travail sont affichées aux tours suivants."""
+    with PipelineAnalyse({"analyseur": Analyseur()}, conserver=False) as pipeline:
+        simu = Simulateur("data/config_reseau.json", pipeline=pipeline)
+        cadres = simu.iter_simulation(3, 1.0)
+        next(cadres)
+        pipeline.attendre()
+        capsys.readouterr()
+        next(cadres)
+        sortie = capsys.readouterr().out
+        assert "Analyse analyseur (tour 1, 1.0 s)" in sortie
+        assert "'nb_vehicules': 2" in sortie
+        pipeline.attendre()
+        list(cadres)
+        assert "tour 1," not in capsys.readouterr().out
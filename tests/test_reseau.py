@@ -1,3 +1,8 @@
+import pytest
+
+from exceptions import (RouteInexistanteException, VehiculeDejaPresent, VehiculeInexistantException,
+                        VehiculesInvalidesException)
+from models import chargement
 from models.reseau import ReseauRoutier
 from models.route import Route
 from models.vehicule import Vehicule
@@ -39,3 +44,156 @@ def test_mise_a_jour_de_lensemble_des_routes():
 
     assert v1.position == 20  # 0 + 10*2
     assert v2.position == 110  # 100 + 5*2
+
+
+def test_get_vehicule_sur_tout_le_reseau():
+    """L'index global retrouve un véhicule sur n'importe quelle route."""
+    reseau = ReseauRoutier()
+    r1 = Route("R1", longueur=100, limite_vitesse=20)
+    r2 = Route("R2", longueur=200, limite_vitesse=30)
+    v1 = Vehicule("V1", r1, position=10)
+    r1.ajouter_vehicule(v1)
+    reseau.ajouter_route(r1)
+    reseau.ajouter_route(r2)
+    v2 = Vehicule("V2", r2, position=20)
+    r2.ajouter_vehicule(v2)
+
+    assert reseau.get_vehicule("V1") is v1
+    assert reseau.get_vehicule("V2") is v2
+    with pytest.raises(VehiculeInexistantException):
+        reseau.get_vehicule("V3")
+
+
+def test_identifiant_unique_dans_le_reseau():
+    """Un identifiant déjà présent sur une autre route du réseau est refusé."""
+    reseau = ReseauRoutier()
+    r1 = Route("R1", longueur=100, limite_vitesse=20)
+    r2 = Route("R2", longueur=200, limite_vitesse=30)
+    reseau.ajouter_route(r1)
+    reseau.ajouter_route(r2)
+    r1.ajouter_vehicule(Vehicule("V1", r1))
+
+    with pytest.raises(VehiculeDejaPresent) as exc_info:
+        r2.ajouter_vehicule(Vehicule("V1", r2))
+    assert exc_info.value.route_id == "R1"
+    assert r2.vehicules == []
+
+    r3 = Route("R3", longueur=50, limite_vitesse=10)
+    r3.ajouter_vehicule(Vehicule("V1", r3))
+    with pytest.raises(VehiculeDejaPresent):
+        reseau.ajouter_route(r3)
+    assert "R3" not in reseau.routes
+
+
+@pytest.mark.parametrize("sans_numpy", [False, True])
+def test_charger_vehicules_par_colonnes(monkeypatch, sans_numpy):
+    """Le chargement par colonnes répartit le lot et valide toutes les lignes."""
+    if sans_numpy:
+        monkeypatch.setattr(chargement, "np", None)
+    reseau = ReseauRoutier()
+    reseau.ajouter_route(Route("R1", longueur=100, limite_vitesse=20, capacite_max=2))
+    reseau.ajouter_route(Route("R2", longueur=200, limite_vitesse=30))
+
+    reseau.charger_vehicules(["V1", "V2", "V3"], ["R2", "R1", "R2"], [150, 10, 20], [1, 2, 3])
+    assert [v.id for v in reseau.routes["R2"].vehicules] == ["V1", "V3"]
+    assert reseau.get_vehicule("V2").route is reseau.routes["R1"]
+
+    with pytest.raises(VehiculesInvalidesException) as exc_info:
+        reseau.charger_vehicules(["V4", "V5", "V1", "V6"], ["R1", "R1", "R2", "R9"],
+                                 [10, 150, 0, 0], [1, 1, 1, 1])
+    erreurs = {ligne: motifs for ligne, _, motifs in exc_info.value.erreurs}
+    assert erreurs == {
+        1: ["position au-delà de la route", "capacité de la route dépassée"],
+        2: ["identifiant déjà présent"],
+        3: ["route inconnue"],
+    }
+    assert len(reseau.routes["R1"].vehicules) == 1
+
+
+def test_retirer_vehicule_du_reseau():
+    """Le retrait met à jour l'index global; l'identifiant redevient disponible."""
+    reseau = ReseauRoutier()
+    reseau.ajouter_route(Route("R1", longueur=100, limite_vitesse=20))
+    reseau.ajouter_route(Route("R2", longueur=200, limite_vitesse=30))
+    reseau.charger_vehicules(["V1", "V2", "V3"], ["R1", "R1", "R2"], [0, 10, 20], [1, 2, 3])
+
+    v1 = reseau.retirer_vehicule("V1")
+    assert v1.position == 0
+    assert reseau.get_vehicule("V2") is reseau.routes["R1"].vehicules[0]
+    with pytest.raises(VehiculeInexistantException):
+        reseau.get_vehicule("V1")
+    reseau.routes["R2"].ajouter_vehicule(v1)
+    assert reseau.get_vehicule("V1") is v1
+
+
+def test_transfert_vers_la_route_suivante():
+    """Le surplus de distance est reporté sur la route suivante, à travers les routes courtes."""
+    reseau = ReseauRoutier()
+    for nom, longueur in (("A", 100), ("B", 5), ("C", 100), ("D", 50)):
+        reseau.ajouter_route(Route(nom, longueur=longueur, limite_vitesse=30))
+    reseau.connecter("A", "B")
+    reseau.connecter("B", "C")
+    reseau.charger_vehicules(["V1", "V2"], ["A", "C"], [90, 95], [20, 10])
+    reseau.connecter("C", "D")
+
+    for route in reseau.routes.values():
+        route.mettre_a_jour_vehicules(1.0)
+    assert reseau.transferer() == 3
+
+    v1, v2 = reseau.get_vehicule("V1"), reseau.get_vehicule("V2")
+    assert (v1.route.nom, v1.position) == ("C", 5)
+    assert (v2.route.nom, v2.position) == ("D", 5)
+    assert [v.id for v in reseau.routes["A"].vehicules] == []
+    assert reseau.routes["C"].get_vehicule("V1") is v1
+
+
+def test_transfert_successeur_plein_et_rotation():
+    """Un successeur plein fait attendre au bout; plusieurs successeurs sont servis à tour de rôle."""
+    reseau = ReseauRoutier()
+    reseau.ajouter_route(Route("A", longueur=10, limite_vitesse=30))
+    reseau.ajouter_route(Route("B", longueur=10, limite_vitesse=30, capacite_max=1))
+    reseau.ajouter_route(Route("C", longueur=10, limite_vitesse=30))
+    reseau.connecter("A", "B")
+    reseau.connecter("A", "C")
+    reseau.charger_vehicules(["V1", "V2", "V3"], ["A", "A", "B"], [8, 9, 0], [4, 4, 0])
+
+    reseau.routes["A"].mettre_a_jour_vehicules(1.0)
+    assert reseau.transferer() == 1
+    # V2 dépasse le plus et sort en premier, vers B (pleine): il attend au bout
+    assert reseau.get_vehicule("V2").route.nom == "A"
+    assert reseau.get_vehicule("V2").position == 10
+    assert (reseau.get_vehicule("V1").route.nom, reseau.get_vehicule("V1").position) == ("C", 2)
+
+    with pytest.raises(RouteInexistanteException):
+        reseau.connecter("A", "Z")
+
+
+def test_remplacer_une_route_du_reseau_compile():
+    """Une route remplacée quitte la table globale avec ses véhicules."""
+    pytest.importorskip("numpy")
+    from core.analyseur import Analyseur
+
+    reseau = ReseauRoutier()
+    ancienne = Route("A", longueur=100, limite_vitesse=30)
+    ancienne.ajouter_vehicule(Vehicule("V1", ancienne, position=10, vitesse=5))
+    reseau.ajouter_route(ancienne)
+    reseau.ajouter_route(Route("B", longueur=50, limite_vitesse=10))
+    moteur = reseau.compiler_moteur()
+
+    nouvelle = Route("A", longueur=200, limite_vitesse=20)
+    nouvelle.ajouter_vehicule(Vehicule("V2", nouvelle, position=0, vitesse=5))
+    reseau.ajouter_route(nouvelle)
+
+    assert [route.nom for route in moteur.routes] == ["A", "B"]
+    assert moteur.routes[0] is nouvelle
+    assert moteur.n == 1
+    assert moteur.longueurs.tolist() == [200, 50]
+    assert Analyseur().analyser(reseau)["nb_vehicules"] == 1
+
+    reseau.mettre_a_jour(1.0)
+    assert reseau.get_vehicule("V2").position == pytest.approx(5)
+    # le véhicule retiré garde son état et n'avance plus
+    v1 = ancienne.vehicules[0]
+    assert v1.position == 10 and v1.route is ancienne
+    with pytest.raises(VehiculeInexistantException):
+        reseau.get_vehicule("V1")
@@ -1,3 +1,7 @@
+import pytest
+
+from exceptions import (VehiculeDejaPresent, VehiculeInexistantException,
+						VehiculesInvalidesException)
 from models.route import Route
 from models.vehicule import Vehicule
 
@@ -27,3 +31,58 @@ def test_mise_a_jour_avance_vehicules():
 	# v2: 50 + 2*3 = 56
 	assert v2.position == 56
 
+
+
+def test_get_vehicule_par_identifiant():
+	"""La route retrouve un véhicule par identifiant et refuse les doublons."""
+	route = Route("R_index", longueur=500, limite_vitesse=30)
+	for i in range(3):
+		route.ajouter_vehicule(Vehicule(f"V{i}", route, position=i, vitesse=5))
+	assert route.get_vehicule("V2").position == 2
+	with pytest.raises(VehiculeDejaPresent):
+		route.ajouter_vehicule(Vehicule("V1", route))
+	with pytest.raises(VehiculeInexistantException):
+		route.get_vehicule("V9")
+	assert len(route.vehicules) == 3
+
+
+def test_ajouter_vehicules_bulk():
+	"""Un lot valide est ajouté en une fois, dans l'ordre, et indexé."""
+	route = Route("R_lot", longueur=100, limite_vitesse=30)
+	vehicules = route.ajouter_vehicules_bulk(["A", "B", "C"], [0, 50, 100], [1, 2, 3])
+	assert [v.id for v in route.vehicules] == ["A", "B", "C"]
+	assert vehicules == route.vehicules
+	assert route.get_vehicule("B").position == 50
+	assert vehicules[2].vitesse == 3
+
+
+def test_ajouter_vehicules_bulk_rapporte_toutes_les_lignes():
+	"""Toutes les lignes invalides sont rapportées et rien n'est ajouté."""
+	route = Route("R_lot", longueur=100, limite_vitesse=30, capacite_max=3)
+	route.ajouter_vehicule(Vehicule("A", route))
+	with pytest.raises(VehiculesInvalidesException) as exc_info:
+		route.ajouter_vehicules_bulk(["A", "B", "B", "C"], [0, 150, 10, -1], [1, 2, -3, 4])
+	erreurs = {ligne: motifs for ligne, _, motifs in exc_info.value.erreurs}
+	assert erreurs == {
+		0: ["identifiant déjà présent"],
+		1: ["position au-delà de la route"],
+		2: ["identifiant en double dans le lot", "vitesse négative",
+			"capacité de la route dépassée"],
+		3: ["position négative", "capacité de la route dépassée"],
+	}
+	assert exc_info.value.code == "VEH003"
+	assert len(route.vehicules) == 1
+
+
+def test_retirer_vehicule_par_echange():
+	"""Le retrait comble le trou avec le dernier véhicule et garde l'index cohérent."""
+	route = Route("R_retrait", longueur=100, limite_vitesse=30)
+	route.ajouter_vehicules_bulk(["A", "B", "C"], [0, 10, 20], [1, 1, 1])
+	retire = route.retirer_vehicule("A")
+	assert retire.id == "A"
+	assert [v.id for v in route.vehicules] == ["C", "B"]
+	assert route.get_vehicule("C").position == 20
+	with pytest.raises(VehiculeInexistantException):
+		route.retirer_vehicule("A")
+	route.ajouter_vehicule(Vehicule("A", route))
+	assert route.get_vehicule("A") is route.vehicules[-1]
@@ -1,7 +1,10 @@
 import os
 import json
 
+import pytest
+
 from core.simulateur import Simulateur
+from exceptions import VehiculesInvalidesException
 
 
 def test_initialisation_a_partir_du_fichier_config():
@@ -53,3 +56,81 @@ def test_execution_simulation_plusieurs_tours(tmp_path):
         os.remove(default_path)
     except OSError:
         pass
+
+
+def test_simulation_adaptative_respecte_les_bornes(tmp_path):
+    """Le pas adaptatif couvre la durée demandée et s'arrête pile au feu rouge."""
+    from models.feu_rouge import FeuRouge
+
+    simu = Simulateur("data/config_reseau.json")
+    route = simu.reseau.get_route("R1")
+    route.ajouter_feu_rouge(FeuRouge(cycle=100), position=55)
+    simu.exporteur.exporter_resultats = lambda stats, fichier: None
+
+    nb_pas = simu.lancer_simulation_adaptative(duree=20, pas_min=0.5, pas_max=10)
+
+    assert simu.temps == 20
+    assert nb_pas == len(simu.historique)
+    assert 2 <= nb_pas <= 40
+    # V1 (0 m, 10 m/s) arrive sur la ligne du feu rouge et s'arrête juste avant
+    v1 = next(v for v in route.vehicules if v.id == "V1")
+    assert v1.position == 54
+    assert v1.vitesse == 0
+
+
+def test_iter_simulation_produit_des_cadres_sans_historique():
+    """Le générateur produit un cadre par tour et ne conserve rien par défaut."""
+    simu = Simulateur("data/config_reseau.json")
+    cadres = list(simu.iter_simulation(3, 2.0, positions=True))
+
+    assert [c["tour"] for c in cadres] == [1, 2, 3]
+    assert cadres[-1]["temps"] == 6.0
+    assert cadres[-1]["positions"]["V1"] == 60
+    assert cadres[0]["stats"]["nb_vehicules"] == 2
+    assert "vitesses" not in cadres[0]["stats"]
+    assert simu.historique == []
+    complet = next(simu.iter_simulation(1, 1.0, inclure_vitesses=True))
+    assert complet["stats"]["vitesses"] == [10, 12]
+
+
+def test_iter_simulation_valide_immediatement():
+    """Des paramètres invalides sont refusés dès l'appel, sans itérer."""
+    from exceptions import IterationsInvalidesException
+
+    simu = Simulateur("data/config_reseau.json")
+    with pytest.raises(IterationsInvalidesException):
+        simu.iter_simulation(0, 1.0)
+
+
+@pytest.mark.parametrize("options, analyses", [
+    ({"analyse_tous_les": 2}, [2, 4, 5]),
+    ({"analyse_intervalle": 3.0}, [1, 4, 5]),
+    ({"analyse_tous_les": None}, [5]),
+])
+def test_cadence_d_analyse(options, analyses):
+    """Analyse complète selon la cadence (et au dernier tour), compteurs sinon."""
+    simu = Simulateur("data/config_reseau.json", **options)
+    cadres = list(simu.iter_simulation(5, 1.0))
+
+    assert [c["tour"] for c in cadres if "moyenne_vitesse" in c["stats"]] == analyses
+    assert all(c["stats"]["nb_vehicules"] == 2 for c in cadres)
+
+
+def test_cadence_d_analyse_invalide():
+    with pytest.raises(ValueError):
+        Simulateur("data/config_reseau.json", analyse_tous_les=0)
+    with pytest.raises(ValueError):
+        Simulateur("data/config_reseau.json", analyse_tous_les=2, analyse_intervalle=1.0)
+
+
+def test_configuration_avec_vehicules_invalides(tmp_path):
+    """Les véhicules invalides de la configuration sont tous rapportés ensemble."""
+    config = {"routes": [{"nom": "R1", "longueur": 100, "limite_vitesse": 20}],
+              "vehicules": [{"id": "V1", "route": "R1", "position": 0, "vitesse": 5},
+                            {"id": "V2", "route": "R9", "position": 0, "vitesse": 5},
+                            {"id": "V3", "route": "R1", "position": 500, "vitesse": -1}]}
+    fichier = tmp_path / "config.json"
+    fichier.write_text(json.dumps(config))
+    with pytest.raises(VehiculesInvalidesException) as exc_info:
+        Simulateur(str(fichier))
+    assert [ligne for ligne, _, _ in exc_info.value.erreurs] == [1, 2]